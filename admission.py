@@ -0,0 +1,243 @@
+# backend/admission.py
+#
+# Admission control for the expensive routes (alert reports, which geocode;
+# the chatbot, which calls the LLM; the dashboard views). Each gated route has
+# a concurrency cap and a priority queue: severity=critical reports are
+# admitted first and get a few reserved slots of their own, other writes wait
+# briefly for a slot, and dashboard GETs are shed at once when the route is
+# full. Clients also get a token bucket each on gated routes. Shed requests
+# get 503 (overload) or 429 (rate limit) with Retry-After.
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, jsonify, request
+
+from jwt_cache import current_identity
+from ratelimit import TokenBucket
+
+CRITICAL, NORMAL, LOW = 0, 1, 2
+PRIORITY_NAMES = {CRITICAL: 'critical', NORMAL: 'normal', LOW: 'low'}
+
+
+def parse_route_limits(text):
+    """'endpoint=cap,...' -> {endpoint: cap}."""
+    limits = {}
+    for part in filter(None, (p.strip() for p in (text or '').split(','))):
+        endpoint, cap = part.split('=')
+        limits[endpoint.strip()] = int(cap)
+    return limits
+
+
+class _Waiter:
+    __slots__ = ('event', 'granted')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class Gate:
+    """
+    At most `capacity` requests inside at once, plus `reserve` more for
+    critical ones. When full, critical and normal requests queue (at most
+    `max_queue`, critical always) and are let in by priority, then
+    arrival; low-priority requests are turned away.
+    """
+
+    def __init__(self, capacity, reserve=0, max_queue=32):
+        self.capacity = capacity
+        self.reserve = reserve
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters = [] # heap of (priority, arrival, _Waiter)
+        self._arrival = itertools.count()
+        self._lock = threading.Lock()
+
+    def _limit(self, priority):
+        return self.capacity + (self.reserve if priority == CRITICAL else 0)
+
+    def enter(self, priority, timeout):
+        """
+        Returns (admitted, queued): whether a slot was taken, and whether
+        the request had to wait in the queue for it (or for nothing).
+        """
+        with self._lock:
+            ahead = self._waiters and self._waiters[0][0] <= priority
+            if self.active < self._limit(priority) and not ahead:
+                self.active += 1
+                return True, False
+            if priority == LOW or timeout <= 0 or (len(self._waiters) >= self.max_queue and priority != CRITICAL):
+                return False, False
+            waiter = _Waiter()
+            entry = (priority, next(self._arrival), waiter)
+            heapq.heappush(self._waiters, entry)
+
+        waiter.event.wait(timeout)
+        with self._lock:
+            if waiter.granted:
+                return True, True
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            return False, True
+
+    def leave(self):
+        with self._lock:
+            self.active -= 1
+            while self._waiters and self.active < self._limit(self._waiters[0][0]):
+                _, _, waiter = heapq.heappop(self._waiters)
+                self.active += 1
+                waiter.granted = True
+                waiter.event.set()
+
+    @property
+    def queued(self):
+        return len(self._waiters)
+
+
+class AdmissionController:
+    """
+    Gates per endpoint (`route_limits`) and per-client token buckets of
+    `client_rate` requests per second (burst `client_burst`; 0 disables)
+    on those endpoints. Critical reports skip the client buckets: they are
+    bounded by their gate, and are never the traffic to turn away.
+    """
+
+    def __init__(self, route_limits, critical_reserve=4, queue_timeout=2.0, max_queue=32,
+                 client_rate=5.0, client_burst=20, max_clients=10_000, retry_after=2, metrics=None):
+        self.gates = {endpoint: Gate(cap, critical_reserve, max_queue) for endpoint, cap in route_limits.items()}
+        self.queue_timeout = queue_timeout
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        self.max_clients = max_clients
+        self.retry_after = retry_after
+        self._buckets = OrderedDict() # client -> TokenBucket, least recently seen first
+        self._buckets_lock = threading.Lock()
+
+        self._shed = self._queued = self._wait = None
+        if metrics is not None:
+            self._shed = metrics.counter('admission_shed_total', 'Requests turned away by admission control.',
+                                         ('route', 'priority', 'reason'))
+            self._queued = metrics.counter('admission_queued_total', 'Requests that waited for a slot.',
+                                           ('route', 'priority'))
+            self._wait = metrics.histogram('admission_wait_seconds', 'Time queued requests waited.', ('route',))
+            in_flight = metrics.gauge('admission_in_flight', 'Requests inside each gated route.', ('route',))
+            depth = metrics.gauge('admission_queue_depth', 'Requests waiting for each gated route.', ('route',))
+
+            def collect_admission_stats():
+                for endpoint, gate in self.gates.items():
+                    in_flight.set(gate.active, route=endpoint)
+                    depth.set(gate.queued, route=endpoint)
+            metrics.register_collector(collect_admission_stats)
+
+    @classmethod
+    def from_config(cls, config, metrics=None):
+        return cls(parse_route_limits(config['ADMISSION_ROUTE_LIMITS']),
+                   critical_reserve=config['ADMISSION_CRITICAL_RESERVE'],
+                   queue_timeout=config['ADMISSION_QUEUE_TIMEOUT'], max_queue=config['ADMISSION_MAX_QUEUE'],
+                   client_rate=config['ADMISSION_CLIENT_RATE'], client_burst=config['ADMISSION_CLIENT_BURST'],
+                   max_clients=config['ADMISSION_MAX_CLIENTS'], retry_after=config['ADMISSION_RETRY_AFTER'],
+                   metrics=metrics)
+
+    def _bucket(self, client):
+        with self._buckets_lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = TokenBucket(self.client_rate, self.client_burst)
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+            return bucket
+
+    def rate_limit(self, client):
+        """0 if `client` may go ahead, else seconds until it may."""
+        if self.client_rate <= 0:
+            return 0.0
+        return self._bucket(client).try_acquire()
+
+    def admit(self, endpoint, priority, client):
+        """
+        None if the request may proceed (holding a slot of its route's gate
+        until release), else (status, retry_after, reason) to answer with.
+        """
+        gate = self.gates[endpoint]
+        if priority != CRITICAL:
+            wait = self.rate_limit(client)
+            if wait > 0:
+                self._count_shed(endpoint, priority, 'rate_limited')
+                return 429, max(1, math.ceil(wait)), 'rate_limited'
+        started = time.perf_counter()
+        admitted, queued = gate.enter(priority, self.queue_timeout)
+        if queued and self._queued is not None:
+            self._queued.inc(route=endpoint, priority=PRIORITY_NAMES[priority])
+            self._wait.observe(time.perf_counter() - started, route=endpoint)
+        if not admitted:
+            reason = 'queue_timeout' if queued else 'overload'
+            self._count_shed(endpoint, priority, reason)
+            return 503, self.retry_after, reason
+        return None
+
+    def release(self, endpoint):
+        self.gates[endpoint].leave()
+
+    def _count_shed(self, endpoint, priority, reason):
+        if self._shed is not None:
+            self._shed.inc(route=endpoint, priority=PRIORITY_NAMES[priority], reason=reason)
+
+    def stats(self):
+        return {endpoint: {'capacity': gate.capacity, 'in_flight': gate.active, 'queued': gate.queued}
+                for endpoint, gate in self.gates.items()}
+
+
+def request_priority():
+    """Critical-severity alert reports first, then other writes and the chatbot, then dashboard reads."""
+    if request.endpoint == 'api.report_alert':
+        data = request.get_json(silent=True)
+        severity = data.get('severity') if isinstance(data, dict) else None
+        return CRITICAL if str(severity).lower() == 'critical' else NORMAL
+    return LOW if request.method == 'GET' else NORMAL
+
+
+def client_key():
+    """The signed-in user, else the remote address."""
+    identity = current_identity()
+    if isinstance(identity, dict):
+        identity = identity.get('id')
+    if identity is not None:
+        return f'user:{identity}'
+    return f'ip:{request.remote_addr}'
+
+
+def init_admission(app):
+    """Attaches `app.admission` and gates requests to the ADMISSION_ROUTE_LIMITS endpoints."""
+    controller = app.admission = AdmissionController.from_config(app.config, app.metrics)
+    if not app.config['ADMISSION_ENABLED']:
+        return controller
+
+    @app.before_request
+    def _admit_request():
+        if request.endpoint not in controller.gates:
+            return None
+        refused = controller.admit(request.endpoint, request_priority(), client_key())
+        if refused is not None:
+            status, retry_after, reason = refused
+            message = 'Too many requests' if status == 429 else 'Server is busy, please retry shortly'
+            response = jsonify({'error': message, 'reason': reason, 'retry_after': retry_after})
+            response.status_code = status
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        g._admitted_endpoint = request.endpoint
+        return None
+
+    @app.teardown_request
+    def _release_slot(exc=None):
+        endpoint = g.pop('_admitted_endpoint', None)
+        if endpoint is not None:
+            controller.release(endpoint)
+
+    return controller
@@ -0,0 +1,165 @@
+# backend/analytics.py
+#
+# Dense year x location x disaster-type count cube. Built once from the
+# disaster dataset, then topped up with stored alerts, so slices, roll-ups and
+# per-year trends are array indexing plus a sum instead of a DataFrame scan.
+
+import threading
+
+import numpy as np
+from sqlalchemy import select
+
+from disaster_types import ALL_DISASTER_TYPES, OTHER, classify_text
+from extensions import db
+from models import DisasterAlert
+from services.risk import alert_text
+
+CUBE_TYPES = ALL_DISASTER_TYPES + [OTHER] # index i is bit i of DisasterTypeMask
+DIMENSIONS = ('year', 'location', 'disaster_type')
+
+
+class AnalyticsCube:
+    """
+    `counts[year, location, type]` counts type occurrences (an event
+    tagged Flood and Cyclone counts once under each) and
+    `events[year, location]` counts events, so totals over all types are
+    not inflated. Rows without a year are left out. The arrays grow when an
+    alert brings a new year or location.
+    """
+
+    def __init__(self, first_year=None, last_year=None, locations=()):
+        self.first_year = first_year
+        n_years = 0 if first_year is None else last_year - first_year + 1
+        self.locations = list(locations)
+        self._location_index = {name: i for i, name in enumerate(self.locations)}
+        self.counts = np.zeros((n_years, len(self.locations), len(CUBE_TYPES)), dtype=np.int32)
+        self.events = np.zeros((n_years, len(self.locations)), dtype=np.int32)
+        self.alert_watermark = 0 # highest DisasterAlert.id counted
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_disaster_df(cls, disaster_df):
+        if disaster_df.empty:
+            return cls()
+        locations = disaster_df['Location'].astype('category')
+        loc_idx = locations.cat.codes.to_numpy()
+        years = disaster_df['Year'].to_numpy(dtype=float, na_value=np.nan)
+        keep = ~np.isnan(years) & (loc_idx >= 0)
+        if not keep.any():
+            return cls(locations=locations.cat.categories)
+        years = years[keep].astype(int)
+        cube = cls(int(years.min()), int(years.max()), locations.cat.categories)
+        cube._add(years - cube.first_year, loc_idx[keep], disaster_df['DisasterTypeMask'].to_numpy()[keep])
+        return cube
+
+    @property
+    def last_year(self):
+        return None if self.first_year is None else self.first_year + self.events.shape[0] - 1
+
+    def _add(self, year_idx, loc_idx, masks):
+        np.add.at(self.events, (year_idx, loc_idx), 1)
+        masks = masks.astype(np.int32)
+        for t in range(len(CUBE_TYPES)):
+            hit = (masks >> t) & 1 == 1
+            np.add.at(self.counts, (year_idx[hit], loc_idx[hit], t), 1)
+
+    def _year_index(self, year):
+        if self.first_year is None:
+            self.first_year = year
+        before = max(self.first_year - year, 0)
+        after = max(year - self.first_year - self.events.shape[0] + 1, 0)
+        if before or after:
+            self.counts = np.pad(self.counts, ((before, after), (0, 0), (0, 0)))
+            self.events = np.pad(self.events, ((before, after), (0, 0)))
+            self.first_year -= before
+        return year - self.first_year
+
+    def _location(self, name):
+        index = self._location_index.get(name)
+        if index is None:
+            index = self._location_index[name] = len(self.locations)
+            self.locations.append(name)
+            self.counts = np.pad(self.counts, ((0, 0), (0, 1), (0, 0)))
+            self.events = np.pad(self.events, ((0, 0), (0, 1)))
+        return index
+
+    def add_event(self, year, location, mask):
+        with self._lock:
+            self._add_event(year, location, mask)
+
+    def _add_event(self, year, location, mask):
+        year_idx = self._year_index(int(year))
+        loc_idx = self._location(location)
+        self._add(np.array([year_idx]), np.array([loc_idx]), np.array([mask]))
+
+    def sync_alerts(self, resolve_location):
+        """
+        Counts alerts stored since the last call (by id), so every worker
+        picks up alerts reported through any other. `resolve_location` maps
+        an alert's location to the dataset's name for it. Needs an app
+        context; returns how many alerts were added.
+        """
+        rows = db.session.execute(
+            select(DisasterAlert.id, DisasterAlert.issued_at, DisasterAlert.alert_type,
+                   DisasterAlert.description, DisasterAlert.location)
+            .where(DisasterAlert.id > self.alert_watermark).order_by(DisasterAlert.id)).all()
+        added = 0
+        with self._lock:
+            for row in rows:
+                if row.id <= self.alert_watermark: # counted by a concurrent sync
+                    continue
+                if row.location and row.issued_at is not None:
+                    self._add_event(row.issued_at.year, resolve_location(row.location),
+                                    classify_text(alert_text(row.alert_type, row.description)))
+                    added += 1
+                self.alert_watermark = row.id
+        return added
+
+    def query(self, locations=None, disaster_types=None, start_year=None, end_year=None, group_by=()):
+        """
+        Sums the cube over every dimension not in `group_by`, after
+        restricting it to the given locations, types and year range (None
+        means all). Returns (total, cells), where cells are
+        ({dimension: value}, count) with zero counts dropped, except for a
+        per-year series which keeps every year in range.
+        """
+        group_by = tuple(group_by)
+        with self._lock:
+            if self.first_year is None:
+                return 0, []
+            first = self.first_year if start_year is None else max(start_year, self.first_year)
+            last = self.last_year if end_year is None else min(end_year, self.last_year)
+            if first > last:
+                return 0, []
+            year_idx = np.arange(first - self.first_year, last - self.first_year + 1)
+            loc_idx = (np.arange(len(self.locations)) if locations is None
+                       else np.array([self._location_index[name] for name in locations if name in self._location_index],
+                                     dtype=int))
+            type_idx = (np.arange(len(CUBE_TYPES)) if disaster_types is None
+                        else np.array([CUBE_TYPES.index(name) for name in disaster_types], dtype=int))
+
+            if disaster_types is None and 'disaster_type' not in group_by:
+                block = self.events[np.ix_(year_idx, loc_idx)][:, :, np.newaxis]
+                labels = [year_idx + self.first_year, [self.locations[i] for i in loc_idx], [None]]
+            else:
+                block = self.counts[np.ix_(year_idx, loc_idx, type_idx)]
+                labels = [year_idx + self.first_year, [self.locations[i] for i in loc_idx],
+                          [CUBE_TYPES[i] for i in type_idx]]
+
+        kept = [axis for axis, name in enumerate(DIMENSIONS) if name in group_by]
+        rolled = block.sum(axis=tuple(axis for axis in range(3) if axis not in kept))
+        total = int(rolled.sum())
+        if not kept:
+            return total, []
+        positions = np.argwhere(np.ones_like(rolled, dtype=bool) if group_by == ('year',) else rolled)
+        cells = []
+        for position in positions:
+            key = {DIMENSIONS[axis]: labels[axis][i] for axis, i in zip(kept, position)}
+            if 'year' in key:
+                key['year'] = int(key['year'])
+            cells.append((key, int(rolled[tuple(position)])))
+        return total, cells
+
+    def stats(self):
+        return {'years': int(self.events.shape[0]), 'locations': len(self.locations),
+                'types': len(CUBE_TYPES), 'bytes': int(self.counts.nbytes + self.events.nbytes)}
@@ -2,154 +2,257 @@
 
 from flask_cors import CORS
 from flask import Flask, jsonify, request, current_app
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
 from extensions import db, bcrypt, jwt, migrate
+from database import apply_engine_profile, init_engine_events, reads_primary, report_database_settings
 from routes.auth import auth_bp
 from routes.api import api_bp # api_bp contains /api/alerts and /api/alerts/report
 from services.audit import audit_log_middleware
+import io
 import json
-import pandas as pd
-from models import Resource, Volunteer, Assignment, DisasterAlert, SensorData
-from datetime import datetime
+from models import Resource, Volunteer, Assignment, DisasterAlert, SensorData, LocationRisk, SensorRollup
+from datetime import datetime, timedelta
 import os
-# Removed joblib and numpy imports as ML models are no longer used directly by app routes
-from geopy.geocoders import Nominatim
 import time
+# Removed joblib and numpy imports as ML models are no longer used directly by app routes
+from services.upstream import UpstreamGateway, UpstreamTimeout
+from services.llm_client import LLMClient, ResponseCache
+from ratelimit import SharedTokenBucket
+from services.metrics import init_metrics
+from services.admission import init_admission
+from gazetteer import Gazetteer, load_aliases
+from services.warmup import WarmUp, register_health_routes, requires_warmup
+from services.scheduler import Scheduler
+from services.jobs import default_jobs
+from services.sync import track_changes
+from serialization import gzip_response, init_json, table_response
 import re # Import regex for more robust city extraction
+import click
+
+# pandas/NumPy come in through dataset, ingest, disaster_types and services.risk. Those are
+# imported where they're used, so `import app` stays light (see test_import_time.py).
+
 
-# Define a mapping of general disaster types to keywords found in 'Disaster_Info'
-DISASTER_TYPE_KEYWORDS = {
-    "Flood": ['flood', 'rainfall', 'heavy rain', 'cyclone', 'storm', 'inundation', 'waterlogging'],
-    "Earthquake": ['earthquake', 'seismic', 'tremor', 'quake'],
-    "Cyclone": ['cyclone', 'storm', 'hurricane', 'typhoon', 'gale', 'wind'],
-    "Drought": ['drought', 'dry spell', 'water scarcity', 'famine'],
-    "Landslide": ['landslide', 'mudslide', 'landslip', 'debris flow'],
-    "Heatwave": ['heatwave', 'hot weather', 'extreme heat', 'scorching'],
-    "Cold Wave": ['cold wave', 'extreme cold', 'frost'],
-    "Tsunami": ['tsunami', 'tidal wave', 'sea wave'],
-    "Hailstorm": ['hailstorm', 'hail'],
-    "Lightning": ['lightning', 'thunderstorm', 'bolt'],
-    "Avalanche": ['avalanch', 'snowslide'],
-    "Forest Fire": ['forest fire', 'wildfire', 'bushfire'],
-    "Cloudburst": ['cloudburst'],
-    "Epidemic": ['epidemic', 'disease outbreak', 'health crisis']
-}
-ALL_DISASTER_TYPES = list(DISASTER_TYPE_KEYWORDS.keys()) # For frontend dropdown
+def __getattr__(name):
+    # DISASTER_TYPE_KEYWORDS / ALL_DISASTER_TYPES are re-exported from disaster_types on first access
+    if name in ('DISASTER_TYPE_KEYWORDS', 'ALL_DISASTER_TYPES'):
+        import disaster_types
+        return getattr(disaster_types, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def create_app():
     app = Flask(__name__)
     CORS(app)
     app.config.from_object(Config)
+    init_json(app) # orjson-backed jsonify unless JSON_SERIALIZER=stdlib
+    if app.config['TRUSTED_PROXIES']: # remote_addr (and the scheme) as the outermost trusted proxy saw them
+        proxies = app.config['TRUSTED_PROXIES']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
 
+    apply_engine_profile(app) # pool sizing, statement cache, replica bind
     db.init_app(app)
+    init_engine_events(app, db) # SQLite WAL / synchronous / busy_timeout on each connection
+    track_changes() # ChangeLog entries for writes to the tables served by /sync
     bcrypt.init_app(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
+    init_metrics(app, db) # /metrics, request latency and DB statement hooks; registered before audit logging
+    init_admission(app) # concurrency caps, priority queues and per-client rate limits on the expensive routes
 
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(api_bp, url_prefix='/api') # api_bp contains /api/alerts and /api/alerts/report
 
     app.before_request(audit_log_middleware)
 
-    with app.app_context():
-        db.create_all()
-
-    # --- Geolocator setup and function attachment ---
-    app.geolocator = Nominatim(user_agent="disaster-app")
+    if app.config['DB_CREATE_ALL']:
+        with app.app_context():
+            db.create_all()
+    report_database_settings(app, db)
+
+    # --- Upstream gateway (pooled async client for geocoder and LLM calls) ---
+    app.upstream = UpstreamGateway(
+        max_concurrency=app.config['UPSTREAM_MAX_CONCURRENCY'],
+        max_connections=app.config['UPSTREAM_MAX_CONNECTIONS'],
+        timeout_budget=app.config['UPSTREAM_TIMEOUT_BUDGET'],
+        geocoder_url=app.config['GEOCODER_URL'],
+        geocoder_min_interval=app.config['GEOCODER_MIN_INTERVAL'],
+    )
+    app.llm = LLMClient(
+        app.upstream,
+        api_url=app.config['LLM_API_URL'],
+        api_key=app.config['GEMINI_API_KEY'],
+        bucket=SharedTokenBucket(app.config['LLM_RATE_LIMIT_DB'], 'llm',
+                                 rate=app.config['LLM_RATE_LIMIT_PER_SEC'],
+                                 capacity=app.config['LLM_RATE_LIMIT_BURST']),
+        cache=ResponseCache(max_entries=app.config['LLM_CACHE_MAX_ENTRIES'], ttl=app.config['LLM_CACHE_TTL']),
+        connect_timeout=app.config['LLM_CONNECT_TIMEOUT'],
+        read_timeout=app.config['LLM_READ_TIMEOUT'],
+        max_retries=app.config['LLM_MAX_RETRIES'],
+    )
     app.location_coords_cache = {}
+    app.zones = None # zones.ZoneMatrix over the known locations, built during warm-up
+
+    llm_cache_stats = app.metrics.gauge('llm_cache', 'Chatbot response cache statistics.', ('stat',))
+    def collect_llm_cache_stats():
+        for stat, value in app.llm.cache.stats().items():
+            llm_cache_stats.set(value, stat=stat)
+    app.metrics.register_collector(collect_llm_cache_stats)
 
     def get_coordinates(location):
+        # Known places, aliases ("Bombay") and near-misses resolve offline
+        match = app.gazetteer.resolve(location)
+        if match is not None and match.latitude is not None:
+            return (match.latitude, match.longitude)
         if location in app.location_coords_cache:
             return app.location_coords_cache[location]
         try:
-            loc = app.geolocator.geocode(location, timeout=10) # Increased timeout
-            if loc:
-                coords = (loc.latitude, loc.longitude)
-            else:
-                coords = (None, None)
+            coords = app.upstream.geocode(location)
+        except UpstreamTimeout as e:
+            # Don't cache timeouts, the location may resolve on the next report
+            current_app.logger.error(f"Geocode timeout for {location}: {e}")
+            return (None, None)
         except Exception as e:
+            # Errors (e.g. a 429 from the geocoder) are transient too; only cache real answers
             current_app.logger.error(f"Geocode error for {location}: {e}")
-            coords = (None, None)
+            return (None, None)
         app.location_coords_cache[location] = coords
-        time.sleep(1) # Adhere to Nominatim rate limit
+        if app.zones is not None and coords[0] is not None and coords[1] is not None:
+            app.zones.add(location, *coords) # dispatch can reach the new place from now on
         return coords
     app.get_coordinates = get_coordinates # Attach to app context
 
+    def canonical_location(location):
+        # The dataset's name for a reported place ("Bombay" -> "Mumbai"); unknown places keep their own name
+        match = app.gazetteer.resolve(location)
+        return match.name if match is not None else location
+    app.canonical_location = canonical_location
+
 
     # --- Load static data (location coordinates and disaster data) once on app startup ---
-    DATA_DIR = os.path.dirname(__file__)
-
-    try:
-        with open(os.path.join(DATA_DIR, 'location_coords.json')) as f:
-            app.location_coords = json.load(f)
-        print("location_coords.json loaded successfully.")
-    except FileNotFoundError:
-        print("Warning: location_coords.json not found. Heatmap data might be incomplete.")
-        app.location_coords = {}
-    except Exception as e:
-        print(f"An unexpected error occurred while loading location_coords.json: {e}")
-        app.location_coords = {}
-
-    try:
-        app.disaster_df = pd.read_csv(os.path.join(DATA_DIR, 'india_disaster_data.csv'))
-
-        if app.disaster_df.columns[0] == 'Unnamed: 0':
-            app.disaster_df = app.disaster_df.drop(columns=app.disaster_df.columns[0])
-
-        app.disaster_df['Date'] = pd.to_datetime(app.disaster_df['Date'], errors='coerce')
-
-        # Use the sorted KNOWN_LOCATIONS from app.location_coords for inference
-        KNOWN_LOCATIONS = sorted(list(app.location_coords.keys()), key=len, reverse=True)
-
-        def infer_location_from_text(row_text):
-            if pd.isna(row_text):
-                return None
-            text_lower = str(row_text).lower()
-            for loc_name in KNOWN_LOCATIONS:
-                # Use word boundaries for more accurate matching
-                if re.search(r'\b' + re.escape(loc_name.lower()) + r'\b', text_lower):
-                    return loc_name
-            return None
-
-        # Apply location inference to Title and then to Disaster_Info if Title doesn't yield a match
-        app.disaster_df['InferredLocation'] = app.disaster_df['Title'].apply(infer_location_from_text)
-        app.disaster_df['InferredLocation'] = app.disaster_df.apply(
-            lambda row: row['InferredLocation'] if pd.notna(row['InferredLocation'])
-            else infer_location_from_text(row['Disaster_Info']),
-            axis=1
-        )
-        app.disaster_df.dropna(subset=['InferredLocation'], inplace=True)
-        app.disaster_df.rename(columns={'InferredLocation': 'Location'}, inplace=True)
-
-        def identify_disaster_types_from_info(info_text):
-            detected_types = []
-            info_text_lower = str(info_text).lower()
-            for disaster_type, keywords in DISASTER_TYPE_KEYWORDS.items():
-                if any(keyword in info_text_lower for keyword in keywords):
-                    detected_types.append(disaster_type)
-            return detected_types if detected_types else ['Other']
-
-        app.disaster_df['DetectedDisasterTypes'] = app.disaster_df['Disaster_Info'].apply(identify_disaster_types_from_info)
-
-        # Calculate severity based on count of specific disaster events
-        app.severity_by_location = {}
-        for loc in app.disaster_df['Location'].unique():
-            loc_df = app.disaster_df[app.disaster_df['Location'] == loc]
-            # Count rows where 'DetectedDisasterTypes' is not empty and does not contain only 'Other'
-            specific_disasters_count = loc_df[loc_df['DetectedDisasterTypes'].apply(
-                lambda x: bool(x) and not (len(x) == 1 and x[0] == 'Other')
-            )].shape[0]
-            app.severity_by_location[loc] = specific_disasters_count
-        print("india_disaster_data.csv loaded and processed successfully.")
-
-    except FileNotFoundError:
-        print("Warning: india_disaster_data.csv not found. Data will be unavailable for some features.")
-        app.disaster_df = pd.DataFrame()
-        app.severity_by_location = {}
-    except Exception as e:
-        print(f"An unexpected error occurred while loading india_disaster_data.csv: {e}")
-        app.disaster_df = pd.DataFrame()
-        app.severity_by_location = {}
+    def load_static_data(warmup):
+        import pandas as pd
+        from dataset import compact_disaster_df
+        from ingest import load_disaster_data
+        from services.risk import dataset_location_risk, refresh_location_risk
+        from services.analytics import AnalyticsCube
+        from services.search import SearchIndex, dataset_source
+        from zones import ZoneMatrix
+
+        with warmup.phase('location_coords'):
+            try:
+                with open(app.config['LOCATION_COORDS_PATH']) as f:
+                    app.location_coords = json.load(f)
+                print("location_coords.json loaded successfully.")
+            except FileNotFoundError:
+                print("Warning: location_coords.json not found. Heatmap data might be incomplete.")
+                app.location_coords = {}
+            except Exception as e:
+                print(f"An unexpected error occurred while loading location_coords.json: {e}")
+                app.location_coords = {}
+
+            # Offline resolver over the known locations plus the alias table
+            app.gazetteer = Gazetteer(app.location_coords,
+                                      aliases=load_aliases(app.config['LOCATION_ALIASES_PATH']),
+                                      fuzzy_threshold=app.config['GAZETTEER_FUZZY_THRESHOLD'])
+
+        # Distances between every pair of known locations for /dispatch and /auto-assign; places
+        # geocoded later are added by get_coordinates
+        with warmup.phase('zone_matrix'):
+            app.zones = ZoneMatrix(app.location_coords)
+
+        # Full-text index of event titles/descriptions and alerts for /api/search; the events are
+        # indexed during ingest, and only when the dataset file changed since the index was built. Search is
+        # optional: if the index can't be opened, /api/search answers 503 and everything else still loads
+        try:
+            app.search_index = SearchIndex(app.config['SEARCH_INDEX_PATH'])
+            event_index = app.search_index.event_writer(dataset_source(app.config['DISASTER_DATA_PATH']))
+        except Exception as e:
+            print(f"Search index unavailable at {app.config['SEARCH_INDEX_PATH']}: {e}")
+            app.search_index = event_index = None
+
+        dataset_risk = None
+        try:
+            # Streamed in chunks (across a process pool for large files): location from Title (else
+            # Disaster_Info), types as a bitmask, text dropped
+            ingest_timings = {}
+            with warmup.phase('disaster_data_load'):
+                app.disaster_df = load_disaster_data(app.config['DISASTER_DATA_PATH'], app.gazetteer,
+                                                     chunksize=app.config['INGEST_CHUNK_ROWS'],
+                                                     spill_path=app.config['DISASTER_TEXT_SPILL_PATH'],
+                                                     timings=ingest_timings,
+                                                     workers=app.config['INGEST_WORKERS'],
+                                                     parallel_min_rows=app.config['INGEST_PARALLEL_MIN_ROWS'],
+                                                     text_sink=event_index)
+                if event_index is not None:
+                    event_index.finish()
+            for phase, seconds in ingest_timings.items():
+                app.metrics.startup_phase_seconds.set(round(seconds, 6), phase=phase)
+
+            # Calculate severity based on count of specific disaster events
+            with warmup.phase('severity_computation'):
+                # Rows with at least one type besides 'Other', counted per location in first-seen order
+                dataset_risk = dataset_location_risk(app.disaster_df)
+                app.severity_by_location = {loc: severity for loc, (severity, _) in dataset_risk.items()}
+
+        except FileNotFoundError:
+            print("Warning: india_disaster_data.csv not found. Data will be unavailable for some features.")
+            app.disaster_df = pd.DataFrame()
+            app.severity_by_location = {}
+        except Exception as e:
+            print(f"An unexpected error occurred while loading india_disaster_data.csv: {e}")
+            app.disaster_df = pd.DataFrame()
+            app.severity_by_location = {}
+
+        if dataset_risk is not None:
+            # Materialize into LocationRisk (plus stored alerts) unless it already reflects this dataset. A
+            # database error here (say, locked past busy_timeout) fails the warm-up so it's retried, rather
+            # than leaving the app ready with no dataset
+            with warmup.phase('location_risk_refresh'), app.app_context():
+                if refresh_location_risk(dataset_risk, app.canonical_location):
+                    print("LocationRisk table rebuilt from the disaster dataset and stored alerts.")
+
+            # Keep only compact, read-only columns; shared between pre-forked workers (see gunicorn.conf.py)
+            app.disaster_df = compact_disaster_df(app.disaster_df)
+            print("india_disaster_data.csv loaded and processed successfully.")
+
+        # Year x location x type counts for /api/analytics/cube; alerts stored so far are added now,
+        # later ones on each query
+        with warmup.phase('analytics_cube'), app.app_context():
+            app.analytics_cube = AnalyticsCube.from_disaster_df(app.disaster_df)
+            app.analytics_cube.sync_alerts(app.canonical_location)
+        with warmup.phase('search_index'), app.app_context():
+            if app.search_index is not None:
+                try:
+                    app.search_index.sync_alerts(app.canonical_location)
+                except Exception as e:
+                    print(f"Search index unavailable at {app.config['SEARCH_INDEX_PATH']}: {e}")
+                    app.search_index = None
+
+    # With FAST_START the app serves /healthz at once and loads on a background thread; until it's
+    # done /readyz and the dataset-backed views answer 503 with Retry-After
+    app.warmup = WarmUp(load_static_data, metrics=app.metrics, retry_after=app.config['WARMUP_RETRY_AFTER'],
+                        retries=app.config['WARMUP_RETRIES'], retry_delay=app.config['WARMUP_RETRY_DELAY'])
+    if app.config['FAST_START']:
+        app.warmup.start()
+    else:
+        app.warmup.run()
+    register_health_routes(app)
+
+    # Background jobs: sensor rollups, geocode retries, severity refresh and cache warming. Each worker
+    # runs its own scheduler thread, started on its first request (and from gunicorn's post_fork);
+    # shared jobs are claimed through JobState, so one worker runs them per period
+    app.location_summary_cache = None # (time.monotonic(), rows), set by the location_summary_warm job
+    app.risk_zone_rows = None # set by the risk_zones_warm job
+    app.scheduler = Scheduler(app, default_jobs(app.config), max_workers=app.config['SCHEDULER_MAX_WORKERS'],
+                              jitter=app.config['SCHEDULER_JITTER'], tick=app.config['SCHEDULER_TICK'],
+                              metrics=app.metrics)
+    if app.config['SCHEDULER_ENABLED']:
+        app.before_request(app.scheduler.start)
+
+    @app.route('/jobs')
+    def job_status():
+        return jsonify({'enabled': app.config['SCHEDULER_ENABLED'], 'jobs': app.scheduler.status()})
 
 
     # --- Application Routes (Main routes, API routes are in api_bp) ---
@@ -160,10 +263,12 @@ def create_app():
 
     # Severity Map Data Endpoint
     @app.route('/api/heatmap-data')
+    @requires_warmup
     def heatmap_data():
+        from services.risk import severity_by_location as stored_severity
         combined_data = []
         location_coords = app.location_coords
-        severity_by_location = app.severity_by_location
+        severity_by_location = stored_severity() # dataset events plus reported alerts, shared by all workers
 
         # Iterate over locations that were actually inferred from disaster_df
         for loc_name in app.disaster_df['Location'].unique():
@@ -171,49 +276,25 @@ def create_app():
             lat, lon = coords if coords != [None, None] else (None, None)
 
             if lat is not None and lon is not None:
-                severity = severity_by_location.get(loc_name, 0)
-                combined_data.append({
-                    'location': loc_name,
-                    'latitude': lat,
-                    'longitude': lon,
-                    'severity': severity
-                })
-        return jsonify(combined_data)
+                combined_data.append((loc_name, lat, lon, severity_by_location.get(loc_name, 0)))
+        return table_response(('location', 'latitude', 'longitude', 'severity'), combined_data)
 
     # Risk Zones (All Disaster Types) Endpoint for Heatmap
     @app.route('/api/risk_zones')
+    @requires_warmup
     def risk_zones():
-        risk_data = []
-        # Use unique locations from the processed disaster_df
-        unique_locations_in_disaster_data = app.disaster_df['Location'].unique()
-
-        for loc_name in unique_locations_in_disaster_data:
-            coords = app.location_coords.get(loc_name, [None, None])
-            if coords[0] is not None and coords[1] is not None:
-                loc_df = app.disaster_df[app.disaster_df['Location'] == loc_name]
-                
-                detected_types_for_location = set()
-                if not loc_df.empty:
-                    for types_list in loc_df['DetectedDisasterTypes']:
-                        if types_list:
-                           detected_types_for_location.update(types_list)
-                
-                if 'Other' in detected_types_for_location and len(detected_types_for_location) > 1:
-                    detected_types_for_location.remove('Other')
-                elif 'Other' in detected_types_for_location and len(detected_types_for_location) == 1:
-                    detected_types_for_location = set() # If only 'Other', treat as no specific types
-
-                risk_data.append({
-                    'location': loc_name,
-                    'latitude': float(coords[0]),
-                    'longitude': float(coords[1]),
-                    'disaster_types': sorted(list(detected_types_for_location))
-                })
-        return jsonify(risk_data)
+        from dataset import risk_zone_rows
+        # Types seen per location: OR of the event masks, first-seen location order; warmed by a job
+        risk_data = app.risk_zone_rows
+        if risk_data is None:
+            risk_data = risk_zone_rows(app.disaster_df, app.location_coords)
+        return table_response(('location', 'latitude', 'longitude', 'disaster_types'), risk_data)
 
     # Historical Risk Analyzer Endpoint
     @app.route('/api/historical-risk', methods=['GET'])
+    @requires_warmup
     def historical_risk_analysis():
+        from disaster_types import mask_contains, mask_to_types, type_counts as count_types, union_mask
         location_query = request.args.get('location')
         disaster_type_query = request.args.get('disaster_type')
         
@@ -229,16 +310,14 @@ def create_app():
             filtered_df = filtered_df[filtered_df['Location'].str.contains(location_query, case=False, na=False)]
 
         if disaster_type_query and disaster_type_query != 'All':
-            filtered_df = filtered_df[filtered_df['DetectedDisasterTypes'].apply(lambda x: disaster_type_query in x)]
+            filtered_df = filtered_df[mask_contains(filtered_df['DisasterTypeMask'], disaster_type_query)]
         
         total_events = len(filtered_df)
         
         # Heuristic for suggested disaster based on weather inputs and historical data
         suggested_disaster_type = "No specific disaster suggested based on weather inputs."
         if location_query and total_events > 0:
-            common_disasters_at_location = filtered_df['DetectedDisasterTypes'].explode().value_counts().index.tolist()
-            if 'Other' in common_disasters_at_location:
-                common_disasters_at_location.remove('Other')
+            common_disasters_at_location = mask_to_types(union_mask(filtered_df['DisasterTypeMask']), include_other=False)
 
             if temp_input is not None and temp_input > 40 and 'Heatwave' in common_disasters_at_location:
                 suggested_disaster_type = "High temperature suggests potential Heatwave risk."
@@ -265,8 +344,7 @@ def create_app():
         }
 
         if total_events > 0:
-            all_detected_types = [item for sublist in filtered_df['DetectedDisasterTypes'] for item in sublist]
-            type_counts = pd.Series(all_detected_types).value_counts().to_dict()
+            type_counts = count_types(filtered_df['DisasterTypeMask'])
 
             if 'Other' in type_counts and len(type_counts) > 1:
                 type_counts.pop('Other')
@@ -302,21 +380,17 @@ def create_app():
             return jsonify({'message': 'Resource created', 'id': new_resource.id}), 201
         else: # GET
             severity_threshold = float(request.args.get('severity_min', 0))
-            resources = Resource.query.all()
-            filtered_resources = []
-            for r in resources:
-                location_severity = app.severity_by_location.get(r.location, 0)
-                if location_severity >= severity_threshold:
-                    filtered_resources.append({
-                        'id': r.id,
-                        'resource_type': r.resource_type,
-                        'quantity': r.quantity,
-                        'location': r.location,
-                        'assigned': r.assigned,
-                        'created_at': r.created_at.isoformat(),
-                        'location_severity': location_severity
-                    })
-            return jsonify(filtered_resources)
+            location_severity = db.func.coalesce(LocationRisk.severity, 0)
+            # Plain column tuples straight to the serializer; no ORM objects or per-row dicts
+            rows = db.session.execute(
+                db.select(Resource.id, Resource.resource_type, Resource.quantity, Resource.location,
+                          Resource.assigned, Resource.created_at, location_severity)
+                .outerjoin(LocationRisk, LocationRisk.location == Resource.location)
+                .where(location_severity >= severity_threshold)
+                .order_by(Resource.id)
+            ).all()
+            return table_response(('id', 'resource_type', 'quantity', 'location', 'assigned', 'created_at',
+                                   'location_severity'), rows)
 
     # ===== Volunteer Management Routes =====
     @app.route('/volunteers', methods=['GET', 'POST'])
@@ -336,22 +410,57 @@ def create_app():
             return jsonify({'message': 'Volunteer created', 'id': new_volunteer.id}), 201
         else: # GET
             severity_threshold = float(request.args.get('severity_min', 0))
-            volunteers = Volunteer.query.all()
-            filtered_volunteers = []
-            for v in volunteers:
-                location_severity = app.severity_by_location.get(v.location, 0)
-                if location_severity >= severity_threshold:
-                    filtered_volunteers.append({
-                        'id': v.id,
-                        'name': v.name,
-                        'contact': v.contact,
-                        'location': v.location,
-                        'available': v.available,
-                        'assigned_zone': v.assigned_zone,
-                        'assistance_type': v.assistance_type,
-                        'location_severity': location_severity
-                    })
-            return jsonify(filtered_volunteers)
+            location_severity = db.func.coalesce(LocationRisk.severity, 0)
+            rows = db.session.execute(
+                db.select(Volunteer.id, Volunteer.name, Volunteer.contact, Volunteer.location, Volunteer.available,
+                          Volunteer.assigned_zone, Volunteer.assistance_type, location_severity)
+                .outerjoin(LocationRisk, LocationRisk.location == Volunteer.location)
+                .where(location_severity >= severity_threshold)
+                .order_by(Volunteer.id)
+            ).all()
+            return table_response(('id', 'name', 'contact', 'location', 'available', 'assigned_zone',
+                                   'assistance_type', 'location_severity'), rows)
+
+    # ===== Bulk Import (CSV/XLSX) =====
+    @app.route('/<any(volunteers, resources):kind>/import', methods=['POST'])
+    def bulk_import(kind):
+        from services.bulk_import import BulkImportError, file_format, import_table
+        # A multipart upload in the `file` field, or the file as the raw request body (?format=csv|xlsx
+        # when the filename/content type doesn't say). Rows are upserted by contact (volunteers) or
+        # resource type + location (resources); rejected rows are listed in the report.
+        upload = request.files.get('file')
+        try:
+            if upload is not None:
+                fmt = file_format(upload.filename, upload.mimetype, request.args.get('format'))
+                source = upload.stream
+            else:
+                fmt = file_format(content_type=request.mimetype, requested=request.args.get('format'))
+                source = request.stream if fmt == 'csv' else io.BytesIO(request.get_data())
+            report = import_table(kind, source, fmt, chunksize=app.config['BULK_IMPORT_CHUNK_ROWS'],
+                                  dry_run=request.args.get('dry_run', 'false').lower() == 'true',
+                                  max_errors=app.config['BULK_IMPORT_MAX_ERRORS'])
+        except BulkImportError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            current_app.logger.error(f"Error importing {kind}: {e}")
+            return jsonify({'error': f'Failed to import {kind}'}), 500
+        return jsonify(report)
+
+    @app.cli.command('import-data')
+    @click.argument('kind', type=click.Choice(['volunteers', 'resources']))
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'xlsx']), help="Defaults to the file extension.")
+    @click.option('--dry-run', is_flag=True, help="Validate and match rows without writing.")
+    def import_data_command(kind, path, fmt, dry_run):
+        """Upsert volunteers or resources from a CSV or XLSX file."""
+        from services.bulk_import import BulkImportError, file_format, import_table
+        try:
+            report = import_table(kind, path, file_format(path, requested=fmt),
+                                  chunksize=app.config['BULK_IMPORT_CHUNK_ROWS'], dry_run=dry_run,
+                                  max_errors=app.config['BULK_IMPORT_MAX_ERRORS'])
+        except BulkImportError as e:
+            raise click.ClickException(str(e))
+        click.echo(json.dumps(report, indent=2))
 
     # ===== Assignment Routes =====
     @app.route('/assignments', methods=['GET', 'POST'])
@@ -394,104 +503,214 @@ def create_app():
     # ===== Auto-assign Route =====
     @app.route('/auto-assign', methods=['POST'])
     def auto_assign():
-        severity_by_location = app.severity_by_location
-        
-        sorted_zones = sorted(severity_by_location.items(), key=lambda x: x[1], reverse=True)
-
-        for zone, severity in sorted_zones:
+        max_km = app.config['DISPATCH_MAX_KM']
+        if max_km > 0 and app.zones is not None:
+            return auto_assign_nearest(max_km)
+        # Most severe zone that has both a free volunteer and unassigned stock, picked in one query
+        has_volunteer = db.select(Volunteer.id).where(
+            Volunteer.location == LocationRisk.location, Volunteer.available == db.true()).exists()
+        has_resource = db.select(Resource.id).where(
+            Resource.location == LocationRisk.location, Resource.assigned == db.false()).exists()
+        zone = db.session.scalar(
+            db.select(LocationRisk.location).where(has_volunteer, has_resource)
+            .order_by(LocationRisk.severity.desc(), LocationRisk.rank).limit(1))
+
+        if zone is not None:
             volunteer = Volunteer.query.filter_by(location=zone, available=True).first()
-            resource = Resource.query.filter_by(location=zone, assigned=False).first()
+            # Literal false() so SQLite can use the partial ix_resource_unassigned_location index
+            resource = Resource.query.filter(Resource.location == zone, Resource.assigned == db.false()).first()
 
             if volunteer and resource:
-                assignment = Assignment(
-                    zone=zone,
-                    resource_id=resource.id,
-                    volunteer_id=volunteer.id,
-                    assigned_at=datetime.utcnow()
-                )
-                db.session.add(assignment)
+                return commit_assignment(zone, volunteer, resource)
 
-                volunteer.available = False
-                volunteer.assigned_zone = zone
-                resource.assigned = True
+        return jsonify({'message': 'No matching volunteer/resource available for auto-assignment'}), 404
 
-                try:
-                    db.session.commit()
-                    return jsonify({
-                        'message': 'Auto-assignment successful',
-                        'zone': zone,
-                        'volunteer_id': volunteer.id,
-                        'resource_id': resource.id,
-                        'volunteer_name': volunteer.name,
-                        'resource_type': resource.resource_type
-                    }), 201
-                except Exception as e:
-                    db.session.rollback()
-                    current_app.logger.error(f"Error during auto-assignment commit: {e}")
-                    return jsonify({'error': 'Failed to auto-assign due to database error'}), 500
+    def auto_assign_nearest(max_km):
+        from services.dispatch import pick_assignment
+        # Most severe zone with a free volunteer and unassigned stock within max_km, each taken from the
+        # closest location (distance weighted by that location's own severity, see services.dispatch)
+        picked = pick_assignment(app.zones, app.canonical_location, max_km, app.config['DISPATCH_SEVERITY_WEIGHT'])
+        if picked is not None:
+            zone, volunteer_location, resource_location = picked
+            volunteer = Volunteer.query.filter_by(location=volunteer_location, available=True).first()
+            resource = Resource.query.filter(Resource.location == resource_location,
+                                             Resource.assigned == db.false()).first()
+            if volunteer and resource:
+                return commit_assignment(zone, volunteer, resource)
 
         return jsonify({'message': 'No matching volunteer/resource available for auto-assignment'}), 404
 
+    def commit_assignment(zone, volunteer, resource):
+        assignment = Assignment(
+            zone=zone,
+            resource_id=resource.id,
+            volunteer_id=volunteer.id,
+            assigned_at=datetime.utcnow()
+        )
+        db.session.add(assignment)
+
+        volunteer.available = False
+        volunteer.assigned_zone = zone
+        resource.assigned = True
+
+        try:
+            db.session.commit()
+            return jsonify({
+                'message': 'Auto-assignment successful',
+                'zone': zone,
+                'volunteer_id': volunteer.id,
+                'resource_id': resource.id,
+                'volunteer_name': volunteer.name,
+                'resource_type': resource.resource_type,
+                'volunteer_location': volunteer.location,
+                'resource_location': resource.location
+            }), 201
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error during auto-assignment commit: {e}")
+            return jsonify({'error': 'Failed to auto-assign due to database error'}), 500
+
+    # ===== Dispatch Route =====
+    @app.route('/dispatch')
+    @requires_warmup
+    def dispatch():
+        from services.dispatch import rank_candidates
+        # Free volunteers and/or unassigned resources for a zone, nearest first across zones, e.g.
+        #   /dispatch?zone=Guwahati&kind=volunteers&assistance_type=Medical&max_km=200
+        zone = request.args.get('zone', '').strip()
+        if not zone:
+            return jsonify({'error': 'zone is required'}), 400
+        kind = request.args.get('kind')
+        if kind not in (None, 'volunteers', 'resources'):
+            return jsonify({'error': 'kind must be volunteers or resources'}), 400
+        started = datetime.now()
+        # Only places the matrix already holds (the gazetteer's, plus ones geocoded when alerts were reported);
+        # an open-ended name here would mean a geocoder call and a new matrix row per request
+        target = app.canonical_location(zone)
+        if target not in app.zones:
+            return jsonify({'error': f'Unknown zone: {zone}'}), 404
+        max_km = request.args.get('max_km', app.config['DISPATCH_MAX_KM'], type=float)
+        limit = min(max(request.args.get('limit', 10, type=int), 1), app.config['DISPATCH_MAX_RESULTS'])
+        weight = app.config['DISPATCH_SEVERITY_WEIGHT']
+        risk = db.session.get(LocationRisk, target)
+        response = {'zone': target, 'severity': risk.severity if risk is not None else 0}
+        for name in (kind,) if kind else ('volunteers', 'resources'):
+            response[name] = rank_candidates(app.zones, target, name, app.canonical_location, max_km, weight, limit,
+                                             assistance_type=request.args.get('assistance_type'),
+                                             resource_type=request.args.get('resource_type'))
+        response['took_ms'] = round((datetime.now() - started).total_seconds() * 1000, 2)
+        return jsonify(response)
+
+    # ===== Delta Sync Route =====
+    @app.route('/sync')
+    @reads_primary # versions must come from the newest log, not a lagging replica's
+    def sync_changes():
+        from services.sync import SYNCED, changes_since
+        # Field clients keep local copies of the tables and ask for what changed since the version they
+        # last saw: /sync?since=0 once, then ?since=<version from the previous answer>; gzipped when
+        # the client accepts it
+        try: # not type=int, which would read a typo as 0 and resend everything
+            since = int(request.args.get('since', 0))
+        except ValueError:
+            since = -1
+        if since < 0:
+            return jsonify({'error': 'since must be a version number'}), 400
+        tables = [name.strip() for name in request.args['tables'].split(',')] if request.args.get('tables') else None
+        unknown = [name for name in tables or () if name not in SYNCED]
+        if unknown:
+            return jsonify({'error': 'Unknown table', 'tables': unknown, 'valid_tables': list(SYNCED)}), 400
+        limit = min(max(request.args.get('limit', app.config['SYNC_MAX_CHANGES'], type=int), 1),
+                    app.config['SYNC_MAX_CHANGES'])
+        # SQLite commits in version order; elsewhere give in-flight writes SYNC_COMMIT_LAG to land first
+        lag = 0 if db.engine.dialect.name == 'sqlite' else app.config['SYNC_COMMIT_LAG']
+        return gzip_response(jsonify(changes_since(since, limit, tables, lag)), app.config['SYNC_GZIP_MIN_BYTES'],
+                             app.config['SYNC_GZIP_LEVEL'])
+
 
     # ===== Location Summary Route =====
     @app.route('/location-summary')
+    @requires_warmup
     def location_summary():
-        result = []
-        location_coords = app.location_coords
-        severity_by_location = app.severity_by_location
-        
-        unique_locations_in_disaster_df = app.disaster_df['Location'].unique()
-
-        for loc in unique_locations_in_disaster_df:
-            volunteers_count = Volunteer.query.filter_by(location=loc).count()
-            resources_count = Resource.query.filter_by(location=loc).count()
-            assignments_count = Assignment.query.filter_by(zone=loc).count()
-            severity = severity_by_location.get(loc, 0)
-
-            coords = location_coords.get(loc, [None, None])
-
-            result.append({
-                'location': loc,
-                'severity': severity,
-                'volunteers_count': volunteers_count,
-                'resources_count': resources_count,
-                'assignments_count': assignments_count,
-                'coords': coords
-            })
-        return jsonify(result)
+        from services.risk import location_summary as summarize_locations
+        # Served from the location_summary_warm job's cache while it's fresh enough
+        cached = app.location_summary_cache
+        if cached is not None and time.monotonic() - cached[0] <= app.config['LOCATION_SUMMARY_MAX_AGE']:
+            return jsonify(cached[1])
+        return jsonify(summarize_locations(app.disaster_df['Location'].unique(), app.location_coords))
 
     # ===== Sensor Data Routes =====
     @app.route('/sensor-data', methods=['GET', 'POST'])
     def handle_sensor_data():
         if request.method == 'POST':
-            data = request.json
-            if not all(k in data for k in ['sensor_type', 'value', 'latitude', 'longitude']):
-                return jsonify({'error': 'Missing sensor data'}), 400
-            
-            new_sensor_data = SensorData(
-                sensor_type=data['sensor_type'],
-                value=data['value'],
-                latitude=data['latitude'],
-                longitude=data['longitude']
-            )
+            from services.sensor_stream import commit_readings, parse_reading
+            reading = parse_reading(request.get_json(silent=True))
+            if reading is None:
+                return jsonify({'error': 'Missing or invalid sensor data'}), 400
+
+            new_sensor_data = SensorData(**reading)
             db.session.add(new_sensor_data)
             try:
-                db.session.commit()
-                return jsonify({'message': 'Sensor data added', 'id': new_sensor_data.id}), 201
+                alerts = commit_readings(app, [reading]) # the reading and any alerts it raised, together
+                return jsonify({'message': 'Sensor data added', 'id': new_sensor_data.id,
+                                'alerts_raised': [a.id for a in alerts]}), 201
             except Exception as e:
-                db.session.rollback()
                 current_app.logger.error(f"Error adding sensor data: {e}")
                 return jsonify({'error': 'Failed to add sensor data'}), 500
         else: # GET
-            sensor_data = SensorData.query.order_by(SensorData.timestamp.desc()).limit(100).all()
-            return jsonify([{
-                'id': s.id,
-                'sensor_type': s.sensor_type,
-                'value': s.value,
-                'timestamp': s.timestamp.isoformat(),
-                'latitude': s.latitude,
-                'longitude': s.longitude
-            } for s in sensor_data])
+            rows = db.session.execute(
+                db.select(SensorData.id, SensorData.sensor_type, SensorData.value, SensorData.timestamp,
+                          SensorData.latitude, SensorData.longitude)
+                .order_by(SensorData.timestamp.desc()).limit(100)
+            ).all()
+            return table_response(('id', 'sensor_type', 'value', 'timestamp', 'latitude', 'longitude'), rows)
+
+
+    @app.route('/sensor-data/rollups')
+    def sensor_rollups():
+        # Hourly aggregates kept by the sensor_rollup job; latitude/longitude are the grid cell's south-west corner
+        hours = request.args.get('hours', 24, type=float)
+        if not hours > 0: # also rejects nan
+            return jsonify({'error': 'hours must be a positive number'}), 400
+        try:
+            since = datetime.utcnow() - timedelta(hours=hours)
+        except OverflowError: # further back than datetime goes: everything
+            since = datetime.min
+        grid = app.config['SENSOR_GRID_DEGREES']
+        query = (db.select(SensorRollup.sensor_type, SensorRollup.hour, SensorRollup.cell_lat * grid,
+                           SensorRollup.cell_lon * grid, SensorRollup.count,
+                           SensorRollup.value_sum / SensorRollup.count, SensorRollup.value_min, SensorRollup.value_max)
+                 .where(SensorRollup.hour >= since)
+                 .order_by(SensorRollup.hour.desc(), SensorRollup.sensor_type))
+        if request.args.get('sensor_type'):
+            query = query.where(SensorRollup.sensor_type == request.args['sensor_type'])
+        rows = db.session.execute(query).all()
+        return table_response(('sensor_type', 'hour', 'latitude', 'longitude', 'count', 'mean', 'min', 'max'), rows)
+
+
+    @app.route('/sensor-data/bulk', methods=['POST'])
+    def bulk_sensor_data():
+        from services.sensor_stream import commit_readings, parse_reading
+        # A JSON list of readings (or {"readings": [...]}), stored with one executemany and streamed
+        # through the detector in order
+        data = request.get_json(silent=True)
+        readings = data.get('readings') if isinstance(data, dict) else data
+        if not isinstance(readings, list) or not readings:
+            return jsonify({'error': 'Expected a non-empty list of readings'}), 400
+        if len(readings) > app.config['SENSOR_BULK_MAX_READINGS']:
+            return jsonify({'error': f"At most {app.config['SENSOR_BULK_MAX_READINGS']} readings per request"}), 413
+        rows = [parse_reading(reading) for reading in readings]
+        invalid = [i for i, row in enumerate(rows) if row is None]
+        if invalid:
+            return jsonify({'error': 'Missing or invalid sensor data', 'invalid_indexes': invalid[:100]}), 400
+
+        db.session.execute(db.insert(SensorData), rows)
+        try:
+            alerts = commit_readings(app, rows)
+            return jsonify({'message': 'Sensor data added', 'inserted': len(rows),
+                            'alerts_raised': [a.id for a in alerts]}), 201
+        except Exception as e:
+            current_app.logger.error(f"Error adding bulk sensor data: {e}")
+            return jsonify({'error': 'Failed to add sensor data'}), 500
 
 
     @app.errorhandler(404)
@@ -0,0 +1,26 @@
+# backend/asgi.py
+#
+# Async serving mode: `uvicorn asgi:app --host 0.0.0.0 --port 5000`
+#
+# Flask views run on a large thread pool; the chatbot and geocoding paths hand
+# their upstream I/O to app.upstream (one event loop, one pooled client), so a
+# thread waiting on a slow LLM or geocoder costs a parked future, not a worker.
+
+from a2wsgi import WSGIMiddleware
+from app import create_app
+
+flask_app = create_app()
+_wsgi_app = WSGIMiddleware(flask_app, workers=flask_app.config['ASGI_THREADS'])
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                flask_app.upstream.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    await _wsgi_app(scope, receive, send)
@@ -1,12 +1,11 @@
 from flask import request
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from jwt_cache import current_identity
 from models import AuditLog
 from extensions import db
 
 def audit_log_middleware():
     try:
-        verify_jwt_in_request(optional=True)
-        user = get_jwt_identity()
+        user = current_identity()
         user_id = user.get('id') if user else None
     except:
         user_id = None
@@ -1,9 +1,9 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from extensions import db, bcrypt
 from models import User
 from flask_jwt_extended import create_access_token
 from schemas import UserSchema
-from utils import role_required
+from utils import bcrypt_cost, role_required
 
 auth_bp = Blueprint('auth', __name__)
 user_schema = UserSchema()
@@ -31,5 +31,10 @@ def login():
     if not user or not bcrypt.check_password_hash(user.password_hash, data.get('password')):
         return jsonify({"msg": "Invalid credentials"}), 401
 
+    # Re-hash on a successful login so BCRYPT_LOG_ROUNDS changes reach existing users
+    if bcrypt_cost(user.password_hash) != current_app.config['BCRYPT_LOG_ROUNDS']:
+        user.password_hash = bcrypt.generate_password_hash(data.get('password')).decode('utf-8')
+        db.session.commit()
+
     access_token = create_access_token(identity={'id': user.id, 'username': user.username, 'role': user.role})
     return jsonify(access_token=access_token)
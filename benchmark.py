@@ -0,0 +1,353 @@
+# backend/benchmark.py
+#
+# Reproducible benchmarks for the backend's hot paths.
+#
+#   python benchmark.py --scale small --output bench_results.json
+#   python benchmark.py --scale full --output after.json --compare before.json
+#
+# Synthetic data (CSV, location_coords.json and a SQLite database) is generated
+# from a fixed seed into a scratch directory, create_app() is pointed at it via
+# environment variables, and endpoints are driven through the Flask test client.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+SCALES = {
+    # disaster rows, locations, volunteers, resources, sensor readings
+    'small': dict(disaster_rows=10_000, locations=200, volunteers=2_000, resources=2_000, sensor_readings=100_000),
+    'medium': dict(disaster_rows=100_000, locations=1_000, volunteers=20_000, resources=20_000, sensor_readings=1_000_000),
+    'full': dict(disaster_rows=1_000_000, locations=5_000, volunteers=100_000, resources=100_000, sensor_readings=10_000_000),
+}
+
+# Phrases that trigger the keyword classifier, plus filler that doesn't
+DISASTER_PHRASES = ['heavy rain and flood', 'an earthquake tremor', 'a severe cyclone', 'drought and famine',
+                    'a landslide', 'an extreme heat wave', 'cold wave and frost', 'a tsunami', 'a hailstorm',
+                    'lightning strikes', 'an avalanche', 'a forest fire', 'a cloudburst', 'an epidemic outbreak',
+                    'a train accident', 'a building collapse']
+ASSISTANCE_TYPES = ['Medical', 'Food', 'Rescue', 'Shelter', 'Logistics']
+RESOURCE_TYPES = ['food', 'water', 'medical', 'shelter kits', 'boats']
+SENSOR_TYPES = ['temperature', 'humidity', 'rainfall', 'windspeed']
+CHUNK_ROWS = 50_000
+BCRYPT_COSTS = [10, 11, 12, 13]
+
+
+# --- Synthetic data ---
+
+def generate_locations(out_dir, count, rng):
+    """Real location names first, then synthetic "Zone NNNN" names, with coordinates inside India."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'location_coords.json')) as f:
+        real = [name for name, coords in json.load(f).items() if coords[0] is not None]
+    names = real[:count] + [f"Zone {i:05d}" for i in range(max(0, count - len(real)))]
+    lats = rng.uniform(8.0, 35.0, len(names))
+    lons = rng.uniform(68.0, 97.0, len(names))
+    coords = {name: [round(float(lat), 6), round(float(lon), 6)] for name, lat, lon in zip(names, lats, lons)}
+    with open(os.path.join(out_dir, 'location_coords.json'), 'w') as f:
+        json.dump(coords, f)
+    return names
+
+
+def generate_disaster_csv(path, rows, locations, rng):
+    """Writes a CSV shaped like india_disaster_data.csv, in chunks to bound memory."""
+    written = 0
+    with open(path, 'w', newline='') as f:
+        while written < rows:
+            n = min(CHUNK_ROWS, rows - written)
+            loc = np.array(locations, dtype=object)[rng.integers(0, len(locations), n)]
+            phrase = np.array(DISASTER_PHRASES, dtype=object)[rng.integers(0, len(DISASTER_PHRASES), n)]
+            years = rng.integers(1990, 2024, n)
+            days = rng.integers(1, 28, n)
+            months = rng.integers(1, 13, n)
+            chunk = pd.DataFrame({
+                'Title': [f"{y} {l} disaster" for y, l in zip(years, loc)],
+                'Duration': [f"{d:02d}-May" for d in days],
+                'Year': years,
+                'Disaster_Info': [f"the {y} event in {l} was caused by {p} affecting thousands of people"
+                                  for y, l, p in zip(years, loc, phrase)],
+                'Date': [f"{y}-{m:02d}-{d:02d}" for y, m, d in zip(years, months, days)],
+            }, index=np.arange(written, written + n))
+            chunk.to_csv(f, header=(written == 0))
+            written += n
+
+
+def seed_database(app, locations, volunteers, resources, sensor_readings, rng):
+    from sqlalchemy import insert
+    from extensions import db
+    from models import Volunteer, Resource, SensorData
+    from services.sync import TABLE_NAMES, record_inserts
+
+    def insert_chunks(model, total, make_rows):
+        done = 0
+        while done < total:
+            n = min(CHUNK_ROWS, total - done)
+            last_id = db.session.scalar(db.select(db.func.max(model.id))) or 0
+            db.session.execute(insert(model), make_rows(n))
+            if model in TABLE_NAMES: # logged for /sync like the app's own bulk writes
+                record_inserts(model, last_id)
+            db.session.commit()
+            done += n
+
+    locs = np.array(locations, dtype=object)
+    with app.app_context():
+        insert_chunks(Volunteer, volunteers, lambda n: [
+            {'name': f"Volunteer {i}", 'contact': f"9{i:09d}", 'location': l, 'available': True,
+             'assistance_type': a}
+            for i, l, a in zip(rng.integers(0, 10**9, n), locs[rng.integers(0, len(locs), n)],
+                               np.array(ASSISTANCE_TYPES, dtype=object)[rng.integers(0, len(ASSISTANCE_TYPES), n)])])
+        insert_chunks(Resource, resources, lambda n: [
+            {'resource_type': t, 'quantity': int(q), 'location': l, 'assigned': False}
+            for t, q, l in zip(np.array(RESOURCE_TYPES, dtype=object)[rng.integers(0, len(RESOURCE_TYPES), n)],
+                               rng.integers(1, 500, n), locs[rng.integers(0, len(locs), n)])])
+        base = datetime(2024, 1, 1)
+        insert_chunks(SensorData, sensor_readings, lambda n: [
+            {'sensor_type': t, 'value': float(v), 'latitude': float(la), 'longitude': float(lo),
+             'timestamp': base + timedelta(seconds=int(s))}
+            for t, v, la, lo, s in zip(np.array(SENSOR_TYPES, dtype=object)[rng.integers(0, len(SENSOR_TYPES), n)],
+                                       rng.normal(30, 15, n), rng.uniform(8, 35, n), rng.uniform(68, 97, n),
+                                       rng.integers(0, 365 * 86400, n))])
+
+
+# --- Timing ---
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        'runs': len(samples),
+        'min_s': round(samples[0], 6),
+        'median_s': round(statistics.median(samples), 6),
+        'mean_s': round(statistics.fmean(samples), 6),
+        'p95_s': round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 6),
+        'max_s': round(samples[-1], 6),
+    }
+
+
+def time_request(client, method, url, repeat, expect=(200,), **kwargs):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.open(url, method=method, **kwargs)
+        samples.append(time.perf_counter() - start)
+        if response.status_code not in expect:
+            raise RuntimeError(f"{method} {url} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return summarize(samples)
+
+
+def time_bcrypt_costs(costs, repeat):
+    """Password check time at each bcrypt cost, to pick BCRYPT_LOG_ROUNDS for the login path."""
+    import bcrypt
+
+    results = {}
+    for cost in costs:
+        hashed = bcrypt.hashpw(b'benchmark-password', bcrypt.gensalt(rounds=cost))
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            bcrypt.checkpw(b'benchmark-password', hashed)
+            samples.append(time.perf_counter() - start)
+        results[f'bcrypt_cost_{cost}'] = summarize(samples)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def run(params, repeat, seed, workdir):
+    rng = np.random.default_rng(seed)
+    timings = {}
+
+    print(f"Generating synthetic data in {workdir} ...")
+    start = time.perf_counter()
+    locations = generate_locations(workdir, params['locations'], rng)
+    generate_disaster_csv(os.path.join(workdir, 'india_disaster_data.csv'), params['disaster_rows'], locations, rng)
+    print(f"  dataset generated in {time.perf_counter() - start:.1f}s")
+
+    # Config reads the environment at import time, so set it before importing the app
+    os.environ['DATA_DIR'] = workdir
+    os.environ['DATABASE_URI'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ.setdefault('LLM_RATE_LIMIT_DB', os.path.join(workdir, 'ratelimit.db'))
+    os.environ.setdefault('SEARCH_INDEX_PATH', os.path.join(workdir, 'search.db')) # built from scratch each run
+    os.environ.setdefault('ADMISSION_CLIENT_RATE', '0') # one test client drives every timed request
+    from app import create_app
+    from extensions import db, jwt
+    from models import ChangeLog
+
+    start = time.perf_counter()
+    app = create_app()
+    timings['startup'] = {'create_app_s': round(time.perf_counter() - start, 6),
+                           'rows_loaded': int(len(app.disaster_df))}
+    print(f"  create_app() took {timings['startup']['create_app_s']:.2f}s")
+
+    print("Seeding database ...")
+    start = time.perf_counter()
+    seed_database(app, locations, params['volunteers'], params['resources'], params['sensor_readings'], rng)
+    print(f"  database seeded in {time.perf_counter() - start:.1f}s")
+
+    client = app.test_client()
+    probe = locations[0]
+    print("Timing endpoints ...")
+    timings['risk_zones'] = time_request(client, 'GET', '/api/risk_zones', repeat)
+    timings['historical_risk_all'] = time_request(client, 'GET', '/api/historical-risk', repeat)
+    timings['historical_risk_location'] = time_request(
+        client, 'GET', f'/api/historical-risk?location={probe}&disaster_type=Flood&rainfall=150', repeat)
+    timings['location_summary'] = time_request(client, 'GET', '/location-summary', repeat)
+    timings['analytics_cube_trend'] = time_request(
+        client, 'GET', f'/api/analytics/cube?location={probe}&disaster_type=Flood&group_by=year', repeat)
+    timings['analytics_cube_rollup'] = time_request(
+        client, 'GET', '/api/analytics/cube?group_by=location,disaster_type', repeat)
+    timings['search_phrase'] = time_request(client, 'GET', '/api/search?q="severe cyclone"', repeat)
+    timings['search_filtered'] = time_request(
+        client, 'GET', f'/api/search?q=flood&location={probe}&start_date=2000-01-01&end_date=2009-12-31', repeat)
+    for name, url in [('volunteers_list', '/volunteers'), ('resources_list', '/resources'),
+                      ('risk_zones_columns', '/api/risk_zones?format=columns'),
+                      ('volunteers_list_columns', '/volunteers?format=columns'),
+                      ('resources_list_columns', '/resources?format=columns')]:
+        timings[name] = time_request(client, 'GET', url, repeat)
+        timings[name]['payload_bytes'] = len(client.get(url).data)
+    # Cross-zone dispatch: candidates ranked over the zone distance matrix built at startup
+    timings['dispatch'] = time_request(client, 'GET', f'/dispatch?zone={probe}', repeat)
+    timings['dispatch']['zones'] = len(app.zones)
+    timings['dispatch_filtered'] = time_request(
+        client, 'GET', f'/dispatch?zone={probe}&kind=volunteers&assistance_type=Medical&max_km=150', repeat)
+    timings['auto_assign'] = time_request(client, 'POST', '/auto-assign', repeat, expect=(201, 404))
+
+    # Delta sync: a client's first download (gzipped, one page), then what one auto-assignment changed
+    gzip_accepted = {'Accept-Encoding': 'gzip'}
+    timings['sync_full_page'] = time_request(client, 'GET', '/sync?since=0', repeat, headers=gzip_accepted)
+    timings['sync_full_page']['payload_bytes'] = len(client.get('/sync?since=0', headers=gzip_accepted).data)
+    with app.app_context():
+        version = db.session.scalar(db.select(db.func.max(ChangeLog.version)))
+    client.post('/auto-assign')
+    timings['sync_delta'] = time_request(client, 'GET', f'/sync?since={version}', repeat, headers=gzip_accepted)
+    timings['sync_delta']['payload_bytes'] = len(client.get(f'/sync?since={version}', headers=gzip_accepted).data)
+
+    credentials = {'username': 'bench-user', 'password': 'benchmark-password', 'role': 'admin'}
+    client.post('/auth/register', json=credentials)
+    timings['login'] = time_request(client, 'POST', '/auth/login', repeat, json=credentials)
+    token = client.post('/auth/login', json=credentials).get_json()['access_token']
+    timings['authenticated_request'] = time_request(
+        client, 'GET', '/api/sensor-data?sensor_type=none', max(repeat * 10, 50),
+        headers={'Authorization': f'Bearer {token}'})
+    timings['authenticated_request']['jwt_decode_cache'] = jwt.stats()
+    timings.update(time_bcrypt_costs(BCRYPT_COSTS, repeat))
+
+    ingest_count = max(repeat * 50, 100)
+    samples = []
+    for i in range(ingest_count):
+        body = {'sensor_type': SENSOR_TYPES[i % len(SENSOR_TYPES)], 'value': float(rng.normal(30, 15)),
+                'latitude': float(rng.uniform(8, 35)), 'longitude': float(rng.uniform(68, 97))}
+        start = time.perf_counter()
+        response = client.post('/sensor-data', json=body)
+        samples.append(time.perf_counter() - start)
+        if response.status_code != 201:
+            raise RuntimeError(f"POST /sensor-data returned {response.status_code}")
+    timings['sensor_ingestion'] = summarize(samples)
+    timings['sensor_ingestion']['readings_per_s'] = round(ingest_count / sum(samples), 1)
+
+    batch = 1_000
+    samples = []
+    for _ in range(repeat):
+        body = [{'sensor_type': SENSOR_TYPES[i % len(SENSOR_TYPES)], 'value': float(value),
+                 'latitude': float(lat), 'longitude': float(lon)}
+                for i, (value, lat, lon) in enumerate(zip(rng.normal(30, 15, batch), rng.uniform(8, 35, batch),
+                                                          rng.uniform(68, 97, batch)))]
+        start = time.perf_counter()
+        response = client.post('/sensor-data/bulk', json=body)
+        samples.append(time.perf_counter() - start)
+        if response.status_code != 201:
+            raise RuntimeError(f"POST /sensor-data/bulk returned {response.status_code}")
+    timings['sensor_bulk_ingestion'] = summarize(samples)
+    timings['sensor_bulk_ingestion']['readings_per_s'] = round(repeat * batch / sum(samples), 1)
+
+    # Bulk import: a volunteer file of new contacts, then the same file again (every row an update)
+    rows = params['volunteers']
+    body = 'name,contact,location,assistance_type\n' + ''.join(
+        f"Imported {i},8{i:09d},{locations[i % len(locations)]},{ASSISTANCE_TYPES[i % len(ASSISTANCE_TYPES)]}\n"
+        for i in range(rows))
+    for name in ('volunteer_import_insert', 'volunteer_import_update'):
+        start = time.perf_counter()
+        response = client.post('/volunteers/import', data=body, content_type='text/csv')
+        elapsed = time.perf_counter() - start
+        if response.status_code != 200 or response.get_json()['rejected']:
+            raise RuntimeError(f"POST /volunteers/import returned {response.status_code}")
+        timings[name] = {'median_s': round(elapsed, 6), 'rows': rows, 'rows_per_s': round(rows / elapsed, 1)}
+
+    for name, result in timings.items():
+        print(f"  {name}: {result}")
+    return timings
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+    print(f"\nComparison against {baseline_path} (median, or create_app time for startup):")
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        key = 'create_app_s' if name == 'startup' else 'median_s'
+        old, new = baseline[name].get(key), result.get(key)
+        if old and new:
+            print(f"  {name:28s} {old:10.4f}s -> {new:10.4f}s  ({(new - old) / old * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the disaster management backend's hot endpoints.")
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    for name in SCALES['small']:
+        parser.add_argument('--' + name.replace('_', '-'), type=int, dest=name, help=f"override {name} for the scale")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per endpoint")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workdir', help="keep generated data here instead of a temporary directory")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    params = dict(SCALES[args.scale])
+    for name in params:
+        if getattr(args, name) is not None:
+            params[name] = getattr(args, name)
+
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        results = run(params, args.repeat, args.seed, args.workdir)
+    else:
+        with tempfile.TemporaryDirectory(prefix='disaster-bench-') as workdir:
+            results = run(params, args.repeat, args.seed, workdir)
+
+    report = {
+        'meta': {
+            'git_commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'scale': args.scale,
+            'params': params,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+# backend/bulk_import.py
+#
+# Bulk CSV/XLSX import for volunteers and resources. The file is parsed a
+# chunk at a time, each chunk is validated with column operations, and its
+# valid rows are upserted by natural key with one SELECT, one executemany
+# UPDATE and one executemany INSERT, then committed before the next chunk is
+# read. Rejected rows are reported by spreadsheet row number.
+
+import itertools
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, insert, select, tuple_, update
+
+from extensions import db
+from models import Resource, Volunteer
+from services.sync import record_changes, record_inserts
+
+DEFAULT_CHUNK_ROWS = 5_000
+DEFAULT_MAX_ERRORS = 1_000
+FORMATS = ('csv', 'xlsx')
+_MAX_INTEGER = 2**31 - 1 # Integer columns are 32-bit on PostgreSQL
+_FLAGS = {'true': True, 'yes': True, 'y': True, '1': True, 'false': False, 'no': False, 'n': False, '0': False}
+
+# `key` is the natural key rows are matched on; `scope` narrows which stored rows can be matched.
+# Blank optional cells leave the stored value alone (or take the column default on insert).
+ImportSpec = namedtuple('ImportSpec', 'model key required optional scope')
+IMPORT_SPECS = {
+    'volunteers': ImportSpec(Volunteer, ('contact',), ('name', 'contact', 'location'),
+                             ('assistance_type', 'assigned_zone', 'available'), None),
+    # Stock already assigned to a volunteer is left alone; an import restates the unassigned quantity
+    'resources': ImportSpec(Resource, ('resource_type', 'location'), ('resource_type', 'quantity', 'location'),
+                            (), Resource.assigned == db.false()),
+}
+
+
+class BulkImportError(ValueError):
+    """The file as a whole can't be imported (unreadable, wrong format, missing columns)."""
+
+
+def file_format(filename=None, content_type=None, requested=None):
+    """'csv' or 'xlsx' from an explicit choice, the file extension or the content type."""
+    if requested:
+        fmt = requested.lower()
+    elif filename and '.' in filename:
+        fmt = filename.rsplit('.', 1)[1].lower()
+    elif content_type and 'spreadsheetml' in content_type:
+        fmt = 'xlsx'
+    else:
+        fmt = 'csv'
+    if fmt not in FORMATS:
+        raise BulkImportError(f"Unsupported file format '{fmt}'; expected one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def _cell_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) # phone numbers and quantities typed as numbers
+    return str(value)
+
+
+def read_chunks(source, fmt, chunksize=DEFAULT_CHUNK_ROWS):
+    """
+    Yields DataFrames of at most `chunksize` rows with every cell as text
+    ('' when blank). `source` is a path or a binary file object; XLSX
+    needs a seekable one and openpyxl, and only the first sheet is read.
+    """
+    if fmt == 'csv':
+        try:
+            yield from pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False,
+                                   encoding='utf-8-sig', skipinitialspace=True)
+        except pd.errors.EmptyDataError:
+            raise BulkImportError('The file is empty')
+        except (pd.errors.ParserError, UnicodeDecodeError) as e:
+            raise BulkImportError(f'Could not parse the CSV file: {e}')
+        return
+
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise BulkImportError('XLSX import needs openpyxl; upload the sheet as CSV instead')
+    try:
+        workbook = load_workbook(source, read_only=True, data_only=True)
+    except Exception as e:
+        raise BulkImportError(f'Could not open the XLSX file: {e}')
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise BulkImportError('The file is empty')
+        columns = [_cell_text(name) for name in header]
+        while True:
+            batch = list(itertools.islice(rows, chunksize))
+            if not batch:
+                break
+            yield pd.DataFrame(batch, columns=columns, dtype=object).map(_cell_text)
+    finally:
+        workbook.close()
+
+
+def _parse_quantity(text):
+    quantity = pd.to_numeric(text, errors='coerce')
+    bad = text.ne('') & (quantity.isna() | (quantity < 0) | (quantity > _MAX_INTEGER) | (quantity % 1 != 0))
+    return quantity, bad, 'must be a whole number of at least 0'
+
+
+def _parse_flag(text):
+    flag = text.str.lower().map(_FLAGS)
+    return flag, text.ne('') & flag.isna(), 'must be true or false'
+
+
+_PARSERS = {'quantity': _parse_quantity, 'available': _parse_flag}
+
+
+def validate_chunk(spec, chunk, first_row):
+    """
+    Splits a chunk into typed valid rows (a DataFrame of the spec's
+    columns present in the file, None where an optional cell is blank) and
+    a list of {'row', 'errors': [{'field', 'message'}]} for the rest.
+    `first_row` is the spreadsheet row number of the chunk's first row.
+    """
+    columns, problems = {}, []
+    for name in spec.required + spec.optional:
+        if name not in chunk:
+            continue
+        text = chunk[name].str.strip()
+        if name in spec.required:
+            problems.append((name, 'is required', text.eq('')))
+        parse = _PARSERS.get(name)
+        if parse:
+            value, bad, message = parse(text)
+            problems.append((name, message, bad))
+        else:
+            value = text
+            length = getattr(spec.model.__table__.c[name].type, 'length', None)
+            if length:
+                problems.append((name, f'is longer than {length} characters', text.str.len() > length))
+        columns[name] = value
+
+    masks = np.column_stack([mask.to_numpy(dtype=bool) for _, _, mask in problems])
+    rejected = masks.any(axis=1)
+    errors = [{'row': first_row + int(i),
+               'errors': [{'field': problems[j][0], 'message': problems[j][1]} for j in np.flatnonzero(masks[i])]}
+              for i in np.flatnonzero(rejected)]
+
+    valid = pd.DataFrame(columns)[~rejected]
+    if 'quantity' in valid:
+        valid['quantity'] = valid['quantity'].astype('int64')
+    for name in spec.optional:
+        if name in valid:
+            valid[name] = valid[name].astype(object).where(valid[name].ne('') & valid[name].notna(), None)
+    return valid, errors
+
+
+def upsert(spec, rows, dry_run=False):
+    """
+    Updates the stored row matching each row's natural key (the lowest id
+    if several do) and inserts the others; a key repeated within `rows`
+    keeps its last row. Returns (inserted, updated, duplicates). With
+    `dry_run` only the lookup runs.
+    """
+    deduped = rows.drop_duplicates(list(spec.key), keep='last')
+    duplicates = len(rows) - len(deduped)
+    key_columns = [getattr(spec.model, name) for name in spec.key]
+    keys = list(deduped[list(spec.key)].itertuples(index=False, name=None))
+    if not keys:
+        return 0, 0, duplicates
+
+    if len(key_columns) == 1:
+        matches = key_columns[0].in_([key[0] for key in keys])
+    else:
+        matches = tuple_(*key_columns).in_(keys)
+    lookup = select(*key_columns, func.min(spec.model.id)).where(matches).group_by(*key_columns)
+    if spec.scope is not None:
+        lookup = lookup.where(spec.scope)
+    existing = {tuple(row[:-1]): row[-1] for row in db.session.execute(lookup)}
+
+    inserts, updates = [], []
+    for key, record in zip(keys, deduped.to_dict('records')):
+        record = {name: value for name, value in record.items() if value is not None}
+        row_id = existing.get(key)
+        if row_id is None:
+            inserts.append(record)
+        else:
+            record['id'] = row_id
+            updates.append(record)
+    if not dry_run:
+        # Bulk statements skip the session's flush events, so the /sync change log is written here
+        if updates:
+            db.session.execute(update(spec.model), updates) # bulk UPDATE by primary key
+            record_changes(spec.model, [record['id'] for record in updates], 'update')
+        if inserts:
+            last_id = db.session.scalar(select(func.max(spec.model.id))) or 0
+            db.session.execute(insert(spec.model), inserts)
+            record_inserts(spec.model, last_id)
+    return len(inserts), len(updates), duplicates
+
+
+def import_table(kind, source, fmt, chunksize=DEFAULT_CHUNK_ROWS, dry_run=False, max_errors=DEFAULT_MAX_ERRORS):
+    """
+    Imports a volunteers or resources file and returns the report. Each
+    chunk is committed on its own, so if a later chunk fails the earlier
+    ones stay imported; a dry run validates and matches without writing.
+    Needs an app context.
+    """
+    spec = IMPORT_SPECS[kind]
+    started = time.perf_counter()
+    report = {'kind': kind, 'dry_run': dry_run, 'rows': 0, 'inserted': 0, 'updated': 0, 'duplicates': 0,
+              'rejected': 0, 'errors': []}
+    first_row = 2 # row 1 is the header
+    for chunk in read_chunks(source, fmt, chunksize):
+        chunk.columns = [str(name).strip().lower().replace(' ', '_') for name in chunk.columns]
+        missing = [name for name in spec.required if name not in chunk]
+        if missing:
+            raise BulkImportError(f"Missing column(s): {', '.join(missing)}")
+
+        valid, errors = validate_chunk(spec, chunk, first_row)
+        try:
+            inserted, updated, duplicates = upsert(spec, valid, dry_run)
+            if dry_run:
+                db.session.rollback()
+            else:
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        report['rows'] += len(chunk)
+        report['inserted'] += inserted
+        report['updated'] += updated
+        report['duplicates'] += duplicates
+        report['rejected'] += len(errors)
+        report['errors'].extend(errors[:max_errors - len(report['errors'])])
+        first_row += len(chunk)
+
+    report['errors_truncated'] = report['rejected'] > len(report['errors'])
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    return report
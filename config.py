@@ -5,3 +5,122 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URI') or 'sqlite:///disaster.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-super-secret'
+    JWT_VERIFY_SUB = False # identities are {'id', 'username', 'role'} dicts, not string subjects
+    JWT_DECODE_CACHE_SIZE = int(os.environ.get('JWT_DECODE_CACHE_SIZE', 1024)) # verified tokens kept; 0 disables
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12)) # each +1 doubles login hashing time
+    JSON_SERIALIZER = os.environ.get('JSON_SERIALIZER') or 'orjson' # or 'stdlib'; orjson falls back to it if missing
+
+    # Database engine profile (applied by database.apply_engine_profile)
+    # Reads during GET/HEAD requests go to the replica when set. It lags the primary, so a GET that writes and
+    # then reads back (or a client reading right after its own POST) may not see the write yet
+    DATABASE_REPLICA_URI = os.environ.get('DATABASE_REPLICA_URI')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800)) # seconds; below the server's idle timeout
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10)) # seconds to wait for a free connection
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_STATEMENT_CACHE_SIZE = int(os.environ.get('DB_STATEMENT_CACHE_SIZE', 1000)) # compiled SQL statements kept per engine
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL' # readers don't block the writer
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL' # safe with WAL, far fewer fsyncs
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)) # wait on a locked database instead of failing
+    DB_CREATE_ALL = os.environ.get('DB_CREATE_ALL', 'true').lower() == 'true' # create_all() at startup; false for `flask db` (migrations/README)
+
+    # Static datasets loaded by create_app
+    DATA_DIR = os.environ.get('DATA_DIR') or os.path.dirname(__file__)
+    DISASTER_DATA_PATH = os.environ.get('DISASTER_DATA_PATH') or os.path.join(DATA_DIR, 'india_disaster_data.csv')
+    LOCATION_COORDS_PATH = os.environ.get('LOCATION_COORDS_PATH') or os.path.join(DATA_DIR, 'location_coords.json')
+    LOCATION_ALIASES_PATH = os.environ.get('LOCATION_ALIASES_PATH') or os.path.join(os.path.dirname(__file__), 'location_aliases.json')
+    GAZETTEER_FUZZY_THRESHOLD = float(os.environ.get('GAZETTEER_FUZZY_THRESHOLD', 0.7)) # trigram Dice similarity
+    INGEST_CHUNK_ROWS = int(os.environ.get('INGEST_CHUNK_ROWS', 50_000)) # CSV rows parsed at a time
+    INGEST_WORKERS = int(os.environ.get('INGEST_WORKERS', 0)) # processes for location/type inference; 0 = one per CPU
+    INGEST_PARALLEL_MIN_ROWS = int(os.environ.get('INGEST_PARALLEL_MIN_ROWS', 100_000)) # smaller files stay serial
+    DISASTER_TEXT_SPILL_PATH = os.environ.get('DISASTER_TEXT_SPILL_PATH') # keep Title/Disaster_Info here; unset drops it
+    SEARCH_INDEX_PATH = os.environ.get('SEARCH_INDEX_PATH') or os.path.join(os.path.dirname(__file__), 'instance', 'search.db') # full-text index for /api/search
+    FAST_START = os.environ.get('FAST_START', 'false').lower() == 'true' # load the above on a background thread
+    WARMUP_RETRY_AFTER = int(os.environ.get('WARMUP_RETRY_AFTER', 1)) # seconds, sent with 503s during warm-up
+    WARMUP_RETRIES = int(os.environ.get('WARMUP_RETRIES', 3)) # reruns of a failed warm-up before staying unready
+    WARMUP_RETRY_DELAY = float(os.environ.get('WARMUP_RETRY_DELAY', 5.0)) # seconds before the first rerun; doubles
+
+    # Streaming detection on incoming sensor readings (services.sensor_stream)
+    SENSOR_WINDOW = int(os.environ.get('SENSOR_WINDOW', 120)) # readings kept per sensor type and grid cell
+    SENSOR_MIN_SAMPLES = int(os.environ.get('SENSOR_MIN_SAMPLES', 30)) # before z-scores are trusted
+    SENSOR_ZSCORE_LIMIT = float(os.environ.get('SENSOR_ZSCORE_LIMIT', 4.0))
+    SENSOR_GRID_DEGREES = float(os.environ.get('SENSOR_GRID_DEGREES', 0.5)) # grid cell size, about 55 km
+    SENSOR_ALERT_CONSECUTIVE = int(os.environ.get('SENSOR_ALERT_CONSECUTIVE', 3)) # readings in a row before alerting
+    SENSOR_ALERT_COOLDOWN = float(os.environ.get('SENSOR_ALERT_COOLDOWN', 900)) # seconds between alerts per cell and type
+    SENSOR_ALERT_RADIUS_KM = float(os.environ.get('SENSOR_ALERT_RADIUS_KM', 50)) # nearest known place to name the alert
+    SENSOR_BULK_MAX_READINGS = int(os.environ.get('SENSOR_BULK_MAX_READINGS', 10_000)) # per POST /sensor-data/bulk
+
+    # Volunteer/resource file imports (services.bulk_import)
+    BULK_IMPORT_CHUNK_ROWS = int(os.environ.get('BULK_IMPORT_CHUNK_ROWS', 5_000)) # rows validated and upserted per statement batch
+    BULK_IMPORT_MAX_ERRORS = int(os.environ.get('BULK_IMPORT_MAX_ERRORS', 1_000)) # rejected rows listed in the report
+
+    # Background jobs (services.scheduler, services.jobs); one scheduler thread per worker process
+    SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'false').lower() == 'true'
+    SCHEDULER_MAX_WORKERS = int(os.environ.get('SCHEDULER_MAX_WORKERS', 2)) # jobs running at once per worker
+    SCHEDULER_JITTER = float(os.environ.get('SCHEDULER_JITTER', 0.1)) # +/- fraction of each interval
+    SCHEDULER_TICK = float(os.environ.get('SCHEDULER_TICK', 1.0)) # seconds between checks for due jobs
+    SCHEDULER_SENSOR_ROLLUP_INTERVAL = float(os.environ.get('SCHEDULER_SENSOR_ROLLUP_INTERVAL', 60))
+    SCHEDULER_GEOCODE_RETRY_INTERVAL = float(os.environ.get('SCHEDULER_GEOCODE_RETRY_INTERVAL', 300))
+    SCHEDULER_SEVERITY_REFRESH_INTERVAL = float(os.environ.get('SCHEDULER_SEVERITY_REFRESH_INTERVAL', 3600))
+    SCHEDULER_LOCATION_SUMMARY_INTERVAL = float(os.environ.get('SCHEDULER_LOCATION_SUMMARY_INTERVAL', 30))
+    SCHEDULER_CHANGE_LOG_COMPACTION_INTERVAL = float(os.environ.get('SCHEDULER_CHANGE_LOG_COMPACTION_INTERVAL', 3600))
+    SENSOR_ROLLUP_BATCH = int(os.environ.get('SENSOR_ROLLUP_BATCH', 50_000)) # readings folded in per run
+    GEOCODE_RETRY_BATCH = int(os.environ.get('GEOCODE_RETRY_BATCH', 20)) # places geocoded per run
+    GEOCODE_RETRY_MAX_AGE = float(os.environ.get('GEOCODE_RETRY_MAX_AGE', 86_400)) # seconds; older alerts are given up on
+    LOCATION_SUMMARY_MAX_AGE = float(os.environ.get('LOCATION_SUMMARY_MAX_AGE', 120)) # seconds a warmed summary is served
+
+    # Delta sync for field clients (/sync, services.sync)
+    SYNC_MAX_CHANGES = int(os.environ.get('SYNC_MAX_CHANGES', 5000)) # change log entries per response; clients page with has_more
+    SYNC_TOMBSTONE_TTL = float(os.environ.get('SYNC_TOMBSTONE_TTL', 30 * 86_400)) # seconds deletions stay in the log
+    # Not on SQLite: /sync leaves out log entries younger than this, so it must exceed the longest write transaction
+    SYNC_COMMIT_LAG = float(os.environ.get('SYNC_COMMIT_LAG', 5.0)) # seconds
+    SYNC_GZIP_MIN_BYTES = int(os.environ.get('SYNC_GZIP_MIN_BYTES', 1024)) # smaller answers go uncompressed
+    SYNC_GZIP_LEVEL = int(os.environ.get('SYNC_GZIP_LEVEL', 6))
+
+    # Cross-zone dispatch (/dispatch, /auto-assign; services.dispatch) over the zone distance matrix (zones.py)
+    DISPATCH_MAX_KM = float(os.environ.get('DISPATCH_MAX_KM', 300)) # farthest help is drawn from; 0 keeps auto-assign within one location
+    DISPATCH_SEVERITY_WEIGHT = float(os.environ.get('DISPATCH_SEVERITY_WEIGHT', 1.0)) # the most severe source zone counts its distance (1 + weight) times
+    DISPATCH_MAX_RESULTS = int(os.environ.get('DISPATCH_MAX_RESULTS', 50)) # candidates per kind in a /dispatch answer
+
+    # Admission control for the expensive routes (services.admission); caps are per worker process, so size
+    # them against its threads. severity=critical reports queue first and get ADMISSION_CRITICAL_RESERVE extra slots
+    ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', 'true').lower() == 'true'
+    ADMISSION_ROUTE_LIMITS = os.environ.get('ADMISSION_ROUTE_LIMITS') or (
+        'api.report_alert=8,api.chatbot_interaction=4,bulk_import=2,location_summary=4,historical_risk_analysis=4,'
+        'heatmap_data=4,risk_zones=4,api.get_risk_zones=4,api.analytics_cube=4,api.search=8') # endpoint=concurrent requests
+    ADMISSION_CRITICAL_RESERVE = int(os.environ.get('ADMISSION_CRITICAL_RESERVE', 4))
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT', 2.0)) # seconds a write waits for a slot
+    ADMISSION_MAX_QUEUE = int(os.environ.get('ADMISSION_MAX_QUEUE', 32)) # waiting requests per route; critical ones always queue
+    ADMISSION_CLIENT_RATE = float(os.environ.get('ADMISSION_CLIENT_RATE', 5)) # requests/s per client on gated routes; 0 disables
+    # Clients are keyed by signed-in user, else by address. Behind reverse proxies, set TRUSTED_PROXIES to how many
+    # there are so the address comes from X-Forwarded-For; otherwise every anonymous client shares the proxy's bucket
+    TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES', 0))
+    ADMISSION_CLIENT_BURST = int(os.environ.get('ADMISSION_CLIENT_BURST', 20))
+    ADMISSION_MAX_CLIENTS = int(os.environ.get('ADMISSION_MAX_CLIENTS', 10_000)) # client buckets kept, least recent dropped
+    ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', 2)) # seconds, sent with 503s when shedding
+
+    # Outbound calls (chatbot LLM, geocoder) share one pooled async gateway
+    UPSTREAM_MAX_CONCURRENCY = int(os.environ.get('UPSTREAM_MAX_CONCURRENCY', 200))
+    UPSTREAM_MAX_CONNECTIONS = int(os.environ.get('UPSTREAM_MAX_CONNECTIONS', 100))
+    UPSTREAM_TIMEOUT_BUDGET = float(os.environ.get('UPSTREAM_TIMEOUT_BUDGET', 20)) # seconds per inbound request
+    GEOCODER_URL = os.environ.get('GEOCODER_URL') or 'https://nominatim.openstreetmap.org/search'
+    GEOCODER_MIN_INTERVAL = float(os.environ.get('GEOCODER_MIN_INTERVAL', 1.0)) # Nominatim rate limit
+    ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 256)) # view threads under asgi.py
+
+    # Chatbot LLM client
+    LLM_API_URL = os.environ.get('LLM_API_URL') or 'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-preview-05-20:generateContent'
+    GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY') or ''
+    LLM_CONNECT_TIMEOUT = float(os.environ.get('LLM_CONNECT_TIMEOUT', 3))
+    LLM_READ_TIMEOUT = float(os.environ.get('LLM_READ_TIMEOUT', 15))
+    LLM_MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', 2))
+    LLM_RATE_LIMIT_PER_SEC = float(os.environ.get('LLM_RATE_LIMIT_PER_SEC', 5)) # shared by all workers on the host
+    LLM_RATE_LIMIT_BURST = int(os.environ.get('LLM_RATE_LIMIT_BURST', 10))
+    LLM_RATE_LIMIT_DB = os.environ.get('LLM_RATE_LIMIT_DB') or os.path.join(os.path.dirname(__file__), 'instance', 'ratelimit.db')
+    LLM_CACHE_MAX_ENTRIES = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', 1000))
+    LLM_CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL', 3600)) # seconds
+
+    # Instrumentation: opt-in per-request sampling profiler (?profile=1 or X-Profile: 1)
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', 0.005)) # seconds between stack samples
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') # defaults to <instance>/profiles
@@ -0,0 +1,19 @@
+import os
+import tempfile
+
+# Config reads these at import, so they are set before any test module imports the app
+os.environ.setdefault('DATABASE_URI', 'sqlite://') # in-memory
+os.environ.setdefault('SEARCH_INDEX_PATH', os.path.join(tempfile.mkdtemp(), 'search.db')) # outside the source tree
+
+import pytest
+
+from app import create_app
+from config import Config
+
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    """A fully started app per test module, with its own in-memory database and search index."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(Config, 'SEARCH_INDEX_PATH', str(tmp_path_factory.mktemp('search') / 'search.db'))
+        return create_app()
@@ -0,0 +1,135 @@
+# backend/database.py
+#
+# Engine profile for the SQLAlchemy extension: pool sizing, pre-ping and the
+# compiled-statement cache from config, SQLite pragmas on every connection, and
+# a session that sends GET/HEAD reads to an optional read replica.
+
+from functools import wraps
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+
+READ_METHODS = {'GET', 'HEAD'}
+SQLITE_SYNCHRONOUS_NAMES = {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'}
+REPLICA_BIND = 'replica'
+
+
+def _is_sqlite(url):
+    return url.get_backend_name() == 'sqlite'
+
+
+def _is_sqlite_memory(url):
+    return _is_sqlite(url) and (url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory')
+
+
+def engine_options(uri, config):
+    """
+    create_engine() options for `uri` from the DB_* settings. In-memory
+    SQLite runs on a single static connection, so pool sizing is left out
+    for it.
+    """
+    options = {
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+        'query_cache_size': config['DB_STATEMENT_CACHE_SIZE'],
+    }
+    if not _is_sqlite_memory(make_url(uri)):
+        options.update(
+            pool_size=config['DB_POOL_SIZE'],
+            max_overflow=config['DB_MAX_OVERFLOW'],
+            pool_recycle=config['DB_POOL_RECYCLE'],
+            pool_timeout=config['DB_POOL_TIMEOUT'],
+        )
+    return options
+
+
+def apply_engine_profile(app):
+    """
+    Fills SQLALCHEMY_ENGINE_OPTIONS (unless set explicitly) and the replica
+    bind. Call before db.init_app(app).
+    """
+    config = app.config
+    if not config.get('SQLALCHEMY_ENGINE_OPTIONS'):
+        config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(config['SQLALCHEMY_DATABASE_URI'], config)
+    replica_uri = config.get('DATABASE_REPLICA_URI')
+    if replica_uri:
+        binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+        binds.setdefault(REPLICA_BIND, {'url': replica_uri, **engine_options(replica_uri, config)})
+        config['SQLALCHEMY_BINDS'] = binds
+
+
+def init_engine_events(app, db):
+    """Sets journal mode, synchronous and busy timeout on every new SQLite connection."""
+    config = app.config
+    with app.app_context():
+        engines = db.engines
+
+    for engine in engines.values():
+        if not _is_sqlite(engine.url):
+            continue
+        pragmas = [f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+                   f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}"]
+        if not _is_sqlite_memory(engine.url) and engine.url.query.get('mode') != 'ro':
+            pragmas.insert(0, f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}")
+
+        def set_pragmas(dbapi_connection, connection_record, pragmas=pragmas):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+        event.listen(engine, 'connect', set_pragmas)
+
+
+class RoutingSession(Session):
+    """
+    Sends SELECTs issued while handling a GET/HEAD request to the 'replica'
+    bind when one is configured. Flushes and everything else (including
+    the audit log write on GET requests) use the primary. Replica reads
+    can lag: a SELECT after a write in the same GET may not see it. Views
+    that can't tolerate that are marked @reads_primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_request_context() and request.method in READ_METHODS
+                and not g.get('reads_primary')):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None and (clause is None or getattr(clause, 'is_select', False)):
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def reads_primary(view):
+    """Keeps a GET view's reads on the primary, e.g. when it hands out positions in a log."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.reads_primary = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def report_database_settings(app, db):
+    """Startup self-check: connects to each engine and prints the settings actually in effect."""
+    with app.app_context():
+        for key, engine in sorted(db.engines.items(), key=lambda item: item[0] is not None):
+            name = key or 'primary'
+            pool = engine.pool
+            settings = [f"pool={type(pool).__name__}"]
+            if hasattr(pool, 'size') and hasattr(pool, '_max_overflow'):
+                settings.append(f"size={pool.size()} overflow={pool._max_overflow} recycle={pool._recycle}s")
+            settings.append(f"pre_ping={pool._pre_ping}")
+            settings.append(f"statement_cache={engine._compiled_cache.capacity if engine._compiled_cache is not None else 0}")
+            try:
+                with engine.connect() as conn:
+                    if _is_sqlite(engine.url):
+                        synchronous = conn.execute(text('PRAGMA synchronous')).scalar()
+                        settings.append(f"journal_mode={conn.execute(text('PRAGMA journal_mode')).scalar()}")
+                        settings.append(f"synchronous={SQLITE_SYNCHRONOUS_NAMES.get(synchronous, synchronous)}")
+                        settings.append(f"busy_timeout={conn.execute(text('PRAGMA busy_timeout')).scalar()}ms")
+                    else:
+                        conn.execute(text('SELECT 1'))
+            except Exception as e:
+                settings.append(f"connect failed: {e}")
+            print(f"Database {name} ({engine.url.render_as_string(hide_password=True)}): {', '.join(settings)}")
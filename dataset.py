@@ -0,0 +1,42 @@
+# backend/dataset.py
+
+import pandas as pd
+
+from disaster_types import SPECIFIC_MASK, mask_to_types, union_by_group
+
+# Columns the routes read from app.disaster_df; everything else is dropped after processing
+SERVED_COLUMNS = ['Location', 'Year', 'Date', 'DisasterTypeMask']
+
+
+def compact_disaster_df(df):
+    """
+    Shrinks the processed disaster data to the columns the routes use.
+
+    Location becomes a categorical (an integer code array plus one copy
+    of each name) and the raw Title/Disaster_Info/Duration text is
+    dropped. Numpy buffers are never written after load, so with
+    gunicorn's preload_app they stay shared copy-on-write between workers
+    instead of being duplicated by per-object reference counting.
+    """
+    if df.empty:
+        return df
+    compact = df[[c for c in SERVED_COLUMNS if c in df.columns]].copy()
+    compact['Location'] = compact['Location'].astype('category').cat.remove_unused_categories()
+    return compact.reset_index(drop=True)
+
+
+def risk_zone_rows(disaster_df, location_coords):
+    """
+    (location, latitude, longitude, disaster types) for every location with
+    coordinates, in first-seen order. Types are the union over the
+    location's events; 'Other' is dropped, since alongside specific types it
+    adds nothing and alone it means none.
+    """
+    rows = []
+    masks_by_location = union_by_group(disaster_df['DisasterTypeMask'], disaster_df['Location'])
+    for loc_name, mask in masks_by_location.items():
+        coords = location_coords.get(loc_name, [None, None])
+        if coords[0] is not None and coords[1] is not None:
+            rows.append((loc_name, float(coords[0]), float(coords[1]),
+                         sorted(mask_to_types(int(mask) & SPECIFIC_MASK))))
+    return rows
@@ -0,0 +1,115 @@
+# backend/disaster_types.py
+#
+# Disaster types detected per event are stored as an int16 bitmask: bit i is
+# ALL_DISASTER_TYPES[i], and the OTHER bit marks events that matched no
+# keyword. Membership, per-group union and counts are then integer array ops.
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Define a mapping of general disaster types to keywords found in 'Disaster_Info'
+DISASTER_TYPE_KEYWORDS = {
+    "Flood": ['flood', 'rainfall', 'heavy rain', 'cyclone', 'storm', 'inundation', 'waterlogging'],
+    "Earthquake": ['earthquake', 'seismic', 'tremor', 'quake'],
+    "Cyclone": ['cyclone', 'storm', 'hurricane', 'typhoon', 'gale', 'wind'],
+    "Drought": ['drought', 'dry spell', 'water scarcity', 'famine'],
+    "Landslide": ['landslide', 'mudslide', 'landslip', 'debris flow'],
+    "Heatwave": ['heatwave', 'hot weather', 'extreme heat', 'scorching'],
+    "Cold Wave": ['cold wave', 'extreme cold', 'frost'],
+    "Tsunami": ['tsunami', 'tidal wave', 'sea wave'],
+    "Hailstorm": ['hailstorm', 'hail'],
+    "Lightning": ['lightning', 'thunderstorm', 'bolt'],
+    "Avalanche": ['avalanch', 'snowslide'], # 'avalanch' for partial match
+    "Forest Fire": ['forest fire', 'wildfire', 'bushfire'],
+    "Cloudburst": ['cloudburst'],
+    "Epidemic": ['epidemic', 'disease outbreak', 'health crisis']
+}
+ALL_DISASTER_TYPES = list(DISASTER_TYPE_KEYWORDS.keys()) # For frontend dropdown
+OTHER = 'Other'
+
+MASK_DTYPE = np.int16
+TYPE_BITS = {name: 1 << i for i, name in enumerate(ALL_DISASTER_TYPES)}
+OTHER_BIT = 1 << len(ALL_DISASTER_TYPES)
+SPECIFIC_MASK = OTHER_BIT - 1
+_BIT_NAMES = ALL_DISASTER_TYPES + [OTHER]
+_BIT_VALUES = np.array([1 << i for i in range(len(_BIT_NAMES))], dtype=MASK_DTYPE)
+_KEYWORD_PATTERNS = {name: '|'.join(re.escape(k) for k in keywords) for name, keywords in DISASTER_TYPE_KEYWORDS.items()}
+
+
+def classify_text(info_text):
+    """Bitmask of the disaster types whose keywords appear in `info_text` (OTHER_BIT if none)."""
+    text = str(info_text).lower()
+    mask = 0
+    for name, keywords in DISASTER_TYPE_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            mask |= TYPE_BITS[name]
+    return mask or OTHER_BIT
+
+
+def classify_series(texts):
+    """Vectorized classify_text over a Series of texts; returns an int16 array."""
+    lowered = texts.astype(str).str.lower()
+    masks = np.zeros(len(lowered), dtype=MASK_DTYPE)
+    for name, pattern in _KEYWORD_PATTERNS.items():
+        masks[lowered.str.contains(pattern, regex=True, na=False).to_numpy(dtype=bool)] |= TYPE_BITS[name]
+    masks[masks == 0] = OTHER_BIT
+    return masks
+
+
+def type_bit(type_name):
+    """Bit for a type name ('Other' included); 0 for unknown names, which then match nothing."""
+    if type_name == OTHER:
+        return OTHER_BIT
+    return TYPE_BITS.get(type_name, 0)
+
+
+def mask_contains(masks, type_name):
+    """Boolean array: which events include `type_name`."""
+    return (np.asarray(masks) & type_bit(type_name)) != 0
+
+
+def is_specific(masks):
+    """Boolean array: events with at least one specific (non-Other) type."""
+    return (np.asarray(masks) & SPECIFIC_MASK) != 0
+
+
+def union_mask(masks):
+    """Bitwise OR of all masks, i.e. every type seen in a group of events."""
+    masks = np.asarray(masks)
+    return int(np.bitwise_or.reduce(masks)) if masks.size else 0
+
+
+def popcount(masks):
+    """Number of types set in each mask."""
+    masks = np.asarray(masks, dtype=MASK_DTYPE)
+    return ((masks[:, None] & _BIT_VALUES) != 0).sum(axis=1)
+
+
+def type_counts(masks):
+    """{type name: number of events including it} for the types that occur."""
+    masks = np.asarray(masks, dtype=MASK_DTYPE)
+    counts = ((masks[:, None] & _BIT_VALUES) != 0).sum(axis=0)
+    return {name: int(count) for name, count in zip(_BIT_NAMES, counts) if count}
+
+
+def mask_to_types(mask, include_other=True):
+    """Type names in a mask, in ALL_DISASTER_TYPES order."""
+    names = [name for name in ALL_DISASTER_TYPES if mask & TYPE_BITS[name]]
+    if include_other and mask & OTHER_BIT:
+        names.append(OTHER)
+    return names
+
+
+def union_by_group(masks, groups):
+    """Series of OR-reduced masks per group key, in order of first appearance."""
+    return pd.Series(masks).groupby(np.asarray(groups), sort=False).agg(np.bitwise_or.reduce)
+
+
+def type_counts_by_group(masks, groups):
+    """{group: {type name: events}} per group key, in order of first appearance."""
+    masks = np.asarray(masks, dtype=MASK_DTYPE)
+    flags = pd.DataFrame((masks[:, None] & _BIT_VALUES) != 0, columns=_BIT_NAMES)
+    sums = flags.groupby(np.asarray(groups), sort=False).sum()
+    return {group: {name: int(count) for name, count in row.items() if count} for group, row in sums.iterrows()}
@@ -0,0 +1,143 @@
+# backend/dispatch.py
+#
+# Cross-zone dispatch over the zone distance matrix (zones.ZoneMatrix). Free
+# volunteers and unassigned resources are grouped by location, each location
+# is mapped to a zone, and candidates are ranked for a target zone by their
+# distance to it, weighted up when their own zone is severe: help is drawn
+# from nearby quiet zones before nearby ones that need it themselves.
+#
+# Locations the matrix doesn't know (no coordinates) are only matched to a
+# target of the same name; they aren't geocoded here.
+
+import numpy as np
+from sqlalchemy import func, select
+
+from extensions import db
+from models import LocationRisk, Resource, Volunteer
+from services.risk import severity_by_location
+
+ZONE_BLOCK = 256 # target zones per distance block in pick_assignment
+
+
+def candidate_query(kind, assistance_type=None, resource_type=None):
+    """(model, select of free candidates) for kind 'volunteers' or 'resources'."""
+    if kind == 'volunteers':
+        query = select(Volunteer.id, Volunteer.name, Volunteer.location, Volunteer.assistance_type) \
+            .where(Volunteer.available == db.true())
+        if assistance_type:
+            query = query.where(Volunteer.assistance_type.icontains(assistance_type, autoescape=True))
+        return Volunteer, query
+    # Literal false() so SQLite can use the partial ix_resource_unassigned_location index
+    query = select(Resource.id, Resource.resource_type, Resource.quantity, Resource.location) \
+        .where(Resource.assigned == db.false())
+    if resource_type:
+        query = query.where(Resource.resource_type == resource_type)
+    return Resource, query
+
+
+def _zone_ids(zones, names, resolve_location):
+    return np.array([-1 if z is None else z for z in (zones.locate(name, resolve_location) for name in names)],
+                    dtype=np.int64)
+
+
+def _locations(model, query):
+    """{location: free candidates there}, one grouped query."""
+    counted = query.with_only_columns(model.location, func.count()).group_by(model.location)
+    return dict(db.session.execute(counted).all())
+
+
+class _Sources:
+    """Candidate locations as arrays: zone id (-1 if unknown), severity weight and count."""
+
+    def __init__(self, zones, locations, resolve_location, severity, severity_weight):
+        self.names = list(locations)
+        self.counts = np.array([locations[name] for name in self.names], dtype=np.int64)
+        self.position = {name: i for i, name in enumerate(self.names)}
+        self.zone_ids = _zone_ids(zones, self.names, resolve_location)
+        top = max(severity.values(), default=0)
+        own = np.array([severity.get(zones.names[z] if z >= 0 else name, 0)
+                        for name, z in zip(self.names, self.zone_ids)], dtype=np.float64)
+        self.weights = 1 + severity_weight * own / top if top > 0 else np.ones(len(self.names))
+
+    def scores(self, zones, target, target_id, max_km):
+        """(km, score) per location for one target zone; inf where out of reach."""
+        km = np.full(len(self.names), np.inf)
+        known = self.zone_ids >= 0
+        if target_id is not None and known.any():
+            km[known] = zones.row(target_id)[self.zone_ids[known]]
+        if target in self.position:
+            km[self.position[target]] = 0.0
+        km[km > max_km] = np.inf
+        return km, km * self.weights
+
+
+def rank_candidates(zones, target, kind, resolve_location, max_km, severity_weight, limit,
+                    assistance_type=None, resource_type=None):
+    """
+    Up to `limit` free volunteers or resources for zone `target`, best
+    first, each with its location, zone, distance_km and score.
+    """
+    model, query = candidate_query(kind, assistance_type, resource_type)
+    severity = severity_by_location()
+    sources = _Sources(zones, _locations(model, query), resolve_location, severity, severity_weight)
+    km, score = sources.scores(zones, target, zones.locate(target, resolve_location), max_km)
+
+    # Only the closest locations that together hold `limit` candidates are read
+    order = [i for i in np.argsort(score, kind='stable') if np.isfinite(score[i])]
+    wanted, held = [], 0
+    for i in order:
+        if held >= limit:
+            break
+        wanted.append(i)
+        held += sources.counts[i]
+    place = {sources.names[i]: i for i in wanted}
+    rows = db.session.execute(query.where(model.location.in_(list(place))).order_by(model.id)).all() if place else []
+    rows.sort(key=lambda row: (score[place[row.location]], row.id))
+
+    results = []
+    for row in rows[:limit]:
+        i = place[row.location]
+        zone_id = sources.zone_ids[i]
+        results.append({**row._asdict(), 'zone': zones.names[zone_id] if zone_id >= 0 else row.location,
+                        'distance_km': round(float(km[i]), 2), 'score': round(float(score[i]), 2)})
+    return results
+
+
+def pick_assignment(zones, resolve_location, max_km, severity_weight):
+    """
+    The most severe zone (LocationRisk order) with a free volunteer and an
+    unassigned resource within `max_km`, and the best-scored location of
+    each: (zone, volunteer location, resource location), or None.
+    """
+    ranking = db.session.execute(select(LocationRisk.location, LocationRisk.severity)
+                                 .order_by(LocationRisk.severity.desc(), LocationRisk.rank)).all()
+    severity = dict(ranking)
+    sources = [_Sources(zones, _locations(*candidate_query(kind)), resolve_location, severity,
+                        severity_weight) for kind in ('volunteers', 'resources')]
+    if not all(s.names for s in sources):
+        return None
+    targets = [location for location, _ in ranking]
+
+    for start in range(0, len(targets), ZONE_BLOCK):
+        block = targets[start:start + ZONE_BLOCK]
+        target_ids = _zone_ids(zones, block, resolve_location)
+        best = []
+        for s in sources:
+            km = np.full((len(block), len(s.names)), np.inf)
+            rows, cols = target_ids >= 0, s.zone_ids >= 0
+            if rows.any() and cols.any():
+                km[np.ix_(rows, cols)] = zones.distances(target_ids[rows], s.zone_ids[cols])
+            # A location with no coordinates can still serve a target of the same name
+            for t, name in enumerate(block):
+                if name in s.position:
+                    km[t, s.position[name]] = 0.0
+            km[km > max_km] = np.inf
+            score = km * s.weights
+            choice = score.argmin(axis=1)
+            best.append((choice, np.isfinite(score[np.arange(len(block)), choice])))
+        (volunteer_at, has_volunteer), (resource_at, has_resource) = best
+        served = np.flatnonzero(has_volunteer & has_resource)
+        if len(served):
+            t = served[0]
+            return block[t], sources[0].names[volunteer_at[t]], sources[1].names[resource_at[t]]
+    return None
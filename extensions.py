@@ -1,9 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
-from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
+from database import RoutingSession
+from jwt_cache import CachingJWTManager
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession}) # GET reads can go to a replica
 bcrypt = Bcrypt()
-jwt = JWTManager()
+jwt = CachingJWTManager() # decodes each token once per request, LRU across requests
 migrate = Migrate()
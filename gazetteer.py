@@ -0,0 +1,191 @@
+# backend/gazetteer.py
+
+import csv
+import json
+import math
+import re
+import unicodedata
+from collections import Counter, namedtuple
+
+GazetteerMatch = namedtuple('GazetteerMatch', 'name latitude longitude score method')
+
+# Trailing words that don't change which place is meant ("Pune district", "Kolkata city")
+_GENERIC_SUFFIXES = {'district', 'city', 'town', 'state', 'india', 'dist'}
+_KM_PER_DEGREE = 111.195 # of latitude, on a 6371 km sphere
+
+
+def normalize_place_name(name):
+    """
+    Normalization pipeline for place names: strip accents, lowercase,
+    '&' -> 'and', drop punctuation, collapse whitespace and remove a
+    trailing generic word such as "district" or ", India".
+    """
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = text.replace('&', ' and ')
+    text = re.sub(r"[^a-z0-9\s]", " ", text)
+    words = text.split()
+    while len(words) > 1 and words[-1] in _GENERIC_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def _trigrams(normalized):
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def load_aliases(path):
+    """Reads {canonical: [alias, ...]} from a JSON file; a missing file means no aliases."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class Gazetteer:
+    """
+    Offline place-name resolver.
+
+    Exact lookups of normalized names and aliases are a dict hit; anything
+    else goes through a trigram index and is accepted when the Dice
+    similarity reaches `fuzzy_threshold`. Only names that resolve to
+    nothing need the remote geocoder.
+    """
+
+    def __init__(self, coords, aliases=None, fuzzy_threshold=0.7):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.coords = {}       # canonical name -> (lat, lon)
+        self._exact = {}       # normalized name or alias -> canonical name
+        self._keys = []        # indexed normalized keys
+        self._key_grams = []   # trigram set per key
+        self._index = {}       # trigram -> [key ids]
+        self._surface = {}     # lowercase surface form -> canonical, for text scanning
+        self._text_pattern = None
+        self._rank = {}
+
+        for name, (lat, lon) in coords.items():
+            self.add(name, lat, lon)
+        for canonical, names in (aliases or {}).items():
+            if canonical in self.coords:
+                for alias in names:
+                    self._add_key(alias, canonical)
+
+    @classmethod
+    def from_file(cls, path, aliases=None, fuzzy_threshold=0.7):
+        """
+        Loads a JSON gazetteer (name -> [lat, lon], the location_coords.json
+        format) or a CSV with name, latitude, longitude and an optional
+        '|'-separated aliases column.
+        """
+        coords = {}
+        aliases = {k: list(v) for k, v in (aliases or {}).items()}
+        if path.endswith('.json'):
+            with open(path) as f:
+                coords = {name: tuple(value) for name, value in json.load(f).items()}
+        else:
+            with open(path, newline='') as f:
+                for row in csv.DictReader(f):
+                    name = row['name'].strip()
+                    coords[name] = (float(row['latitude']), float(row['longitude']))
+                    if row.get('aliases'):
+                        aliases.setdefault(name, []).extend(a.strip() for a in row['aliases'].split('|') if a.strip())
+        return cls(coords, aliases, fuzzy_threshold)
+
+    def add(self, name, lat, lon):
+        self.coords[name] = (lat, lon)
+        self._add_key(name, name)
+
+    def _add_key(self, surface, canonical):
+        key = normalize_place_name(surface)
+        if not key:
+            return
+        if key not in self._exact:
+            self._exact[key] = canonical
+            key_id = len(self._keys)
+            grams = _trigrams(key)
+            self._keys.append(key)
+            self._key_grams.append(grams)
+            for gram in grams:
+                self._index.setdefault(gram, []).append(key_id)
+        self._surface.setdefault(str(surface).lower(), canonical)
+        self._text_pattern = None
+
+    def _match(self, canonical, score, method):
+        lat, lon = self.coords[canonical]
+        return GazetteerMatch(canonical, lat, lon, score, method)
+
+    def resolve(self, name):
+        """Returns a GazetteerMatch for `name`, or None if it is unknown locally."""
+        key = normalize_place_name(name)
+        if not key:
+            return None
+        canonical = self._exact.get(key)
+        if canonical is not None:
+            return self._match(canonical, 1.0, 'exact' if normalize_place_name(canonical) == key else 'alias')
+
+        grams = _trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            for key_id in self._index.get(gram, ()):
+                shared[key_id] += 1
+        best_id, best_score = None, 0.0
+        for key_id, count in shared.items():
+            score = 2.0 * count / (len(grams) + len(self._key_grams[key_id]))
+            if score > best_score:
+                best_id, best_score = key_id, score
+        if best_id is None or best_score < self.fuzzy_threshold:
+            return None
+        return self._match(self._exact[self._keys[best_id]], round(best_score, 3), 'fuzzy')
+
+    def coordinates(self, name):
+        match = self.resolve(name)
+        if match is None:
+            return None, None
+        return match.latitude, match.longitude
+
+    def nearest(self, latitude, longitude, max_km=None):
+        """
+        The known location closest to a point (equirectangular distance, fine
+        at these scales), or None when there is none within `max_km`.
+        """
+        best, best_d2 = None, None
+        lon_scale = math.cos(math.radians(latitude))
+        for name, (lat, lon) in self.coords.items():
+            if lat is None or lon is None:
+                continue
+            d2 = (lat - latitude) ** 2 + ((lon - longitude) * lon_scale) ** 2
+            if best_d2 is None or d2 < best_d2:
+                best, best_d2 = name, d2
+        if best is None or (max_km is not None and math.sqrt(best_d2) * _KM_PER_DEGREE > max_km):
+            return None
+        return best
+
+    # --- Free-text scanning ---
+
+    def _pattern(self):
+        if self._text_pattern is None:
+            # Longest surface forms first so "West Bengal" wins over a shorter name inside it
+            surfaces = sorted(self._surface, key=len, reverse=True)
+            self._text_pattern = re.compile(r'\b(' + '|'.join(re.escape(s) for s in surfaces) + r')\b')
+            # Among several mentions, prefer the longest canonical name, as an alias stands in for it
+            ranked = sorted(self._surface, key=lambda s: (len(self._surface[s]), len(s)), reverse=True)
+            self._rank = {surface: rank for rank, surface in enumerate(ranked)}
+        return self._text_pattern
+
+    def find_all_in_text(self, text):
+        """Canonical names of every place (or alias) mentioned in `text`."""
+        if text is None or text != text or not self._surface: # None or NaN
+            return set()
+        return {self._surface[m.group(1)] for m in self._pattern().finditer(str(text).lower())}
+
+    def find_in_text(self, text):
+        """The most specific (longest canonical name) place mentioned in `text`, or None."""
+        if text is None or text != text or not self._surface:
+            return None
+        best = None
+        for m in self._pattern().finditer(str(text).lower()):
+            if best is None or self._rank[m.group(1)] < self._rank[best]:
+                best = m.group(1)
+        return self._surface[best] if best is not None else None
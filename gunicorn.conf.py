@@ -0,0 +1,46 @@
+# backend/gunicorn.conf.py
+#
+# Pre-fork serving mode: `gunicorn -c gunicorn.conf.py wsgi:app`
+#
+# The master imports wsgi.py once (preload_app), so the CSV is parsed and the
+# dataset processed a single time. Workers are forked afterwards and share the
+# loaded pages copy-on-write; adding a worker costs its own heap and
+# connections, not another copy of the dataset.
+
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+preload_app = True
+
+
+def when_ready(server):
+    # FAST_START loads on a thread, but the master must finish before forking: a worker forked mid warm-up
+    # would rerun the whole load in its own heap (and rebuild LocationRisk alongside its siblings)
+    server.app.wsgi().warmup.wait()
+
+
+def pre_fork(server, worker):
+    # Move everything allocated so far into the GC's permanent generation. A
+    # collection in a worker would otherwise write to every object's header and
+    # un-share the pages holding the preloaded data.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Database connections opened in the master must not be reused across processes
+    from extensions import db
+    flask_app = server.app.wsgi()
+    with flask_app.app_context():
+        db.engine.dispose(close=False)
+    # The master's warm-up ran out of retries: keep trying here rather than serve 503s until a restart
+    if not flask_app.warmup.ready.is_set():
+        flask_app.warmup.start()
+    # Background jobs: one scheduler thread per worker (shared jobs are claimed through JobState)
+    if flask_app.config['SCHEDULER_ENABLED']:
+        flask_app.scheduler.start()
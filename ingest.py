@@ -0,0 +1,213 @@
+# backend/ingest.py
+#
+# Streaming loader for india_disaster_data.csv. The file is read in chunks of
+# `chunksize` rows and each chunk is reduced to the compact served columns
+# (Location, Year, Date, DisasterTypeMask) before the next one is read, so
+# peak memory is one chunk of raw text plus the compact result.
+
+import csv
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from disaster_types import classify_series
+
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_PARALLEL_MIN_ROWS = 100_000 # below this, starting worker processes costs more than it saves
+RAW_COLUMNS = ['Title', 'Year', 'Disaster_Info', 'Date']
+TEXT_COLUMNS = ['Title', 'Disaster_Info']
+
+
+def read_disaster_chunks(path, chunksize=DEFAULT_CHUNK_ROWS, columns=RAW_COLUMNS):
+    """
+    Yields DataFrames of at most `chunksize` rows holding only `columns`;
+    the exported index column and Duration are never parsed.
+    """
+    wanted = set(columns)
+    text_dtypes = {c: str for c in TEXT_COLUMNS + ['Date'] if c in wanted}
+    yield from pd.read_csv(path, chunksize=chunksize, usecols=lambda c: c in wanted, dtype=text_dtypes)
+
+
+class DateParser:
+    """
+    pd.to_datetime infers one format from the first non-null value of the
+    whole column. Chunks would each infer their own, so the format seen
+    first is remembered and reused ('mixed' if none could be guessed).
+    """
+
+    def __init__(self):
+        self.date_format = None
+
+    def __call__(self, dates):
+        if self.date_format is None:
+            first = dates.dropna()
+            if first.empty:
+                return pd.to_datetime(dates, errors='coerce')
+            self.date_format = guess_datetime_format(first.iloc[0]) or 'mixed'
+        return pd.to_datetime(dates, format=self.date_format, errors='coerce')
+
+
+def infer_locations(chunk, gazetteer):
+    """Location per row from the Title, falling back to Disaster_Info; None where neither names a place."""
+    locations = chunk['Title'].map(gazetteer.find_in_text).astype(object)
+    missing = locations.isna()
+    if missing.any():
+        locations[missing] = chunk.loc[missing, 'Disaster_Info'].map(gazetteer.find_in_text).astype(object)
+    return locations
+
+
+def process_chunk(chunk, gazetteer, timings=None):
+    """
+    Reduces one raw chunk to the served columns: rows with no known place
+    are dropped, and the text is replaced by its type bitmask. Without a
+    gazetteer every row is kept and no Location column is produced.
+    """
+    timings = timings if timings is not None else {}
+    compact = {}
+
+    if gazetteer is not None:
+        start = time.perf_counter()
+        chunk = chunk.assign(Location=infer_locations(chunk, gazetteer))
+        chunk = chunk[chunk['Location'].notna()]
+        # Categorical over the gazetteer's names: codes per chunk, names stored once, cheap to concat
+        compact['Location'] = pd.Categorical(chunk['Location'], categories=sorted(gazetteer.coords))
+        _add_time(timings, 'location_inference', start)
+
+    start = time.perf_counter()
+    compact['Year'] = chunk['Year']
+    compact['Date'] = chunk['Date']
+    compact['DisasterTypeMask'] = classify_series(chunk['Disaster_Info'])
+    _add_time(timings, 'type_classification', start)
+
+    return pd.DataFrame(compact, index=chunk.index)
+
+
+def load_disaster_data(path, gazetteer, chunksize=DEFAULT_CHUNK_ROWS, spill_path=None, timings=None,
+                       workers=1, parallel_min_rows=DEFAULT_PARALLEL_MIN_ROWS, text_sink=None):
+    """
+    Loads and processes the disaster CSV chunk by chunk (see process_chunk).
+
+    The raw Title/Disaster_Info text is dropped after each chunk. With
+    `spill_path` it is first appended to that CSV, keyed by the row's
+    position in the returned frame, for tools that still need the text.
+    A `text_sink` gets each chunk's kept rows with both the text and the
+    served columns, as `text_sink.write(rows, first_row)`, and `close()`
+    at the end (the search index is built this way).
+    `timings` (a dict) accumulates seconds per phase across chunks; with a
+    pool the inference phases are worker time summed over processes.
+
+    With `workers` > 1 (0 means one per CPU) and at least
+    `parallel_min_rows` rows in two or more chunks, chunks are processed
+    in a ProcessPoolExecutor. Results are merged in file order, so the
+    output is identical to the serial path.
+    """
+    timings = timings if timings is not None else {}
+    workers = workers or os.cpu_count() or 1
+    parse_dates = DateParser()
+
+    def parsed_chunks():
+        chunks = read_disaster_chunks(path, chunksize)
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            chunk['Date'] = parse_dates(chunk['Date'])
+            _add_time(timings, 'csv_load', start)
+            yield chunk
+
+    chunks = parsed_chunks()
+    head, head_rows = [], 0
+    if workers > 1:
+        # Read ahead just far enough to tell whether a pool is worth starting
+        for chunk in chunks:
+            head.append(chunk)
+            head_rows += len(chunk)
+            if head_rows >= parallel_min_rows and len(head) > 1:
+                break
+    chunks = itertools.chain(head, chunks)
+    parallel = head_rows >= parallel_min_rows and len(head) > 1
+
+    parts = []
+    rows = 0
+    spill = _TextSpill(spill_path) if spill_path else None
+    sinks = [sink for sink in (spill, text_sink) if sink is not None]
+    executor = None
+    try:
+        if parallel:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(gazetteer,))
+            results = _ordered_map(executor, _process_in_worker, chunks, max_in_flight=2 * workers)
+        else:
+            results = ((chunk, (process_chunk(chunk, gazetteer, timings), None)) for chunk in chunks)
+
+        for chunk, (part, worker_timings) in results:
+            for phase, seconds in (worker_timings or {}).items():
+                timings[phase] = timings.get(phase, 0.0) + seconds
+            if sinks:
+                text_rows = part.join(chunk.loc[part.index, TEXT_COLUMNS])
+                for sink in sinks:
+                    sink.write(text_rows, first_row=rows)
+            rows += len(part)
+            parts.append(part.reset_index(drop=True))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        for sink in sinks:
+            sink.close()
+
+    return pd.concat(parts, ignore_index=True)
+
+
+# --- Process pool ---
+
+_worker_gazetteer = None
+
+
+def _init_worker(gazetteer):
+    global _worker_gazetteer
+    _worker_gazetteer = gazetteer
+
+
+def _process_in_worker(chunk):
+    timings = {}
+    return process_chunk(chunk, _worker_gazetteer, timings), timings
+
+
+def _ordered_map(executor, fn, items, max_in_flight):
+    """
+    Like executor.map, yielding (item, result) in input order, but keeps at
+    most `max_in_flight` items submitted so the CSV is not read ahead of
+    the workers.
+    """
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= max_in_flight:
+            item, future = pending.popleft()
+            yield item, future.result()
+    while pending:
+        item, future = pending.popleft()
+        yield item, future.result()
+
+
+class _TextSpill:
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(['row'] + TEXT_COLUMNS)
+
+    def write(self, rows, first_row):
+        for offset, values in enumerate(rows[TEXT_COLUMNS].itertuples(index=False)):
+            self._writer.writerow([first_row + offset] + ['' if pd.isna(v) else v for v in values])
+
+    def close(self):
+        self._file.close()
+
+
+def _add_time(timings, phase, start):
+    timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
@@ -0,0 +1,149 @@
+# backend/jobs.py
+#
+# The background jobs run by services.scheduler: hourly sensor rollups,
+# geocode retries for alerts stored without coordinates, a periodic
+# LocationRisk rebuild, compaction of the /sync change log, and warming this
+# worker's /location-summary and /api/risk_zones caches so those views don't
+# compute on the request path.
+
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select, tuple_, update
+
+from extensions import db
+from models import DisasterAlert, SensorData, SensorRollup
+from services.scheduler import Job
+from services.sync import COMPACTION_JOB, compact, record_changes
+
+ROLLUP_KEY = ('sensor_type', 'hour', 'cell_lat', 'cell_lon')
+
+
+def roll_up_sensor_data(app, cursor):
+    """
+    Folds readings with ids above `cursor` (at most SENSOR_ROLLUP_BATCH of
+    them) into SensorRollup and returns the last id folded in. The
+    scheduler commits the rollups and the new cursor together.
+    """
+    import pandas as pd
+
+    last_id = int(cursor or 0)
+    readings = db.session.execute(
+        select(SensorData.id, SensorData.sensor_type, SensorData.value, SensorData.timestamp,
+               SensorData.latitude, SensorData.longitude)
+        .where(SensorData.id > last_id).order_by(SensorData.id).limit(app.config['SENSOR_ROLLUP_BATCH'])
+    ).all()
+    if not readings:
+        return cursor
+    df = pd.DataFrame(readings, columns=['id', 'sensor_type', 'value', 'timestamp', 'latitude', 'longitude'])
+    last_id = int(df['id'].iloc[-1])
+    df = df.dropna()
+    if df.empty:
+        return str(last_id)
+
+    grid = app.config['SENSOR_GRID_DEGREES']
+    df['hour'] = pd.to_datetime(df['timestamp']).dt.floor('h')
+    df['cell_lat'] = (df['latitude'] // grid).astype(int) # same cells as the stream detector
+    df['cell_lon'] = (df['longitude'] // grid).astype(int)
+    batch = (df.groupby(list(ROLLUP_KEY))['value'].agg(['count', 'sum', 'min', 'max']).reset_index()
+             .rename(columns={'sum': 'value_sum', 'min': 'value_min', 'max': 'value_max'}))
+    records = batch.to_dict('records')
+    for record in records:
+        record['hour'] = record['hour'].to_pydatetime()
+
+    key_columns = [getattr(SensorRollup, name) for name in ROLLUP_KEY]
+    keys = [tuple(record[name] for name in ROLLUP_KEY) for record in records]
+    existing = {tuple(row[:4]): row for row in db.session.execute(
+        select(*key_columns, SensorRollup.count, SensorRollup.value_sum, SensorRollup.value_min,
+               SensorRollup.value_max).where(tuple_(*key_columns).in_(keys)))}
+    inserts, updates = [], []
+    for key, record in zip(keys, records):
+        stored = existing.get(key)
+        if stored is None:
+            inserts.append(record)
+        else:
+            updates.append({**record, 'count': stored.count + record['count'],
+                            'value_sum': stored.value_sum + record['value_sum'],
+                            'value_min': min(stored.value_min, record['value_min']),
+                            'value_max': max(stored.value_max, record['value_max'])})
+    if updates:
+        db.session.execute(update(SensorRollup), updates) # bulk UPDATE by primary key
+    if inserts:
+        db.session.execute(insert(SensorRollup), inserts)
+    return str(last_id)
+
+
+def retry_failed_geocodes(app, cursor):
+    """
+    Geocodes up to GEOCODE_RETRY_BATCH places of alerts stored without
+    coordinates (newest first) and fills those alerts in. Alerts older than
+    GEOCODE_RETRY_MAX_AGE are left as they are.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=app.config['GEOCODE_RETRY_MAX_AGE'])
+    pending = db.session.scalars(
+        select(DisasterAlert.location)
+        .where(DisasterAlert.latitude.is_(None), DisasterAlert.location.is_not(None),
+               DisasterAlert.issued_at >= cutoff)
+        .group_by(DisasterAlert.location).order_by(func.max(DisasterAlert.id).desc())
+        .limit(app.config['GEOCODE_RETRY_BATCH'])
+    ).all()
+    for location in pending:
+        latitude, longitude = app.get_coordinates(location) # rate-limited by the upstream gateway
+        if latitude is None or longitude is None:
+            continue
+        updated = db.session.scalars(
+            update(DisasterAlert)
+            .where(DisasterAlert.location == location, DisasterAlert.latitude.is_(None))
+            .values(latitude=latitude, longitude=longitude)
+            .returning(DisasterAlert.id)).all()
+        record_changes(DisasterAlert, updated, 'update')
+        db.session.commit() # keep what was resolved if a later place times out
+    return cursor
+
+
+def refresh_severity(app, cursor):
+    """Rebuilds LocationRisk from the dataset and every stored alert, correcting drift from edited alerts."""
+    from services.risk import dataset_location_risk, refresh_location_risk
+    if not app.disaster_df.empty:
+        refresh_location_risk(dataset_location_risk(app.disaster_df), app.canonical_location, force=True)
+    return cursor
+
+
+def compact_change_log(app, cursor):
+    """
+    Keeps the latest ChangeLog entry per row and drops deletions older than
+    SYNC_TOMBSTONE_TTL. The cursor is the compaction floor: /sync tells
+    clients synced to an older version to start over.
+    """
+    return str(compact(app.config['SYNC_TOMBSTONE_TTL'], int(cursor or 0)))
+
+
+def warm_location_summary(app, cursor):
+    """Computes /location-summary into this worker's cache (served while younger than LOCATION_SUMMARY_MAX_AGE)."""
+    from services.risk import location_summary
+    result = location_summary(app.disaster_df['Location'].unique() if not app.disaster_df.empty else [],
+                              app.location_coords)
+    app.location_summary_cache = (time.monotonic(), result)
+    return cursor
+
+
+def warm_risk_zones(app, cursor):
+    """Computes the /api/risk_zones rows once; they depend only on the loaded dataset."""
+    from dataset import risk_zone_rows
+    if not app.disaster_df.empty:
+        app.risk_zone_rows = risk_zone_rows(app.disaster_df, app.location_coords)
+    return cursor
+
+
+def default_jobs(config):
+    """The scheduler's jobs, with intervals from the SCHEDULER_* settings."""
+    def interval(name):
+        return config[f'SCHEDULER_{name}_INTERVAL']
+    return [
+        Job('sensor_rollup', roll_up_sensor_data, interval('SENSOR_ROLLUP'), catch_up=True, needs_warmup=False),
+        Job('geocode_retry', retry_failed_geocodes, interval('GEOCODE_RETRY')),
+        Job('severity_refresh', refresh_severity, interval('SEVERITY_REFRESH')),
+        Job(COMPACTION_JOB, compact_change_log, interval('CHANGE_LOG_COMPACTION'), needs_warmup=False),
+        Job('location_summary_warm', warm_location_summary, interval('LOCATION_SUMMARY'), shared=False),
+        Job('risk_zones_warm', warm_risk_zones, None, shared=False),
+    ]
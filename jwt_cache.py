@@ -0,0 +1,84 @@
+# backend/jwt_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, has_request_context
+from flask_jwt_extended import JWTManager, get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended.config import config as jwt_config
+
+
+class CachingJWTManager(JWTManager):
+    """
+    JWTManager that verifies each token once.
+
+    Decoded claims are memoized in `g` for the rest of the request (the
+    audit middleware, jwt_required and role checks all decode the same
+    token) and in a process-wide LRU keyed by the encoded token, so a
+    client's next request skips the signature check. An entry is dropped
+    as soon as its `exp` passes, after which the token goes through the
+    normal decode path and fails as expired.
+    """
+
+    def __init__(self, app=None, add_context_processor=False, max_entries=1024):
+        self.max_entries = max_entries
+        self._verified = OrderedDict() # (token, csrf) -> claims
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app, add_context_processor=False):
+        super().init_app(app, add_context_processor)
+        self.max_entries = app.config.get('JWT_DECODE_CACHE_SIZE', self.max_entries)
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        if allow_expired or not self.max_entries:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key = (encoded_token, csrf_value)
+        per_request = g.setdefault('_jwt_decoded', {}) if has_request_context() else {}
+        claims = per_request.get(key) or self._lookup(key)
+        if claims is None:
+            claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+            self._store(key, claims)
+        per_request[key] = claims
+        return dict(claims)
+
+    def _lookup(self, key):
+        with self._lock:
+            claims = self._verified.get(key)
+            if claims is None:
+                self.misses += 1
+                return None
+            exp = claims.get('exp')
+            if exp is not None and exp + jwt_config.leeway < time.time():
+                del self._verified[key]
+                self.misses += 1
+                return None
+            self._verified.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def _store(self, key, claims):
+        with self._lock:
+            self._verified[key] = claims
+            self._verified.move_to_end(key)
+            while len(self._verified) > self.max_entries:
+                self._verified.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._verified)}
+
+
+def current_identity():
+    """The request's JWT identity (None without a valid token), verified once and kept in `g`."""
+    if '_jwt_identity' not in g:
+        try:
+            verify_jwt_in_request(optional=True)
+            g._jwt_identity = get_jwt_identity()
+        except Exception:
+            g._jwt_identity = None
+    return g._jwt_identity
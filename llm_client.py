@@ -0,0 +1,147 @@
+# backend/llm_client.py
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import httpx
+
+from services.upstream import UpstreamTimeout
+
+
+class LLMError(Exception):
+    """Carries the message and HTTP status the chatbot endpoint should return."""
+
+    def __init__(self, message, status_code=500, retry_after=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+# Words that don't change the meaning of a short help request
+_FILLER_WORDS = {'a', 'an', 'the', 'please', 'pls', 'plz', 'kindly', 'hi', 'hello', 'hey', 'i', 'we', 'me', 'us',
+                 'is', 'are', 'am', 'can', 'could', 'you', 'tell', 'do', 'does', 'my', 'our', 'to', 'for', 'of'}
+
+
+def normalize_question(text):
+    """
+    Normalizes a chat message into a cache key, so "Where is the nearest
+    shelter?" and "where is nearest shelter" hit the same entry.
+    """
+    text = re.sub(r"[^a-z0-9\s]", " ", str(text).lower())
+    words = [w for w in text.split() if w not in _FILLER_WORDS]
+    return " ".join(words)
+
+
+class ResponseCache:
+    """LRU cache with TTL for LLM answers to short, frequently asked questions."""
+
+    def __init__(self, max_entries=1000, ttl=3600, max_words=12):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_words = max_words
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key_for(self, message):
+        key = normalize_question(message)
+        # Long messages describe a personal situation; answer them individually.
+        if not key or len(key.split()) > self.max_words:
+            return None
+        return key
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+            }
+
+
+class LLMClient:
+    """
+    Client for the chatbot's LLM (Gemini generateContent API).
+
+    Calls go through the shared upstream gateway (pooled keep-alive
+    connections, per-request timeout budget) with strict connect/read
+    timeouts. A token bucket keeps us under the provider's quota instead of
+    provoking 429s, and short repeated questions are answered from cache.
+    """
+
+    def __init__(self, gateway, api_url, api_key, bucket=None, cache=None,
+                 connect_timeout=3.0, read_timeout=15.0, max_retries=2, rate_limit_wait=2.0):
+        self.gateway = gateway
+        self.api_url = api_url
+        self.api_key = api_key
+        self.bucket = bucket
+        self.cache = cache
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.rate_limit_wait = rate_limit_wait
+
+    def generate(self, prompt, cache_key=None, generation_config=None):
+        """Returns the generated text for `prompt`; `cache_key` is the user's raw question."""
+        key = self.cache.key_for(cache_key) if self.cache is not None and cache_key else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if self.bucket is not None and not self.bucket.acquire(timeout=self.rate_limit_wait):
+            raise LLMError("AI assistant is busy. Please try again shortly.", 503, retry_after=1)
+
+        payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if generation_config:
+            payload["generationConfig"] = generation_config
+        headers = {'x-goog-api-key': self.api_key} if self.api_key else {}
+
+        try:
+            response = self.gateway.post_json(self.api_url, payload, headers=headers, timeout=self.timeout,
+                                              retry_statuses=(429,), retries=self.max_retries)
+        except UpstreamTimeout as e:
+            raise LLMError("AI assistant did not respond in time. Please try again.", 504) from e
+        except httpx.HTTPError as e:
+            raise LLMError(f"Network error communicating with AI assistant: {e}") from e
+
+        if response.status_code == 429:
+            raise LLMError("Failed to get response from AI assistant after multiple retries due to rate limiting or other issues.")
+        if not response.is_success:
+            if response.status_code == 403:
+                raise LLMError(f"AI assistant API error: {response.status_code} (Forbidden - Check your API key and permissions)")
+            raise LLMError(f"AI assistant API error: {response.status_code}")
+
+        llm_response = response.json()
+        try:
+            generated_text = llm_response['candidates'][0]['content']['parts'][0]['text']
+        except (KeyError, IndexError, TypeError):
+            raise LLMError("Failed to get a valid response from the AI assistant.")
+
+        if key is not None:
+            self.cache.set(key, generated_text)
+        return generated_text
@@ -0,0 +1,260 @@
+# backend/loadtest.py
+#
+# Load-testing harness with local stand-ins for Nominatim and Gemini.
+#
+#   python loadtest.py --concurrency 50 --duration 60
+#   python loadtest.py --target http://127.0.0.1:5000 --concurrency 200 --duration 120
+#
+# Without --target the app is created in-process (pointed at the stubs through
+# GEOCODER_URL / LLM_API_URL) and served by a threaded werkzeug server. With
+# --target, start the server yourself with those two variables set to the stub
+# URLs this script prints, e.g. under `uvicorn asgi:app`.
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import httpx
+
+from ratelimit import TokenBucket
+
+DEFAULT_MIX = 'report=1,poll=5,heatmap=3,chat=1'
+LOCATIONS = ['Mumbai', 'Chennai', 'Kolkata', 'Guwahati', 'Patna', 'Bhubaneswar', 'Kochi', 'Shimla', 'Dehradun', 'Surat']
+ALERT_TYPES = ['Flood', 'Cyclone', 'Earthquake', 'Landslide', 'Heatwave']
+SEVERITIES = ['low', 'medium', 'high', 'critical']
+CHAT_MESSAGES = ['Where is the nearest shelter?', 'I need water', 'Is there medical aid near me?',
+                 'My house is flooded and the water is rising, what should I do?']
+
+
+# --- Stub upstream servers ---
+
+class StubServer:
+    """Threaded HTTP server with configurable latency and 429 behaviour."""
+
+    def __init__(self, handler_body, latency=0.2, jitter=0.1, qps_limit=None, error_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(qps_limit, capacity=max(1, qps_limit)) if qps_limit else None
+        self.counts = defaultdict(int)
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self):
+                if self.headers.get('Content-Length'):
+                    self.rfile.read(int(self.headers['Content-Length']))
+                time.sleep(max(0.0, random.gauss(stub.latency, stub.jitter)))
+                limited = stub.bucket is not None and stub.bucket.try_acquire() > 0
+                if limited or random.random() < stub.error_rate:
+                    status, body = 429, {'error': 'rate limited'}
+                else:
+                    status, body = 200, handler_body(self.path)
+                with stub._lock:
+                    stub.counts[status] += 1
+                data = json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    if status == 429:
+                        self.send_header('Retry-After', '1')
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass # the app gave up on this call (timeout budget)
+
+            do_GET = _reply
+            do_POST = _reply
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        self.server.shutdown()
+
+
+def geocoder_body(path):
+    return [{'lat': str(round(random.uniform(8, 35), 5)), 'lon': str(round(random.uniform(68, 97), 5))}]
+
+
+def llm_body(path):
+    return {'candidates': [{'content': {'parts': [{'text': 'Please move to the nearest relief camp and call 112.'}]}}]}
+
+
+# --- Scenarios ---
+
+def report_alert(client, rng):
+    # A share of reports name a new place so the geocoder is actually hit
+    location = rng.choice(LOCATIONS) if rng.random() < 0.7 else f"{rng.choice(LOCATIONS)} Ward {rng.randint(1, 10_000)}"
+    return client.post('/api/alerts/report', json={
+        'alert_type': rng.choice(ALERT_TYPES), 'severity': rng.choice(SEVERITIES),
+        'description': 'Water level rising near the bridge', 'location': location})
+
+
+def poll_alerts(client, rng):
+    return client.get('/api/alerts', params={'page': 1, 'per_page': 20})
+
+
+def heatmap(client, rng):
+    return client.get('/api/heatmap-data')
+
+
+def chat(client, rng):
+    return client.post('/api/chatbot', json={'message': rng.choice(CHAT_MESSAGES)})
+
+
+SCENARIOS = {'report': report_alert, 'poll': poll_alerts, 'heatmap': heatmap, 'chat': chat}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, weight = part.split('=')
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name}', choose from {sorted(SCENARIOS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+# --- Driver ---
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return round(sorted_values[index] * 1000, 2)
+
+
+def run_load(target, mix, concurrency, duration, timeout, seed):
+    names, weights = zip(*mix.items())
+    results = defaultdict(list) # scenario -> [(latency_s, status or None)]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def worker(worker_id):
+        rng = random.Random(seed + worker_id)
+        local = defaultdict(list)
+        with httpx.Client(base_url=target, timeout=timeout) as client:
+            while time.monotonic() < stop_at:
+                name = rng.choices(names, weights)[0]
+                start = time.perf_counter()
+                try:
+                    status = SCENARIOS[name](client, rng).status_code
+                except httpx.HTTPError:
+                    status = None
+                local[name].append((time.perf_counter() - start, status))
+        with lock:
+            for name, samples in local.items():
+                results[name].extend(samples)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - started
+
+    def summarize(samples):
+        latencies = sorted(s[0] for s in samples)
+        statuses = defaultdict(int)
+        for _, status in samples:
+            statuses[str(status) if status is not None else 'error'] += 1
+        errors = sum(1 for _, status in samples if status is None or status >= 400)
+        return {
+            'requests': len(samples),
+            'throughput_rps': round(len(samples) / elapsed, 2),
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+            'statuses': dict(statuses),
+        }
+
+    report = {name: summarize(samples) for name, samples in sorted(results.items())}
+    report['total'] = summarize([s for samples in results.values() for s in samples])
+    return report, elapsed
+
+
+def serve_in_process(workdir):
+    os.environ.setdefault('DATABASE_URI', 'sqlite:///' + os.path.join(workdir, 'loadtest.db'))
+    os.environ.setdefault('LLM_RATE_LIMIT_DB', os.path.join(workdir, 'ratelimit.db'))
+    import logging
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR) # per-request access logs would swamp the report
+    app = create_app()
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed-traffic load test with local geocoder and LLM stand-ins.")
+    parser.add_argument('--target', help="base URL of an already running server (default: serve the app in-process)")
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=30, help="seconds")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument('--timeout', type=float, default=30, help="client timeout per request, seconds")
+    parser.add_argument('--geocoder-latency', type=float, default=0.3)
+    parser.add_argument('--geocoder-qps', type=float, default=1.0, help="above this the stub geocoder answers 429")
+    parser.add_argument('--llm-latency', type=float, default=1.0)
+    parser.add_argument('--llm-429-rate', type=float, default=0.05, help="share of LLM calls answered with 429")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write the report as JSON here")
+    args = parser.parse_args()
+
+    geocoder = StubServer(geocoder_body, latency=args.geocoder_latency, jitter=args.geocoder_latency / 3,
+                          qps_limit=args.geocoder_qps)
+    llm = StubServer(llm_body, latency=args.llm_latency, jitter=args.llm_latency / 3, error_rate=args.llm_429_rate)
+    os.environ['GEOCODER_URL'] = geocoder.url + '/search'
+    os.environ['LLM_API_URL'] = llm.url + '/generate'
+    # Every simulated client connects from 127.0.0.1, so per-client rate limits would throttle the whole run;
+    # concurrency caps and priority shedding stay on
+    os.environ.setdefault('ADMISSION_CLIENT_RATE', '0')
+    print(f"Stub geocoder: {os.environ['GEOCODER_URL']}")
+    print(f"Stub LLM:      {os.environ['LLM_API_URL']}")
+
+    with tempfile.TemporaryDirectory(prefix='disaster-loadtest-') as workdir:
+        server = None
+        target = args.target
+        if target is None:
+            server, target = serve_in_process(workdir)
+        print(f"Running {args.concurrency} clients for {args.duration:.0f}s against {target} (mix {args.mix}) ...")
+        report, elapsed = run_load(target, parse_mix(args.mix), args.concurrency, args.duration, args.timeout, args.seed)
+        if server is not None:
+            server.shutdown()
+
+    print(f"\n{'scenario':10s} {'requests':>9s} {'rps':>8s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'errors':>8s}")
+    for name, row in report.items():
+        print(f"{name:10s} {row['requests']:9d} {row['throughput_rps']:8.1f} {row['p50_ms'] or 0:9.1f} "
+              f"{row['p95_ms'] or 0:9.1f} {row['p99_ms'] or 0:9.1f} {row['error_rate'] * 100:7.1f}%")
+    print(f"\nUpstream stubs: geocoder {dict(geocoder.counts)}, LLM {dict(llm.counts)}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'params': vars(args), 'elapsed_s': round(elapsed, 2), 'results': report,
+                       'upstream': {'geocoder': dict(geocoder.counts), 'llm': dict(llm.counts)}}, f, indent=2)
+        print(f"Report written to {args.output}")
+    geocoder.stop()
+    llm.stop()
+
+
+if __name__ == '__main__':
+    main()
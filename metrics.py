@@ -0,0 +1,287 @@
+# backend/metrics.py
+
+import os
+import sys
+import threading
+import time
+from collections import Counter as _TallyCounter
+from contextlib import contextmanager
+
+from flask import Response, g, request
+from sqlalchemy import event
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, '') for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = tuple(labels.get(n, '') for n in self.label_names)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(n, '') for n in self.label_names)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0, 0.0] # bucket counts, count, sum
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += 1
+            state[2] += value
+
+    def render(self):
+        lines = self._header()
+        names = self.label_names + ('le',)
+        with self._lock:
+            for key, (bucket_counts, count, total) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    lines.append(f"{self.name}_bucket{_format_labels(names, key + (bound,))} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_format_labels(names, key + ('+Inf',))} {count}")
+                lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds the app's metrics and renders them in Prometheus text format."""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, help_text, labels=()):
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()):
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, fn):
+        """`fn()` is called on every scrape; use it to refresh gauges owned by other components."""
+        self._collectors.append(fn)
+
+    def render(self):
+        for fn in self._collectors:
+            fn()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    @contextmanager
+    def phase(self, name):
+        """Times a startup phase into `startup_phase_seconds{phase=name}`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_phase_seconds.set(round(time.perf_counter() - start, 6), phase=name)
+
+
+def read_process_memory():
+    """
+    Returns {'rss', 'pss', 'uss'} in bytes for this process. PSS/USS show how
+    much memory is really this worker's own versus shared with its siblings;
+    they need Linux's /proc/self/smaps_rollup.
+    """
+    fields = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1]) * 1024
+    except OSError:
+        import resource
+        return {'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's stack every `interval` seconds and tallies the
+    stacks in collapsed ("folded") form, ready for flamegraph.pl/speedscope.
+    """
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = _TallyCounter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def init_metrics(app, db):
+    """
+    Attaches `app.metrics` and wires per-route latency, per-request DB
+    statement counts/time, the opt-in sampling profiler and GET /metrics.
+    """
+    registry = MetricsRegistry()
+    app.metrics = registry
+
+    registry.startup_phase_seconds = registry.gauge(
+        'startup_phase_seconds', 'Duration of each create_app startup phase.', ('phase',))
+    request_latency = registry.histogram(
+        'http_request_duration_seconds', 'Request latency by route.', ('method', 'route', 'status'))
+    db_statements = registry.histogram(
+        'db_statements_per_request', 'SQL statements executed per request.', ('route',),
+        buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 1000))
+    db_time = registry.histogram(
+        'db_time_per_request_seconds', 'Time spent in SQL statements per request.', ('route',))
+    db_statements_total = registry.counter('db_statements_total', 'SQL statements executed.')
+    process_memory = registry.gauge('process_memory_bytes', 'Memory of this worker process by kind (rss, pss, uss).',
+                                    ('kind', 'pid'))
+
+    def collect_process_memory():
+        for kind, value in read_process_memory().items():
+            process_memory.set(value, kind=kind, pid=os.getpid())
+    registry.register_collector(collect_process_memory)
+
+    # --- SQLAlchemy statement hooks, on every engine (GET reads may go to the replica bind) ---
+    with app.app_context():
+        engines = list(db.engines.values())
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        db_statements_total.inc()
+        if g:
+            g.db_statements = g.get('db_statements', 0) + 1
+            g.db_time = g.get('db_time', 0.0) + elapsed
+
+    def _handle_error(context):
+        # A statement that raised gets no after_cursor_execute; drop its start time so the next
+        # statement on this connection isn't timed from it
+        starts = context.connection.info.get('query_start') if context.connection is not None else None
+        if starts and getattr(context.execution_context, 'cursor', None) is not None:
+            starts.pop()
+
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine, 'handle_error', _handle_error)
+
+    # --- Request hooks ---
+    def _start_request_timer():
+        g.request_start = time.perf_counter()
+        g.db_statements = 0
+        g.db_time = 0.0
+        profile_requested = request.args.get('profile') == '1' or request.headers.get('X-Profile') == '1'
+        if app.config.get('PROFILING_ENABLED') and profile_requested:
+            g.profiler = SamplingProfiler(threading.get_ident(), app.config.get('PROFILE_INTERVAL', 0.005))
+            g.profiler.start()
+
+    def _record_request(response):
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        start = g.get('request_start')
+        if start is not None:
+            request_latency.observe(time.perf_counter() - start, method=request.method, route=route,
+                                    status=response.status_code)
+        db_statements.observe(g.get('db_statements', 0), route=route)
+        db_time.observe(g.get('db_time', 0.0), route=route)
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.stop()
+            profile_dir = app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+            os.makedirs(profile_dir, exist_ok=True)
+            filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint or 'unmatched'}-{os.getpid()}.folded"
+            profiler.dump(os.path.join(profile_dir, filename))
+            response.headers['X-Profile-File'] = filename
+        return response
+
+    app.before_request(_start_request_timer)
+    app.after_request(_record_request)
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+    return registry
@@ -0,0 +1,30 @@
+"""disaster alert location
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 09:20:36.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Reported place names (models.DisasterAlert.location). Databases built by create_all() since the
+    # column was added to the model already have it
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('disaster_alert')}
+    if 'location' not in columns:
+        with op.batch_alter_table('disaster_alert', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('location', sa.String(length=100), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('disaster_alert', schema=None) as batch_op:
+        batch_op.drop_column('location')
@@ -1,19 +1,26 @@
 import os
-import joblib
-import numpy as np
 
 MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'ml_model', 'disaster_model.pkl')
 
 class DisasterModel:
+    # joblib/NumPy and the pickle are loaded on first use, not when this module is imported
     def __init__(self):
-        self.model = self.load_model()
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = self.load_model()
+        return self._model
 
     def load_model(self):
+        import joblib
         if not os.path.exists(MODEL_PATH):
             raise FileNotFoundError(f"Model not found at {MODEL_PATH}")
         return joblib.load(MODEL_PATH)
 
     def predict(self, input_data):
+        import numpy as np
         # input_data: dict with keys: temperature, humidity, rainfall, etc.
         features = np.array([[input_data.get('temperature', 0),
                               input_data.get('humidity', 0),
@@ -19,6 +19,11 @@ class SensorData(db.Model):
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
 
+    __table_args__ = (
+        db.Index('ix_sensor_data_timestamp', 'timestamp'), # latest readings
+        db.Index('ix_sensor_data_type_timestamp', 'sensor_type', 'timestamp'), # latest readings of one type
+    )
+
 class DisasterAlert(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     alert_type = db.Column(db.String(50))
@@ -27,6 +32,14 @@ class DisasterAlert(db.Model):
     issued_at = db.Column(db.DateTime, default=datetime.utcnow)
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
+    location = db.Column(db.String(100)) # Location name as reported
+
+    __table_args__ = (
+        db.Index('ix_disaster_alert_issued_at', 'issued_at'), # paginated newest-first listing
+        # Alerts whose place the geocoder couldn't resolve yet; the retry job's work list
+        db.Index('ix_disaster_alert_ungeocoded_location', 'location',
+                 sqlite_where=latitude.is_(None), postgresql_where=latitude.is_(None)),
+    )
 
 class Resource(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -36,6 +49,14 @@ class Resource(db.Model):
     assigned = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_resource_location', 'location'), # per-location counts
+        # Only unassigned stock, which is what auto-assign looks for; queries must compare against
+        # db.false() (a literal) for SQLite to use it
+        db.Index('ix_resource_unassigned_location', 'location',
+                 sqlite_where=assigned == db.false(), postgresql_where=assigned == db.false()),
+    )
+
 class Volunteer(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100))
@@ -45,9 +66,14 @@ class Volunteer(db.Model):
     assigned_zone = db.Column(db.String(100), nullable=True)
     assistance_type = db.Column(db.String(255), nullable=True) # <--- THIS IS THE NEW FIELD
 
+    __table_args__ = (
+        db.Index('ix_volunteer_location_available', 'location', 'available'),
+        db.Index('ix_volunteer_contact', 'contact'), # bulk import upserts by contact
+    )
+
 class Assignment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    zone = db.Column(db.String(100))  # Assigned location
+    zone = db.Column(db.String(100), index=True)  # Assigned location
     resource_id = db.Column(db.Integer, db.ForeignKey('resource.id'))
     volunteer_id = db.Column(db.Integer, db.ForeignKey('volunteer.id'))
     assigned_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -55,6 +81,19 @@ class Assignment(db.Model):
     resource = db.relationship('Resource')
     volunteer = db.relationship('Volunteer')
 
+class LocationRisk(db.Model):
+    """Per-location severity, shared by all workers; maintained by risk.py."""
+    location = db.Column(db.String(100), primary_key=True)
+    severity = db.Column(db.Integer, nullable=False, default=0) # events with a specific disaster type
+    type_counts = db.Column(db.JSON, nullable=False, default=dict) # {disaster type: events}
+    rank = db.Column(db.Integer, nullable=False) # first-seen order in the dataset; breaks severity ties
+    dataset_version = db.Column(db.String(40)) # fingerprint of the dataset the row was built from
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_location_risk_severity_rank', severity.desc(), rank), # auto-assign zone order
+    )
+
 class AuditLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, nullable=True)
@@ -62,3 +101,46 @@ class AuditLog(db.Model):
     method = db.Column(db.String(10))
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     details = db.Column(db.Text) # Good that this is Text, consider nullable=True if not always present
+
+class SensorRollup(db.Model):
+    """Hourly per-grid-cell aggregates of SensorData, maintained by the sensor_rollup job."""
+    sensor_type = db.Column(db.String(50), primary_key=True)
+    hour = db.Column(db.DateTime, primary_key=True) # start of the hour
+    cell_lat = db.Column(db.Integer, primary_key=True) # floor(latitude / SENSOR_GRID_DEGREES)
+    cell_lon = db.Column(db.Integer, primary_key=True)
+    count = db.Column(db.Integer, nullable=False)
+    value_sum = db.Column(db.Float, nullable=False)
+    value_min = db.Column(db.Float, nullable=False)
+    value_max = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_sensor_rollup_hour', 'hour'), # recent hours across types
+    )
+
+class JobState(db.Model):
+    """Schedule, lease and last result of a shared background job (see scheduler.py)."""
+    name = db.Column(db.String(100), primary_key=True)
+    next_run_at = db.Column(db.DateTime, nullable=False)
+    lease_owner = db.Column(db.String(100)) # worker running it now
+    lease_until = db.Column(db.DateTime) # another worker may claim it after this
+    cursor = db.Column(db.String(255)) # progress of incremental jobs
+    last_started_at = db.Column(db.DateTime)
+    last_finished_at = db.Column(db.DateTime)
+    last_status = db.Column(db.String(20)) # ok, error
+    last_error = db.Column(db.Text)
+    last_duration = db.Column(db.Float) # seconds
+    runs = db.Column(db.Integer, nullable=False, default=0)
+    failures = db.Column(db.Integer, nullable=False, default=0)
+
+class ChangeLog(db.Model):
+    """One write to a table served by /sync (see sync.py); `version` orders them."""
+    version = db.Column(db.Integer, primary_key=True) # never reused, so a client's `since` stays meaningful
+    table_name = db.Column(db.String(40), nullable=False) # sync name: volunteers, resources, assignments, alerts
+    row_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False) # insert, update, delete
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_change_log_row', 'table_name', 'row_id', 'version'), # compaction: later writes to a row
+        {'sqlite_autoincrement': True},
+    )
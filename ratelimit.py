@@ -0,0 +1,88 @@
+# backend/ratelimit.py
+
+import os
+import sqlite3
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for a single process.
+    `rate` tokens are added per second, up to `capacity`.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens=1):
+        """Takes `tokens` if available. Returns 0 on success, else seconds until they would be."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, timeout=None, tokens=1):
+        """Blocks until `tokens` are taken or `timeout` seconds pass. Returns True if taken."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a small SQLite file, so every worker
+    process on the host draws from the same budget. `BEGIN IMMEDIATE` takes
+    the file's write lock for the read-modify-write of each take.
+    """
+
+    def __init__(self, path, name, rate, capacity=None):
+        super().__init__(rate, capacity)
+        self.path = path
+        self.name = name
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("CREATE TABLE IF NOT EXISTS token_bucket (name TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+        conn.execute("INSERT OR IGNORE INTO token_bucket VALUES (?, ?, ?)", (name, self.capacity, time.time()))
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def try_acquire(self, tokens=1):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM token_bucket WHERE name = ?", (self.name,)).fetchone()
+            now = time.time() # wall clock, monotonic clocks are per process
+            available = min(self.capacity, row[0] + max(0.0, now - row[1]) * self.rate)
+            if available >= tokens:
+                available -= tokens
+                wait = 0.0
+            else:
+                wait = (tokens - available) / self.rate
+            conn.execute("UPDATE token_bucket SET tokens = ?, updated = ? WHERE name = ?", (available, now, self.name))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
@@ -0,0 +1,148 @@
+# backend/risk.py
+#
+# Location severity kept in the LocationRisk table. It is rebuilt from the
+# disaster dataset plus all stored alerts when the dataset changes, and bumped
+# in the alert's own transaction when one is reported, so every worker process
+# reads the same ranking.
+
+import hashlib
+import json
+
+import pandas as pd
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from disaster_types import classify_series, classify_text, is_specific, mask_to_types, type_counts_by_group
+from extensions import db
+from models import Assignment, DisasterAlert, LocationRisk, Resource, Volunteer
+
+
+def dataset_location_risk(disaster_df):
+    """
+    {location: (severity, type_counts)} in first-seen order. Severity is the
+    number of events with at least one type besides 'Other'.
+    """
+    if disaster_df.empty:
+        return {}
+    masks = disaster_df['DisasterTypeMask'].to_numpy()
+    locations = disaster_df['Location'].to_numpy()
+    severity = pd.Series(is_specific(masks)).groupby(locations, sort=False).sum()
+    counts = type_counts_by_group(masks, locations)
+    return {loc: (int(count), counts[loc]) for loc, count in severity.items()}
+
+
+def dataset_fingerprint(dataset_risk):
+    payload = json.dumps(list(dataset_risk.items()), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def alert_text(alert_type, description):
+    return f"{alert_type or ''} {description or ''}"
+
+
+def _count_types(counts, mask):
+    for name in mask_to_types(mask):
+        counts[name] = counts.get(name, 0) + 1
+
+
+def _add_event(totals, location, mask):
+    severity, counts = totals.setdefault(location, [0, {}])
+    if is_specific(mask):
+        totals[location][0] = severity + 1
+    _count_types(counts, mask)
+
+
+def refresh_location_risk(dataset_risk, resolve_location, force=False):
+    """
+    Rebuilds LocationRisk from `dataset_risk` (see dataset_location_risk)
+    plus every stored alert, unless the table was already built from this
+    dataset (or `force` is given, which the severity_refresh job uses to
+    fold in alerts edited or deleted since). `resolve_location(name)` maps
+    an alert's location to the dataset's name for it. Returns True if the
+    table was rebuilt.
+    """
+    version = dataset_fingerprint(dataset_risk)
+    built_from = set(db.session.scalars(select(LocationRisk.dataset_version).distinct()))
+    if built_from == {version} and not force:
+        return False
+
+    totals = {loc: [severity, dict(counts)] for loc, (severity, counts) in dataset_risk.items()}
+    alerts = db.session.execute(
+        select(DisasterAlert.alert_type, DisasterAlert.description, DisasterAlert.location)).all()
+    if alerts:
+        masks = classify_series(pd.Series([alert_text(a.alert_type, a.description) for a in alerts]))
+        for alert, mask in zip(alerts, masks):
+            if alert.location:
+                _add_event(totals, resolve_location(alert.location), int(mask))
+
+    db.session.execute(delete(LocationRisk))
+    if totals:
+        db.session.execute(insert(LocationRisk), [
+            {'location': loc, 'severity': severity, 'type_counts': counts, 'rank': rank, 'dataset_version': version}
+            for rank, (loc, (severity, counts)) in enumerate(totals.items())])
+    db.session.commit()
+    return True
+
+
+def _bump_row(location, specific, mask):
+    """Adds one event to `location`'s row, if it has one; returns whether it did."""
+    # The UPDATE comes first: it locks the row (on SQLite, the database), so no other report can
+    # change type_counts between the read below and the write
+    bumped = db.session.execute(update(LocationRisk).where(LocationRisk.location == location)
+                                .values(severity=LocationRisk.severity + specific)).rowcount
+    if not bumped:
+        return False
+    counts = dict(db.session.scalar(select(LocationRisk.type_counts).where(LocationRisk.location == location)))
+    _count_types(counts, mask)
+    db.session.execute(update(LocationRisk).where(LocationRisk.location == location).values(type_counts=counts))
+    return True
+
+
+def record_alert(location, alert_type, description):
+    """
+    Adds one reported alert to its location's row inside the caller's
+    transaction; the caller commits together with the alert itself.
+    Concurrent reports for the same place all count.
+    """
+    mask = classify_text(alert_text(alert_type, description))
+    specific = int(is_specific(mask))
+    if _bump_row(location, specific, mask):
+        return
+    next_rank = db.session.scalar(select(func.coalesce(func.max(LocationRisk.rank), -1))) + 1
+    version = db.session.scalar(select(LocationRisk.dataset_version).limit(1))
+    counts = {}
+    _count_types(counts, mask)
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(LocationRisk).values(
+                location=location, severity=specific, type_counts=counts, rank=next_rank, dataset_version=version))
+    except IntegrityError: # another report created the row first; add to that one
+        _bump_row(location, specific, mask)
+
+
+def severity_by_location():
+    """{location: severity} for every location with a row, most severe first."""
+    return dict(db.session.execute(select(LocationRisk.location, LocationRisk.severity)
+                                   .order_by(LocationRisk.severity.desc(), LocationRisk.rank)).all())
+
+
+def location_summary(locations, location_coords):
+    """
+    Severity, volunteer/resource/assignment counts and coordinates for each
+    of `locations`, in order. Three grouped counts cover every location.
+    """
+    severity = severity_by_location()
+    volunteers = dict(db.session.execute(
+        select(Volunteer.location, func.count()).group_by(Volunteer.location)).all())
+    resources = dict(db.session.execute(
+        select(Resource.location, func.count()).group_by(Resource.location)).all())
+    assignments = dict(db.session.execute(
+        select(Assignment.zone, func.count()).group_by(Assignment.zone)).all())
+    return [{
+        'location': loc,
+        'severity': severity.get(loc, 0),
+        'volunteers_count': volunteers.get(loc, 0),
+        'resources_count': resources.get(loc, 0),
+        'assignments_count': assignments.get(loc, 0),
+        'coords': location_coords.get(loc, [None, None]),
+    } for loc in locations]
@@ -0,0 +1,256 @@
+# backend/scheduler.py
+#
+# In-process background job scheduler. Each worker process runs one scheduler
+# thread that hands due jobs to a small thread pool; jobs run inside an app
+# context. A shared job runs in one worker per period: its JobState row is
+# claimed with a conditional UPDATE (a lease that expires if the worker dies),
+# and its schedule, progress cursor and last result live in that row for every
+# worker to see. Local jobs (warming this process's own caches) run in every
+# worker and keep their state in memory.
+
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import JobState
+
+NEVER = datetime.max # next run of a job that only runs once
+
+
+class Job:
+    """
+    `fn(app, cursor)` runs inside an app context and returns the cursor to
+    keep for the next run (its progress, for incremental jobs; None
+    otherwise). For a shared job, writes `fn` leaves uncommitted are
+    committed together with that cursor, and discarded if the run fails or
+    its lease was lost. `interval` is in seconds, None to run once. With
+    `catch_up`, a run that moved the cursor is followed at once by
+    another, until one finds nothing new.
+    """
+
+    def __init__(self, name, fn, interval, shared=True, lease=None, catch_up=False, needs_warmup=True):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.shared = shared
+        self.lease = lease or max(interval or 0, 300) # seconds before a stuck run may be taken over
+        self.catch_up = catch_up
+        self.needs_warmup = needs_warmup # wait for app.warmup (the dataset) before the first run
+
+
+class Scheduler:
+    """
+    Runs `jobs` for `app` at their intervals, spread by +/- `jitter` (a
+    fraction of the interval) so workers and jobs don't fire in lockstep,
+    with at most `max_workers` jobs at a time and never two runs of one
+    job at once. Run counts and durations go to `metrics` when given.
+    """
+
+    def __init__(self, app, jobs=(), max_workers=2, jitter=0.1, tick=1.0, metrics=None, clock=datetime.utcnow):
+        self.app = app
+        self.jobs = {}
+        self.max_workers = max_workers
+        self.jitter = jitter
+        self.tick = tick
+        self.clock = clock
+        self.owner = None
+        self._due = {} # name -> when this process next looks at the job
+        self._running = set()
+        self._local = {} # name -> last result of a local job
+        self._known = set() # shared jobs whose JobState row exists
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+        self._executor = None
+        for job in jobs:
+            self.add(job)
+
+        self._runs = self._duration = self._last_success = None
+        if metrics is not None:
+            self._runs = metrics.counter('job_runs_total', 'Background job runs by outcome.', ('job', 'status'))
+            self._duration = metrics.histogram('job_duration_seconds', 'Background job run time.', ('job',),
+                                               buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300))
+            self._last_success = metrics.gauge('job_last_success_timestamp_seconds',
+                                               'Unix time of the last successful run in this worker.', ('job',))
+
+    def add(self, job):
+        self.jobs[job.name] = job
+
+    def start(self):
+        """
+        Starts the scheduler thread unless it is already running in this
+        process. Threads don't survive fork(), so every worker calls this
+        for its own (see gunicorn.conf.py); the lease owner is per process.
+        """
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+            self.owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+            self._due, self._running = {}, set()
+            self._stop.clear()
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='job')
+            self._thread = threading.Thread(target=self._loop, name='scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _loop(self):
+        while not self._stop.wait(self.tick):
+            try:
+                self.submit_due()
+            except Exception:
+                traceback.print_exc()
+
+    def submit_due(self):
+        now = self.clock()
+        ready = self.app.warmup.ready.is_set()
+        for job in self.jobs.values():
+            if job.name in self._running or self._due.get(job.name, now) > now or (job.needs_warmup and not ready):
+                continue
+            self._running.add(job.name)
+            self._executor.submit(self._run_and_release, job.name)
+
+    def _run_and_release(self, name):
+        try:
+            self.run_job(name)
+        finally:
+            self._running.discard(name)
+
+    def _next_run(self, job, now, moved=False):
+        if job.catch_up and moved:
+            return now
+        if job.interval is None:
+            return NEVER
+        return now + timedelta(seconds=job.interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def run_job(self, name):
+        """
+        Runs job `name` in the calling thread. A shared job only runs if it
+        is due and this worker wins the claim; returns 'ok', 'error',
+        'lost_lease' or None when it didn't run.
+        """
+        job = self.jobs[name]
+        if self.owner is None:
+            self.owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        with self.app.app_context():
+            return self._run_shared(job) if job.shared else self._run_local(job)
+
+    def _call(self, job, cursor):
+        started = time.perf_counter()
+        try:
+            result = job.fn(self.app, cursor), 'ok', None
+        except Exception as e:
+            db.session.rollback()
+            self.app.logger.error(f"Job {job.name} failed: {type(e).__name__}: {e}")
+            result = cursor, 'error', f"{type(e).__name__}: {e}"
+        return result + (time.perf_counter() - started,)
+
+    def _record(self, job, status, seconds):
+        if self._runs is None:
+            return
+        self._runs.inc(job=job.name, status=status)
+        self._duration.observe(seconds, job=job.name)
+        if status == 'ok':
+            self._last_success.set(round(time.time(), 3), job=job.name)
+
+    def _run_local(self, job):
+        _, status, error, seconds = self._call(job, None)
+        finished = self.clock()
+        self._due[job.name] = self._next_run(job, finished)
+        previous = self._local.get(job.name, {})
+        self._local[job.name] = {
+            'next_run_at': self._due[job.name], 'last_finished_at': finished, 'last_status': status,
+            'last_error': error, 'last_duration': round(seconds, 6), 'runs': previous.get('runs', 0) + 1,
+            'failures': previous.get('failures', 0) + (status == 'error'),
+        }
+        self._record(job, status, seconds)
+        return status
+
+    def _ensure_state(self, job, now):
+        if job.name in self._known:
+            return
+        if db.session.get(JobState, job.name) is None:
+            db.session.add(JobState(name=job.name, next_run_at=now, runs=0, failures=0))
+            try:
+                db.session.commit()
+            except IntegrityError: # another worker created it first
+                db.session.rollback()
+        self._known.add(job.name)
+
+    def _run_shared(self, job):
+        now = self.clock()
+        self._ensure_state(job, now)
+        claimed = db.session.execute(
+            update(JobState)
+            .where(JobState.name == job.name, JobState.next_run_at <= now,
+                   or_(JobState.lease_until.is_(None), JobState.lease_until < now))
+            .values(lease_owner=self.owner, lease_until=now + timedelta(seconds=job.lease), last_started_at=now)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            # Due later, or running elsewhere: look again when that worker's lease would run out
+            next_run_at, lease_until = db.session.execute(
+                select(JobState.next_run_at, JobState.lease_until).where(JobState.name == job.name)).one()
+            self._due[job.name] = max(next_run_at, lease_until or next_run_at)
+            return None
+
+        cursor = db.session.scalar(select(JobState.cursor).where(JobState.name == job.name))
+        new_cursor, status, error, seconds = self._call(job, cursor)
+        finished = self.clock()
+        next_run_at = self._next_run(job, finished, moved=status == 'ok' and new_cursor != cursor)
+        kept = db.session.execute(
+            update(JobState)
+            .where(JobState.name == job.name, JobState.lease_owner == self.owner)
+            .values(cursor=new_cursor, next_run_at=next_run_at, lease_owner=None, lease_until=None,
+                    last_finished_at=finished, last_status=status, last_error=error,
+                    last_duration=round(seconds, 6), runs=JobState.runs + 1,
+                    failures=JobState.failures + (1 if status == 'error' else 0))
+        ).rowcount
+        if kept:
+            db.session.commit()
+        else:
+            # The lease ran out and another worker took the job over; its run wins
+            db.session.rollback()
+            self.app.logger.warning(f"Job {job.name} lost its lease after {seconds:.1f}s; results discarded")
+            status = 'lost_lease'
+        self._due[job.name] = next_run_at
+        self._record(job, status, seconds)
+        return status
+
+    def status(self):
+        """One entry per job: schedule, lease and last result. Needs an app context."""
+        rows = {row.name: row for row in db.session.scalars(
+            select(JobState).where(JobState.name.in_([job.name for job in self.jobs.values() if job.shared])))}
+        result = []
+        for job in self.jobs.values():
+            entry = {'name': job.name, 'shared': job.shared, 'interval_s': job.interval,
+                     'running': job.name in self._running}
+            row = rows.get(job.name)
+            if row is not None:
+                entry.update({
+                    'next_run_at': row.next_run_at, 'lease_owner': row.lease_owner, 'lease_until': row.lease_until,
+                    'last_started_at': row.last_started_at, 'last_finished_at': row.last_finished_at,
+                    'last_status': row.last_status, 'last_error': row.last_error,
+                    'last_duration': row.last_duration, 'runs': row.runs, 'failures': row.failures,
+                })
+            elif not job.shared:
+                entry.update(self._local.get(job.name, {}))
+            if entry.get('next_run_at') == NEVER:
+                entry['next_run_at'] = None
+            result.append(entry)
+        return result
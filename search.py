@@ -0,0 +1,275 @@
+# backend/search.py
+#
+# Full-text search over the disaster dataset's events (Title, Disaster_Info)
+# and reported alerts, in an SQLite FTS5 index kept in its own file
+# (SEARCH_INDEX_PATH) so the main database never carries the text. Events are
+# indexed while the dataset is ingested, and only when the source CSV changed
+# since the index was built; alerts are added incrementally by id. Results are
+# ranked by bm25 with title matches weighted up.
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import func, select
+
+from extensions import db
+from models import DisasterAlert
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_state (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,          -- 'event' or 'alert'
+    source_id INTEGER NOT NULL,  -- row of app.disaster_df, or DisasterAlert.id
+    location TEXT,
+    doc_date TEXT,               -- YYYY-MM-DD, NULL when unknown
+    year INTEGER,
+    title TEXT,
+    body TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_docs_source ON docs (kind, source_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, body, location, content='docs', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+RANKING = 'bm25(4.0, 1.0, 0.0)' # a term in the title counts four times one in the body; location is for filtering
+KINDS = ('event', 'alert')
+ALERT_BATCH = 5_000
+REBUILD_STALE_AFTER = 60 # seconds without progress before another process may take over a rebuild
+
+_QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r'\w+')
+
+
+def build_match(query):
+    """
+    FTS5 MATCH expression for a user query. "Quoted text" is a phrase, a
+    trailing * makes the term a prefix search, and every term must match.
+    FTS5 operators and punctuation in the input are not interpreted.
+    Raises ValueError if nothing searchable is left.
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM.findall(query or ''):
+        words = _WORD.findall(phrase or word)
+        if words:
+            prefix = '*' if not phrase and word.endswith('*') else ''
+            terms.append('"' + ' '.join(words) + '"' + prefix)
+    if not terms:
+        raise ValueError('The query has no searchable words')
+    return ' AND '.join(terms)
+
+
+def dataset_source(path):
+    """Identifies a version of the dataset file (size and modification time); None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+
+class SearchIndex:
+    """
+    The index file, opened once per thread (and again after fork). Writers
+    take SQLite's write lock with BEGIN IMMEDIATE, so every worker on the
+    host can keep the same file up to date.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL') # searches don't wait for the indexer
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO docs_fts(docs_fts, rank) VALUES ('rank', ?)", (RANKING,))
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _state(conn, key):
+        row = conn.execute('SELECT value FROM search_state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_state(conn, key, value):
+        conn.execute('INSERT OR REPLACE INTO search_state VALUES (?, ?)', (key, value))
+
+    @staticmethod
+    def _insert(conn, docs):
+        """Adds (kind, source_id, location, doc_date, year, title, body) rows to docs and the FTS index."""
+        before = conn.execute('SELECT coalesce(max(id), 0) FROM docs').fetchone()[0]
+        conn.executemany('INSERT OR IGNORE INTO docs (kind, source_id, location, doc_date, year, title, body) '
+                         'VALUES (?, ?, ?, ?, ?, ?, ?)', docs)
+        conn.execute('INSERT INTO docs_fts (rowid, title, body, location) '
+                     'SELECT id, title, body, location FROM docs WHERE id > ?', (before,))
+
+    # --- Events, from the dataset ---
+
+    def event_writer(self, source):
+        """
+        An ingest text sink (see ingest.load_disaster_data) that rebuilds the
+        index from the dataset, or None if it was already built from
+        `source` (or another process is building it right now).
+        """
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if source is not None and self._state(conn, 'events_source') == source:
+                conn.execute('COMMIT')
+                return None
+            building = self._state(conn, 'events_building')
+            if building and time.time() - float(building) < REBUILD_STALE_AFTER:
+                conn.execute('COMMIT')
+                return None
+            # Everything goes, alerts included; they are indexed again from id 0 after the rebuild
+            conn.execute('DELETE FROM docs')
+            conn.execute("INSERT INTO docs_fts(docs_fts) VALUES ('delete-all')")
+            self._set_state(conn, 'events_source', None)
+            self._set_state(conn, 'events_building', str(time.time()))
+            self._set_state(conn, 'alerts_watermark', '0')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return _EventWriter(self, source)
+
+    # --- Alerts, from the database ---
+
+    def sync_alerts(self, resolve_location):
+        """
+        Indexes alerts stored since the last call (by id), under the
+        dataset's name for their place. Needs an app context; returns how
+        many alerts were added.
+        """
+        newest = db.session.scalar(select(func.max(DisasterAlert.id))) or 0
+        conn = self._connection()
+        watermark = int(self._state(conn, 'alerts_watermark') or 0)
+        if newest == watermark:
+            return 0
+        added = 0
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            watermark = int(self._state(conn, 'alerts_watermark') or 0)
+            if newest < watermark: # the alert table was reset; its old documents are gone
+                conn.execute("DELETE FROM docs_fts WHERE rowid IN (SELECT id FROM docs WHERE kind = 'alert')")
+                conn.execute("DELETE FROM docs WHERE kind = 'alert'")
+                watermark = 0
+            while True:
+                alerts = db.session.execute(
+                    select(DisasterAlert.id, DisasterAlert.issued_at, DisasterAlert.alert_type,
+                           DisasterAlert.severity, DisasterAlert.description, DisasterAlert.location)
+                    .where(DisasterAlert.id > watermark).order_by(DisasterAlert.id).limit(ALERT_BATCH)).all()
+                if not alerts:
+                    break
+                self._insert(conn, [
+                    ('alert', a.id, resolve_location(a.location) if a.location else None,
+                     a.issued_at.date().isoformat() if a.issued_at else None,
+                     a.issued_at.year if a.issued_at else None,
+                     f'{a.alert_type} ({a.severity})' if a.severity else a.alert_type, a.description)
+                    for a in alerts])
+                added += len(alerts)
+                watermark = alerts[-1].id
+            self._set_state(conn, 'alerts_watermark', str(watermark))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return added
+
+    # --- Queries ---
+
+    def search(self, query, locations=None, kinds=None, start_date=None, end_date=None,
+               start_year=None, end_year=None, limit=20, offset=0):
+        """
+        Best matches first, as dicts of kind, id (dataset row or alert id),
+        location, date, year, title, snippet (matches in [brackets]) and
+        score (higher is better). Date filters are YYYY-MM-DD strings and
+        leave out documents without a date; None means no filter.
+        """
+        match = build_match(query)
+        if locations:
+            # Narrow by the indexed location column first (a name anchored at its start), then keep
+            # exact matches only: "Godavari" alone would also match "Godavari East"
+            names = ['^"' + ' '.join(_WORD.findall(name)) + '"' for name in locations]
+            if names and '^""' not in names:
+                match = f"({match}) AND location : ({' OR '.join(names)})"
+        where, params = ['docs_fts MATCH ?'], [match]
+        for column, values in (('d.location', locations), ('d.kind', kinds)):
+            if values is not None:
+                where.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        for condition, value in (('d.doc_date >= ?', start_date), ('d.doc_date <= ?', end_date),
+                                 ('d.year >= ?', start_year), ('d.year <= ?', end_year)):
+            if value is not None:
+                where.append(condition)
+                params.append(value)
+        rows = self._connection().execute(
+            f"""SELECT d.kind, d.source_id, d.location, d.doc_date, d.year, d.title,
+                       snippet(docs_fts, 1, '[', ']', '...', 16), docs_fts.rank
+                FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid
+                WHERE {' AND '.join(where)}
+                ORDER BY docs_fts.rank LIMIT ? OFFSET ?""", params + [limit, offset]).fetchall()
+        return [{'kind': kind, 'id': source_id, 'location': location, 'date': doc_date, 'year': year,
+                 'title': title, 'snippet': snippet, 'score': round(-rank, 4)}
+                for kind, source_id, location, doc_date, year, title, snippet, rank in rows]
+
+    def stats(self):
+        conn = self._connection()
+        counts = dict(conn.execute('SELECT kind, count(*) FROM docs GROUP BY kind').fetchall())
+        return {'events': counts.get('event', 0), 'alerts': counts.get('alert', 0),
+                'events_source': self._state(conn, 'events_source'),
+                'alerts_watermark': int(self._state(conn, 'alerts_watermark') or 0)}
+
+
+def _values(series):
+    """Python values for SQLite, None where missing."""
+    values = series.astype(object)
+    return values.where(values.notna(), None).tolist()
+
+
+class _EventWriter:
+    """Receives the dataset's rows chunk by chunk during ingest; finish() marks the rebuild complete."""
+
+    def __init__(self, index, source):
+        self.index = index
+        self.source = source
+        self.rows = 0
+
+    def write(self, rows, first_row):
+        conn = self.index._connection()
+        missing = [None] * len(rows)
+        dates = rows['Date'].dt.strftime('%Y-%m-%d') if 'Date' in rows else missing
+        docs = list(zip(['event'] * len(rows), range(first_row, first_row + len(rows)),
+                        _values(rows['Location']) if 'Location' in rows else missing,
+                        _values(dates) if 'Date' in rows else missing, _values(rows['Year'].astype('Int64')),
+                        _values(rows['Title']), _values(rows['Disaster_Info'])))
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self.index._insert(conn, docs)
+            self.index._set_state(conn, 'events_building', str(time.time()))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self.rows += len(docs)
+
+    def close(self):
+        pass # ingest closes its sinks even when loading failed; finish() is only called on success
+
+    def finish(self):
+        conn = self.index._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        self.index._set_state(conn, 'events_source', self.source)
+        self.index._set_state(conn, 'events_building', None)
+        self.index._set_state(conn, 'events_rows', str(self.rows))
+        conn.execute('COMMIT')
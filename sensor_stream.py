@@ -0,0 +1,287 @@
+# backend/sensor_stream.py
+#
+# Streaming detection on incoming sensor readings. Every (sensor type, grid
+# cell) gets a fixed-size NumPy ring buffer with a running sum and sum of
+# squares, so the rolling mean and z-score of a new reading cost O(1).
+# Threshold crossings and z-score anomalies that persist for a few readings
+# in a row become DisasterAlert rows, at most one per cell, type and cooldown.
+
+import math
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select
+
+from extensions import db
+from models import DisasterAlert
+
+# (comparison, limit, alert type) per sensor type; the limits historical_risk_analysis suggests types from
+SENSOR_THRESHOLDS = {
+    'temperature': [('>', 40.0, 'Heatwave'), ('<', 5.0, 'Cold Wave')],
+    'rainfall': [('>', 100.0, 'Flood')],
+    'windspeed': [('>', 50.0, 'Cyclone')],
+}
+ANOMALY_ALERT_TYPE = 'Sensor Anomaly'
+
+Detection = namedtuple('Detection', 'alert_type severity rule sensor_type value zscore mean latitude longitude cell')
+
+
+class SensorStreamDetector:
+    """
+    Rolling per-(sensor type, grid cell) statistics over the last `window`
+    readings. A reading's z-score is taken against the window before it is
+    added, once the window holds `min_samples`. A rule (a threshold from
+    SENSOR_THRESHOLDS, or |z| >= `zscore_limit`) fires after holding for
+    `consecutive` readings, and then not again for that cell and rule for
+    `cooldown` seconds.
+
+    State is per process; raise_alerts() also checks stored alerts, so
+    several workers don't alert twice for the same cell. A detection whose
+    alert isn't committed is handed back to forget(), so it doesn't start
+    a cooldown.
+    """
+
+    def __init__(self, window=120, min_samples=30, zscore_limit=4.0, grid_degrees=0.5,
+                 consecutive=3, cooldown=900.0, thresholds=SENSOR_THRESHOLDS, clock=time.monotonic):
+        self.window = window
+        self.min_samples = min(min_samples, window)
+        self.zscore_limit = zscore_limit
+        self.grid_degrees = grid_degrees
+        self.consecutive = consecutive
+        self.cooldown = cooldown
+        self.thresholds = thresholds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._rows = {} # (sensor_type, cell) -> row in the arrays below
+        self._values = np.zeros((0, window))
+        self._sum = np.zeros(0)
+        self._sumsq = np.zeros(0)
+        self._count = np.zeros(0, dtype=np.int64)
+        self._pos = np.zeros(0, dtype=np.int64)
+        self._streak = {} # (row, rule) -> readings in a row meeting the rule
+        self._last_fired = {} # (row, rule) -> clock time
+        self.observed = 0
+        self.fired = 0
+
+    def cell(self, latitude, longitude):
+        return (math.floor(latitude / self.grid_degrees), math.floor(longitude / self.grid_degrees))
+
+    def cell_bounds(self, cell):
+        """((lat_min, lat_max), (lon_min, lon_max)) of a grid cell."""
+        return tuple((index * self.grid_degrees, (index + 1) * self.grid_degrees) for index in cell)
+
+    def _row(self, key):
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._rows)
+            if row == len(self._sum):
+                grow = max(64, row)
+                self._values = np.vstack([self._values, np.zeros((grow, self.window))])
+                self._sum = np.concatenate([self._sum, np.zeros(grow)])
+                self._sumsq = np.concatenate([self._sumsq, np.zeros(grow)])
+                self._count = np.concatenate([self._count, np.zeros(grow, dtype=np.int64)])
+                self._pos = np.concatenate([self._pos, np.zeros(grow, dtype=np.int64)])
+            self._rows[key] = row
+        return row
+
+    def _push(self, row, value):
+        pos = int(self._pos[row])
+        if self._count[row] == self.window:
+            old = self._values[row, pos]
+            self._sum[row] -= old
+            self._sumsq[row] -= old * old
+        else:
+            self._count[row] += 1
+        self._values[row, pos] = value
+        self._sum[row] += value
+        self._sumsq[row] += value * value
+        pos += 1
+        if pos == self.window:
+            pos = 0
+            # Re-sum once per lap so rounding in the running totals can't accumulate
+            self._sum[row] = self._values[row].sum()
+            self._sumsq[row] = np.dot(self._values[row], self._values[row])
+        self._pos[row] = pos
+
+    def _rules(self, sensor_type, value, zscore):
+        for op, limit, alert_type in self.thresholds.get(sensor_type, ()):
+            yield f"{op}{limit:g}", alert_type, 'high', value > limit if op == '>' else value < limit
+        yield 'zscore', ANOMALY_ALERT_TYPE, 'medium', zscore is not None and abs(zscore) >= self.zscore_limit
+
+    def observe(self, sensor_type, value, latitude, longitude):
+        """Adds one reading; returns the Detections it fired (usually none)."""
+        try:
+            value, latitude, longitude = float(value), float(latitude), float(longitude)
+        except (TypeError, ValueError):
+            return []
+        if not (math.isfinite(value) and math.isfinite(latitude) and math.isfinite(longitude)):
+            return []
+        cell = self.cell(latitude, longitude)
+
+        with self._lock:
+            self.observed += 1
+            row = self._row((sensor_type, cell))
+            count = int(self._count[row])
+            mean = zscore = None
+            if count >= self.min_samples:
+                mean = float(self._sum[row]) / count
+                std = math.sqrt(max(float(self._sumsq[row]) / count - mean * mean, 0.0))
+                zscore = (value - mean) / std if std > 1e-9 else None
+            self._push(row, value)
+
+            detections = []
+            for rule, alert_type, severity, hit in self._rules(sensor_type, value, zscore):
+                key = (row, rule)
+                if not hit:
+                    self._streak.pop(key, None)
+                    continue
+                streak = self._streak[key] = self._streak.get(key, 0) + 1
+                if streak < self.consecutive:
+                    continue
+                now = self._clock()
+                last = self._last_fired.get(key)
+                if last is not None and now - last < self.cooldown:
+                    continue
+                self._last_fired[key] = now
+                self.fired += 1
+                detections.append(Detection(alert_type, severity, rule, sensor_type, value,
+                                            None if zscore is None else round(zscore, 2),
+                                            None if mean is None else round(mean, 3), latitude, longitude, cell))
+            return detections
+
+    def forget(self, detections):
+        """Undoes the cooldowns `detections` started; their alerts were never stored."""
+        with self._lock:
+            for detection in detections:
+                row = self._rows.get((detection.sensor_type, detection.cell))
+                if self._last_fired.pop((row, detection.rule), None) is not None:
+                    self.fired -= 1
+
+    def observe_many(self, readings):
+        """observe() for each reading dict (sensor_type, value, latitude, longitude), in order."""
+        detections = []
+        for reading in readings:
+            detections.extend(self.observe(reading.get('sensor_type'), reading.get('value'),
+                                           reading.get('latitude'), reading.get('longitude')))
+        return detections
+
+    def stats(self):
+        with self._lock:
+            return {'windows': len(self._rows), 'observed': self.observed, 'fired': self.fired}
+
+
+def parse_reading(reading):
+    """
+    {sensor_type, value, latitude, longitude} with numeric floats, or None
+    when a field is missing, not a finite number or off the globe.
+    """
+    numeric = ('value', 'latitude', 'longitude')
+    if not isinstance(reading, dict) or not isinstance(reading.get('sensor_type'), str):
+        return None
+    if any(isinstance(reading.get(k), bool) for k in numeric):
+        return None
+    try:
+        value, latitude, longitude = (float(reading[k]) for k in numeric)
+    except (KeyError, TypeError, ValueError):
+        return None
+    sensor_type = reading['sensor_type'].strip()
+    if not (0 < len(sensor_type) <= 50 and math.isfinite(value)
+            and -90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return {'sensor_type': sensor_type, 'value': value, 'latitude': latitude, 'longitude': longitude}
+
+
+def describe(detection):
+    if detection.rule == 'zscore':
+        reason = f"is {detection.zscore:+.1f} standard deviations from the rolling mean of {detection.mean:g}"
+    else:
+        reason = f"crossed the {detection.alert_type} threshold ({detection.rule})"
+    return f"Automatic sensor alert: {detection.sensor_type} reading {detection.value:g} {reason}."
+
+
+def raise_alerts(detections, detector, locate=None, now=None):
+    """
+    Adds a DisasterAlert for each detection to the caller's transaction
+    (and bumps LocationRisk when `locate(lat, lon)` names a known place).
+    A detection is skipped when an alert of the same type was already
+    stored inside its grid cell within the detector's cooldown. Returns
+    the alerts added; the caller commits.
+    """
+    from services.risk import record_alert
+
+    now = now or datetime.utcnow()
+    since = now - timedelta(seconds=detector.cooldown)
+    alerts = []
+    for detection in detections:
+        (lat_min, lat_max), (lon_min, lon_max) = detector.cell_bounds(detection.cell)
+        recent = db.session.scalar(select(DisasterAlert.id).where(
+            DisasterAlert.issued_at >= since,
+            DisasterAlert.alert_type == detection.alert_type,
+            DisasterAlert.latitude >= lat_min, DisasterAlert.latitude < lat_max,
+            DisasterAlert.longitude >= lon_min, DisasterAlert.longitude < lon_max).limit(1))
+        if recent is not None:
+            continue
+        location = locate(detection.latitude, detection.longitude) if locate else None
+        alert = DisasterAlert(alert_type=detection.alert_type, severity=detection.severity,
+                              description=describe(detection), latitude=detection.latitude,
+                              longitude=detection.longitude, location=location, issued_at=now)
+        db.session.add(alert)
+        if location is not None:
+            record_alert(location, alert.alert_type, alert.description)
+        alerts.append(alert)
+    return alerts
+
+
+_detector_lock = threading.Lock()
+
+
+def detector_for(app):
+    """The app's detector, built from config on first use (keeps NumPy out of `import app`)."""
+    detector = app.extensions.get('sensor_stream')
+    if detector is None:
+        with _detector_lock:
+            detector = app.extensions.get('sensor_stream')
+            if detector is None:
+                config = app.config
+                detector = SensorStreamDetector(window=config['SENSOR_WINDOW'],
+                                                min_samples=config['SENSOR_MIN_SAMPLES'],
+                                                zscore_limit=config['SENSOR_ZSCORE_LIMIT'],
+                                                grid_degrees=config['SENSOR_GRID_DEGREES'],
+                                                consecutive=config['SENSOR_ALERT_CONSECUTIVE'],
+                                                cooldown=config['SENSOR_ALERT_COOLDOWN'])
+                gauge = app.metrics.gauge('sensor_stream', 'Streaming sensor detector statistics.', ('stat',))
+                def collect_sensor_stream_stats():
+                    for stat, value in detector.stats().items():
+                        gauge.set(value, stat=stat)
+                app.metrics.register_collector(collect_sensor_stream_stats)
+                app.extensions['sensor_stream'] = detector
+    return detector
+
+
+def commit_readings(app, readings):
+    """
+    Runs readings (from parse_reading, already added to the session) through
+    the app's detector and commits them together with any resulting alerts.
+    Alerts are named after the nearest known location once the gazetteer
+    has loaded. If the commit fails it is rolled back, the detector forgets
+    the cooldowns these readings started and the error is re-raised.
+    """
+    detector = detector_for(app)
+    detections = detector.observe_many(readings)
+
+    def locate(latitude, longitude):
+        if not app.warmup.ready.is_set():
+            return None
+        return app.gazetteer.nearest(latitude, longitude, max_km=app.config['SENSOR_ALERT_RADIUS_KM'])
+    try:
+        alerts = raise_alerts(detections, detector, locate) if detections else []
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        detector.forget(detections)
+        raise
+    return alerts
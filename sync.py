@@ -0,0 +1,166 @@
+# backend/sync.py
+#
+# Delta sync for field clients on poor links. Every write to Volunteer,
+# Resource, Assignment and DisasterAlert appends a ChangeLog entry whose
+# autoincrement `version` orders it, and /sync?since=<version> answers with
+# the rows changed since then (current values, as row arrays) and the ids
+# deleted, so a dashboard downloads each table once and only deltas after
+# that. ORM writes are logged by a flush listener; bulk statements, which
+# bypass the unit of work, call record_changes themselves. The
+# change_log_compaction job keeps one entry per row and drops old deletions.
+#
+# On SQLite writers are serialized, so versions become visible in order and
+# a client never skips a change by syncing between two commits. Other
+# databases hand out versions at insert time but commit in any order, so
+# /sync there only serves entries older than SYNC_COMMIT_LAG (see
+# changes_since), and reads the primary: a lagging replica would answer
+# with an older log.
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, event, exists, func, insert, literal, select
+from sqlalchemy.orm import Session, aliased
+
+from extensions import db
+from models import Assignment, ChangeLog, DisasterAlert, JobState, Resource, Volunteer
+
+SYNCED = { # sync name -> (model, fields sent)
+    'volunteers': (Volunteer, ('id', 'name', 'contact', 'location', 'available', 'assigned_zone', 'assistance_type')),
+    'resources': (Resource, ('id', 'resource_type', 'quantity', 'location', 'assigned', 'created_at')),
+    'assignments': (Assignment, ('id', 'zone', 'resource_id', 'volunteer_id', 'assigned_at')),
+    'alerts': (DisasterAlert, ('id', 'alert_type', 'severity', 'description', 'issued_at', 'latitude',
+                               'longitude', 'location')),
+}
+TABLE_NAMES = {model: name for name, (model, _) in SYNCED.items()}
+COMPACTION_JOB = 'change_log_compaction' # its JobState cursor holds the floor (see compact)
+ID_BATCH = 500 # ids per IN (...) when loading changed rows
+
+
+def record_changes(model, row_ids, op):
+    """Logs a bulk insert/update/delete of `row_ids`; call it in the same transaction as the write."""
+    changed_at = datetime.utcnow()
+    rows = [{'table_name': TABLE_NAMES[model], 'row_id': row_id, 'op': op, 'changed_at': changed_at}
+            for row_id in row_ids]
+    if rows:
+        db.session.execute(ChangeLog.__table__.insert(), rows) # Core executemany; no ORM bulk bookkeeping
+
+
+def record_inserts(model, after_id):
+    """
+    Logs rows of `model` with ids above `after_id` (read before a bulk
+    insert) as inserted, in one INSERT ... SELECT. Rows another writer
+    added meanwhile are logged twice, which readers of the log don't mind.
+    """
+    logged = select(literal(TABLE_NAMES[model]), model.id, literal('insert'), literal(datetime.utcnow())) \
+        .where(model.id > after_id)
+    db.session.execute(insert(ChangeLog).from_select(['table_name', 'row_id', 'op', 'changed_at'], logged))
+
+
+def _record_flush(session, flush_context):
+    changed_at = datetime.utcnow()
+    rows = []
+    for objects, op in ((session.new, 'insert'), (session.dirty, 'update'), (session.deleted, 'delete')):
+        for obj in objects:
+            name = TABLE_NAMES.get(type(obj))
+            if name is None or (op == 'update' and not session.is_modified(obj, include_collections=False)):
+                continue
+            rows.append({'table_name': name, 'row_id': obj.id, 'op': op, 'changed_at': changed_at})
+    if rows:
+        session.connection().execute(ChangeLog.__table__.insert(), rows)
+
+
+def track_changes():
+    """Logs ORM writes to the synced models from now on (once per process)."""
+    if not event.contains(Session, 'after_flush', _record_flush):
+        event.listen(Session, 'after_flush', _record_flush)
+
+
+def compaction_floor():
+    """Clients synced to a version below this missed dropped deletions and must start over."""
+    state = db.session.get(JobState, COMPACTION_JOB)
+    return int(state.cursor) if state is not None and state.cursor else 0
+
+
+def changes_since(since, limit, tables=None, lag=0):
+    """
+    Rows of `tables` (sync names, default all) changed after version
+    `since`, covering at most `limit` log entries: has_more means ask again
+    from the returned version. Each table lists its fields, then inserted
+    and updated rows (current values, in field order) and deleted ids.
+    After compaction, rows a client never saw may come as updates, so
+    clients should upsert. `reset` (since is below the compaction floor,
+    or ahead of this database) means drop local copies: every row follows.
+
+    With `lag` (seconds), the answer stops before the first entry logged
+    less than `lag` ago, so a write transaction still in flight that took a
+    lower version has that long to commit before clients move past it.
+    """
+    newest = db.session.scalar(select(func.max(ChangeLog.version))) or 0
+    reset = since < compaction_floor() or since > newest
+    start = 0 if reset else since
+    query = select(ChangeLog.version, ChangeLog.table_name, ChangeLog.row_id, ChangeLog.op) \
+        .where(ChangeLog.version > start).order_by(ChangeLog.version).limit(limit + 1)
+    if lag:
+        recent = db.session.scalar(select(func.min(ChangeLog.version)).where(
+            ChangeLog.version > start, ChangeLog.changed_at >= datetime.utcnow() - timedelta(seconds=lag)))
+        if recent is not None:
+            newest = recent - 1
+            query = query.where(ChangeLog.version < recent)
+    if tables is not None:
+        query = query.where(ChangeLog.table_name.in_(tables))
+    entries = db.session.execute(query).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    if has_more:
+        version = entries[-1].version
+    else:
+        version = max(newest, start, entries[-1].version if entries else 0)
+
+    latest = {} # (table, row id) -> (last op, inserted after `start`)
+    for entry in entries:
+        key = (entry.table_name, entry.row_id)
+        inserted = start == 0 or entry.op == 'insert' or (key in latest and latest[key][1])
+        latest[key] = (entry.op, inserted)
+
+    changes = {}
+    for name in sorted({table for table, _ in latest}):
+        model, fields = SYNCED[name]
+        ops = {row_id: state for (table, row_id), state in latest.items() if table == name}
+        wanted = sorted(row_id for row_id, (op, _) in ops.items() if op != 'delete')
+        rows = {}
+        for i in range(0, len(wanted), ID_BATCH):
+            batch = wanted[i:i + ID_BATCH]
+            rows.update((row[0], list(row)) for row in db.session.execute(
+                select(*(getattr(model, field) for field in fields)).where(model.id.in_(batch))))
+        table = {'fields': list(fields), 'inserted': [], 'updated': [], 'deleted': []}
+        for row_id in sorted(ops):
+            op, inserted = ops[row_id]
+            row = rows.get(row_id)
+            if row is not None:
+                table['inserted' if inserted else 'updated'].append(row)
+            elif not inserted: # gone (deleted now, or later in the log); clients that never had it don't care
+                table['deleted'].append(row_id)
+        changes[name] = table
+    return {'since': since, 'version': version, 'reset': reset, 'has_more': has_more, 'changes': changes}
+
+
+def compact(tombstone_ttl, floor=0):
+    """
+    Drops log entries superseded by a later one for the same row, and
+    deletions older than `tombstone_ttl` seconds. Returns the new floor:
+    the newest version whose deletion was dropped (else `floor`).
+    """
+    newer = aliased(ChangeLog)
+    db.session.execute(
+        delete(ChangeLog).where(exists().where(newer.table_name == ChangeLog.table_name,
+                                               newer.row_id == ChangeLog.row_id,
+                                               newer.version > ChangeLog.version)),
+        execution_options={'synchronize_session': False})
+    cutoff = datetime.utcnow() - timedelta(seconds=tombstone_ttl)
+    dropped = db.session.scalar(
+        select(func.max(ChangeLog.version)).where(ChangeLog.op == 'delete', ChangeLog.changed_at < cutoff))
+    if dropped is not None:
+        db.session.execute(delete(ChangeLog).where(ChangeLog.op == 'delete', ChangeLog.version <= dropped),
+                           execution_options={'synchronize_session': False})
+        floor = max(floor, dropped)
+    return floor
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from app import create_app
+from services.admission import CRITICAL, LOW, NORMAL, AdmissionController, Gate
+
+
+def test_gate_lets_queued_requests_in_by_priority():
+    gate = Gate(capacity=1, reserve=0)
+    assert gate.enter(NORMAL, timeout=0) == (True, False)
+    assert gate.enter(LOW, timeout=5) == (False, False) # dashboard reads are shed, not queued
+
+    order = []
+    def wait(priority):
+        if gate.enter(priority, timeout=5)[0]:
+            order.append(priority)
+            gate.leave()
+    threads = [threading.Thread(target=wait, args=(NORMAL,))]
+    threads[0].start()
+    while not gate.queued:
+        time.sleep(0.001)
+    threads.append(threading.Thread(target=wait, args=(CRITICAL,)))
+    threads[1].start()
+    while gate.queued < 2:
+        time.sleep(0.001)
+    gate.leave()
+    for thread in threads:
+        thread.join()
+    assert order == [CRITICAL, NORMAL] and gate.active == 0
+
+
+def test_critical_reports_use_reserved_slots_and_skip_client_limits():
+    controller = AdmissionController({'api.report_alert': 1}, critical_reserve=1, queue_timeout=0.01,
+                                     client_rate=0.001, client_burst=1)
+    assert controller.admit('api.report_alert', NORMAL, 'ip:a') is None
+    assert controller.admit('api.report_alert', NORMAL, 'ip:b') == (503, 2, 'queue_timeout')
+    assert controller.admit('api.report_alert', NORMAL, 'ip:a')[:1] == (429,)
+    assert controller.admit('api.report_alert', CRITICAL, 'ip:a') is None
+
+
+def test_full_route_sheds_dashboard_polls_with_retry_after(app):
+    gate = app.admission.gates['location_summary']
+    client = app.test_client()
+    gate.active = gate.capacity
+    try:
+        response = client.get('/location-summary')
+    finally:
+        gate.active = 0
+    assert response.status_code == 503 and response.headers['Retry-After'] == '2'
+    assert response.get_json()['reason'] == 'overload'
+    assert client.get('/location-summary').status_code == 200 and gate.active == 0
+    assert ('admission_shed_total{route="location_summary",priority="low",reason="overload"} 1'
+            in client.get('/metrics').get_data(as_text=True))
+
+
+def test_clients_behind_a_trusted_proxy_get_their_own_buckets(monkeypatch):
+    from config import Config
+    monkeypatch.setattr(Config, 'TRUSTED_PROXIES', 1)
+    monkeypatch.setattr(Config, 'ADMISSION_CLIENT_BURST', 1)
+    app = create_app()
+    client = app.test_client()
+    proxied = {'REMOTE_ADDR': '10.0.0.2'}
+    for address in ('203.0.113.7', '198.51.100.4'):
+        response = client.get('/location-summary', headers={'X-Forwarded-For': address}, environ_base=proxied)
+        assert response.status_code == 200, address
+    response = client.get('/location-summary', headers={'X-Forwarded-For': '203.0.113.7'}, environ_base=proxied)
+    assert response.status_code == 429
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from disaster_types import TYPE_BITS, OTHER_BIT
+from services.analytics import AnalyticsCube
+
+FLOOD, QUAKE, CYCLONE = TYPE_BITS['Flood'], TYPE_BITS['Earthquake'], TYPE_BITS['Cyclone']
+DF = pd.DataFrame({
+    'Location': pd.Categorical(['Assam', 'Assam', 'Kerala', 'Assam', 'Kerala', 'Assam']),
+    'Year': [2001.0, 2003.0, 2003.0, np.nan, 2001.0, 2003.0],
+    'DisasterTypeMask': np.array([FLOOD, FLOOD | CYCLONE, QUAKE, FLOOD, OTHER_BIT, FLOOD], dtype=np.int16),
+})
+
+
+def test_slices_roll_ups_and_trends():
+    cube = AnalyticsCube.from_disaster_df(DF)
+    assert (cube.first_year, cube.last_year) == (2001, 2003)
+    assert cube.query()[0] == 5 # the undated row is left out
+
+    total, cells = cube.query(locations=['Assam'], disaster_types=['Flood'], group_by=['year'])
+    assert total == 3
+    assert cells == [({'year': 2001}, 1), ({'year': 2002}, 0), ({'year': 2003}, 2)]
+
+    # Events, not type occurrences, unless types are filtered or grouped
+    assert cube.query(locations=['Assam'], group_by=['location']) == (3, [({'location': 'Assam'}, 3)])
+    total, cells = cube.query(start_year=2003, group_by=['disaster_type'])
+    assert dict((key['disaster_type'], count) for key, count in cells) == {'Flood': 2, 'Earthquake': 1, 'Cyclone': 1}
+
+
+def test_alert_events_grow_the_cube():
+    cube = AnalyticsCube.from_disaster_df(DF)
+    cube.add_event(2025, 'Mumbai', CYCLONE)
+    cube.add_event(1999, 'Assam', FLOOD)
+    assert (cube.first_year, cube.last_year) == (1999, 2025)
+    assert cube.query(locations=['Mumbai'], disaster_types=['Cyclone'])[0] == 1
+    assert cube.query(locations=['Assam'], disaster_types=['Flood'], end_year=2001)[0] == 2
+    assert cube.query()[0] == 7
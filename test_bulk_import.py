@@ -0,0 +1,51 @@
+import io
+
+from extensions import db
+from models import Resource, Volunteer
+
+
+def test_volunteer_import_upserts_by_contact_and_reports_bad_rows(app):
+    with app.app_context():
+        db.session.add(Volunteer(name='Old Name', contact='9000000001', location='Pune', available=False))
+        db.session.commit()
+    csv = ('Name,Contact,Location,Assistance Type,Available\n'
+           'Asha,9000000001,Mumbai,Medical,\n'
+           'Ravi,9000000002,Assam,,yes\n'
+           ',9000000003,Kerala,,\n'
+           'Meena,9000000004,Odisha,,maybe\n'
+           'Ravi K,9000000002,Assam,Rescue,no\n')
+    client = app.test_client()
+    response = client.post('/volunteers/import', data={'file': (io.BytesIO(csv.encode()), 'volunteers.csv')})
+    assert response.status_code == 200
+    report = response.get_json()
+    assert (report['rows'], report['inserted'], report['updated'], report['duplicates'], report['rejected']) == \
+        (5, 1, 1, 1, 2)
+    assert report['errors'] == [{'row': 4, 'errors': [{'field': 'name', 'message': 'is required'}]},
+                                {'row': 5, 'errors': [{'field': 'available', 'message': 'must be true or false'}]}]
+
+    with app.app_context():
+        asha = Volunteer.query.filter_by(contact='9000000001').one()
+        assert (asha.name, asha.location, asha.assistance_type, asha.available) == ('Asha', 'Mumbai', 'Medical', False)
+        ravi = Volunteer.query.filter_by(contact='9000000002').one()
+        assert (ravi.name, ravi.assistance_type, ravi.available) == ('Ravi K', 'Rescue', False)
+
+
+def test_resource_import_restates_unassigned_stock(app):
+    with app.app_context():
+        db.session.add_all([Resource(resource_type='water', quantity=5, location='Assam', assigned=True),
+                            Resource(resource_type='water', quantity=7, location='Assam')])
+        db.session.commit()
+    client = app.test_client()
+    body = 'resource_type,quantity,location\nwater,40,Assam\nfood,12,Assam\nboats,-1,Assam\n'
+    dry = client.post('/resources/import?dry_run=true', data=body, content_type='text/csv').get_json()
+    assert (dry['inserted'], dry['updated'], dry['rejected']) == (1, 1, 1)
+
+    report = client.post('/resources/import', data=body, content_type='text/csv').get_json()
+    assert (report['inserted'], report['updated'], report['rejected']) == (1, 1, 1)
+    with app.app_context():
+        water = sorted((r.assigned, r.quantity) for r in Resource.query.filter_by(resource_type='water'))
+        assert water == [(False, 40), (True, 5)]
+        assert Resource.query.filter_by(resource_type='food').one().quantity == 12
+
+    missing = client.post('/resources/import', data='resource_type,location\nfood,Assam\n', content_type='text/csv')
+    assert missing.status_code == 400 and 'quantity' in missing.get_json()['error']
@@ -0,0 +1,83 @@
+import pytest
+from flask import Flask, jsonify
+from flask_sqlalchemy import SQLAlchemy
+
+from config import Config
+from database import REPLICA_BIND, RoutingSession, apply_engine_profile, reads_primary
+from models import ChangeLog, Volunteer
+
+# Its own extension: registering the app's `db` with a replica bind would leave that bind behind for other tests
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+
+def make_app(tmp_path, replica):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'primary.db'}"
+    app.config['DATABASE_REPLICA_URI'] = f"sqlite:///{tmp_path / 'replica.db'}" if replica else None
+    apply_engine_profile(app)
+    db.init_app(app)
+    with app.app_context():
+        for engine, name in ((db.engine, 'primary'), (db.engines.get(REPLICA_BIND), 'replica')):
+            if engine is not None:
+                # ChangeLog too: the sync listener logs the Volunteer flush
+                db.metadata.create_all(engine, tables=[Volunteer.__table__, ChangeLog.__table__])
+                with engine.begin() as conn:
+                    conn.execute(Volunteer.__table__.insert(), {'name': name, 'location': 'Assam'})
+
+    def names():
+        return sorted(db.session.scalars(db.select(Volunteer.name)))
+
+    @app.route('/names', methods=['GET', 'POST'])
+    def read():
+        return jsonify(names())
+
+    @app.route('/names/primary')
+    @reads_primary
+    def read_primary():
+        return jsonify(names())
+
+    @app.route('/names/add', methods=['GET'])
+    def add():
+        db.session.add(Volunteer(name='added', location='Assam'))
+        db.session.commit()
+        return jsonify(names())
+    return app
+
+
+def rows(app, bind=None):
+    with app.app_context():
+        engine = db.engines[bind]
+        with engine.connect() as conn:
+            return sorted(conn.execute(db.select(Volunteer.name)).scalars())
+
+
+@pytest.fixture
+def app(tmp_path):
+    return make_app(tmp_path, replica=True)
+
+
+def test_get_reads_go_to_the_replica_and_other_methods_to_the_primary(app):
+    client = app.test_client()
+    assert client.get('/names').get_json() == ['replica']
+    assert client.post('/names').get_json() == ['primary']
+    assert client.get('/names/primary').get_json() == ['primary']
+    with app.test_request_context('/names', method='GET'):
+        assert db.session.get_bind(clause=db.select(Volunteer.id)) is db.engines[REPLICA_BIND]
+    with app.app_context(): # no request: CLI commands, jobs
+        assert db.session.scalars(db.select(Volunteer.name)).all() == ['primary']
+
+
+def test_writes_during_a_get_go_to_the_primary(app):
+    # The flush and commit use the primary; the read after it still goes to the replica, which (having no
+    # replication here) doesn't have the new row: a GET never reads its own writes back reliably
+    assert app.test_client().get('/names/add').get_json() == ['replica']
+    assert rows(app) == ['added', 'primary'] and rows(app, REPLICA_BIND) == ['replica']
+
+
+def test_without_a_replica_everything_uses_the_primary(tmp_path):
+    app = make_app(tmp_path, replica=False)
+    assert REPLICA_BIND not in (app.config.get('SQLALCHEMY_BINDS') or {})
+    client = app.test_client()
+    assert client.get('/names').get_json() == ['primary']
+    assert client.get('/names/add').get_json() == ['added', 'primary']
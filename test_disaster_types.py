@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from disaster_types import (OTHER_BIT, TYPE_BITS, classify_series, classify_text, mask_contains, mask_to_types,
+                            popcount, type_counts, type_counts_by_group, union_by_group, union_mask)
+
+TEXTS = pd.Series([
+    "Heavy rain and flood in the valley",
+    "An earthquake tremor was felt",
+    "A train accident",
+    None,
+    "Cyclone brought storm surge and floods",
+])
+
+
+def test_vectorized_classification_matches_per_text():
+    masks = classify_series(TEXTS)
+    assert masks.dtype == np.int16
+    assert list(masks) == [classify_text(text) for text in TEXTS]
+    assert masks[2] == OTHER_BIT and masks[3] == OTHER_BIT
+    assert mask_to_types(int(masks[4])) == ['Flood', 'Cyclone']
+
+
+def test_membership_union_and_counts():
+    masks = classify_series(TEXTS)
+    assert list(mask_contains(masks, 'Flood')) == [True, False, False, False, True]
+    assert list(mask_contains(masks, 'Other')) == [False, False, True, True, False]
+    assert not mask_contains(masks, 'Meteor').any()
+    assert union_mask(masks) == TYPE_BITS['Flood'] | TYPE_BITS['Earthquake'] | TYPE_BITS['Cyclone'] | OTHER_BIT
+    assert list(popcount(masks)) == [1, 1, 1, 1, 2]
+    assert type_counts(masks) == {'Flood': 2, 'Earthquake': 1, 'Cyclone': 1, 'Other': 2}
+
+
+def test_union_by_group_keeps_first_seen_order():
+    masks = classify_series(TEXTS)
+    unions = union_by_group(masks, ['Pune', 'Delhi', 'Pune', 'Delhi', 'Pune'])
+    assert list(unions.index) == ['Pune', 'Delhi']
+    assert mask_to_types(int(unions['Pune'])) == ['Flood', 'Cyclone', 'Other']
+    counts = type_counts_by_group(masks, ['Pune', 'Delhi', 'Pune', 'Delhi', 'Pune'])
+    assert counts == {'Pune': {'Flood': 2, 'Cyclone': 1, 'Other': 1}, 'Delhi': {'Earthquake': 1, 'Other': 1}}
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from extensions import db
+from models import Assignment, Resource, Volunteer
+from zones import ZoneMatrix, haversine_km
+
+PLACES = {'Mumbai': (19.054999, 72.8692035), 'Pune': (18.5204, 73.8567), 'Delhi': (28.6139, 77.209),
+          'Guwahati': (26.1445, 91.7362)}
+
+
+def test_zone_matrix_grows_in_place_and_matches_haversine():
+    zones = ZoneMatrix(dict(list(PLACES.items())[:2]))
+    assert zones.add_many(dict(list(PLACES.items())[1:])) == 2 # Pune is known already
+    zones.add('Nowhere', None, None)
+    assert zones.names == list(PLACES)
+
+    lat, lon = np.array(list(PLACES.values())).T
+    expected = haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+    assert np.allclose(zones.distances(np.arange(4), np.arange(4)), expected, atol=0.01)
+    assert zones.row(zones.index['Pune'])[zones.index['Pune']] == 0
+    assert zones.locate('Bombay', {'Bombay': 'Mumbai'}.get) == 0 and zones.locate('Poona') is None
+
+
+@pytest.fixture(scope='module')
+def app(app):
+    with app.app_context():
+        db.session.add_all([
+            Volunteer(name='Near', contact='d-1', location='Gauhati', available=True, assistance_type='Medical'),
+            Volunteer(name='Hills', contact='d-2', location='Meghalaya', available=True, assistance_type='Rescue'),
+            Volunteer(name='Far', contact='d-3', location='Kerala', available=True),
+            Resource(resource_type='water', quantity=10, location='Meghalaya', assigned=False),
+        ])
+        db.session.commit()
+    return app
+
+
+def test_dispatch_ranks_across_zones_by_weighted_distance(app):
+    client = app.test_client()
+    body = client.get('/dispatch?zone=Assam&kind=volunteers').get_json()
+    assert body['zone'] == 'Assam' and body['severity'] == 5
+    # Guwahati (118 km, severity 2) before Meghalaya (134 km, severity 0); Kerala is out of reach
+    assert [(v['name'], v['zone'], round(v['distance_km'])) for v in body['volunteers']] == [
+        ('Near', 'Guwahati', 118), ('Hills', 'Meghalaya', 134)]
+    assert [v['name'] for v in client.get('/dispatch?zone=Assam&assistance_type=rescue').get_json()['volunteers']] == ['Hills']
+
+    app.config['DISPATCH_SEVERITY_WEIGHT'] = 10.0 # Guwahati's own risk now outweighs 16 km
+    try:
+        ranked = client.get('/dispatch?zone=Assam&kind=volunteers').get_json()['volunteers']
+    finally:
+        app.config['DISPATCH_SEVERITY_WEIGHT'] = 1.0
+    assert [v['name'] for v in ranked] == ['Hills', 'Near']
+    assert client.get('/dispatch?zone=Assam&kind=boats').status_code == 400
+
+
+def test_unknown_zones_are_not_geocoded(app):
+    known = len(app.zones.index)
+    app.get_coordinates, get_coordinates = None, app.get_coordinates # any geocoding attempt would fail
+    try:
+        response = app.test_client().get('/dispatch?zone=Atlantis')
+    finally:
+        app.get_coordinates = get_coordinates
+    assert response.status_code == 404 and len(app.zones.index) == known
+
+
+def test_auto_assign_reaches_into_neighbouring_zones(app):
+    client = app.test_client()
+    app.config['DISPATCH_MAX_KM'] = 0 # the old rule: same location only
+    try:
+        assert client.post('/auto-assign').status_code == 404
+    finally:
+        app.config['DISPATCH_MAX_KM'] = 300
+    response = client.post('/auto-assign')
+    assert response.status_code == 201
+    body = response.get_json()
+    assert (body['zone'], body['volunteer_name'], body['resource_location']) == ('Assam', 'Near', 'Meghalaya')
+    assert client.post('/auto-assign').status_code == 404 # the only resource is taken
+    with app.app_context():
+        assert [a.zone for a in Assignment.query.all()] == ['Assam']
@@ -0,0 +1,52 @@
+from gazetteer import Gazetteer, normalize_place_name
+
+COORDS = {
+    "Mumbai": [19.05, 72.87],
+    "Bengaluru": [12.99, 77.62],
+    "West Bengal": [22.99, 87.86],
+    "Tamil Nadu": [11.13, 78.66],
+}
+ALIASES = {"Mumbai": ["Bombay"], "Bengaluru": ["Bangalore"], "Chennai": ["Madras"]}
+
+
+def make_gazetteer():
+    return Gazetteer(COORDS, ALIASES)
+
+
+def test_normalize_place_name():
+    assert normalize_place_name("  Bengaluru City, India ") == "bengaluru"
+    assert normalize_place_name("Jammu & Kashmir") == "jammu and kashmir"
+
+
+def test_exact_alias_and_fuzzy_lookup():
+    gazetteer = make_gazetteer()
+    assert gazetteer.resolve("mumbai").method == 'exact'
+    assert gazetteer.resolve("Bombay").name == "Mumbai"
+    match = gazetteer.resolve("Bangalor")
+    assert match.name == "Bengaluru" and match.method == 'fuzzy'
+    assert gazetteer.resolve("Tamilnadu").name == "Tamil Nadu"
+
+
+def test_unknown_names_are_left_to_the_remote_geocoder():
+    gazetteer = make_gazetteer()
+    assert gazetteer.resolve("Springfield") is None
+    assert gazetteer.coordinates("Springfield") == (None, None)
+
+
+def test_aliases_without_coordinates_are_ignored():
+    assert make_gazetteer().resolve("Madras") is None
+
+
+def test_find_in_text_prefers_longest_canonical_name():
+    gazetteer = make_gazetteer()
+    assert gazetteer.find_in_text("floods hit bombay and west bengal") == "West Bengal"
+    assert gazetteer.find_in_text("a flight from bombay to bangalore") == "Bengaluru"
+    assert gazetteer.find_all_in_text("bombay and bangalore") == {"Mumbai", "Bengaluru"}
+    assert gazetteer.find_in_text(float('nan')) is None
+
+
+def test_nearest_location_within_radius():
+    gazetteer = make_gazetteer()
+    assert gazetteer.nearest(19.2, 72.9) == "Mumbai"
+    assert gazetteer.nearest(12.9, 77.5, max_km=50) == "Bengaluru"
+    assert gazetteer.nearest(30.0, 70.0, max_km=50) is None
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+from app import create_app
+from config import Config
+from services.warmup import WarmUp
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IMPORT_TIME_BUDGET_S = float(os.environ.get('IMPORT_TIME_BUDGET_S', 1.0))
+HEAVY_MODULES = {'pandas', 'numpy', 'joblib', 'sklearn', 'geopy'}
+
+
+def import_times(module):
+    """{module: cumulative seconds} from `python -X importtime -c 'import <module>'`."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_import_app_is_within_budget_and_skips_heavy_modules():
+    runs = [import_times('app') for _ in range(3)] # best of three, to ride out a noisy machine
+    best = min(times['app'] for times in runs)
+    assert best < IMPORT_TIME_BUDGET_S, f"import app took {best:.2f}s"
+    assert not HEAVY_MODULES & {name.split('.')[0] for name in runs[0]}
+
+
+def test_fast_start_serves_liveness_before_readiness(monkeypatch):
+    monkeypatch.setattr(Config, 'FAST_START', True)
+    app = create_app()
+    client = app.test_client()
+    assert client.get('/healthz').status_code == 200
+
+    assert app.warmup.wait(timeout=60)
+    ready = client.get('/readyz')
+    assert ready.status_code == 200
+    assert {'location_coords', 'disaster_data_load', 'severity_computation'} <= set(ready.get_json()['completed_phases'])
+    assert client.get('/api/risk_zones').status_code == 200
+
+    app.warmup.ready.clear() # as if still warming up
+    response = client.get('/api/risk_zones')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(Config.WARMUP_RETRY_AFTER)
+    assert client.get('/readyz').status_code == 503
+
+
+def test_failed_warmup_is_retried():
+    calls = []
+
+    def target(warmup):
+        calls.append(1)
+        with warmup.phase('location_risk_refresh'):
+            if len(calls) < 3:
+                raise RuntimeError('database is locked')
+    warmup = WarmUp(target, retries=3, retry_delay=0)
+    warmup.start()
+    assert warmup.wait(timeout=10)
+    assert warmup.status()['attempts'] == 3 and warmup.error is None
+
+    failing = WarmUp(lambda warmup: 1 / 0, retries=1, retry_delay=0)
+    assert not failing.wait(timeout=0)
+    failing.run()
+    assert not failing.wait() # done, out of retries: wait() returns instead of blocking
+    assert failing.status()['attempts'] == 2 and failing.error.startswith('ZeroDivisionError')
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from gazetteer import Gazetteer
+from ingest import load_disaster_data
+
+COORDS = {"Mumbai": [19.05, 72.87], "Assam": [26.2, 92.9], "Kerala": [10.85, 76.27]}
+ROWS = [
+    ("2005 Mumbai floods", "2005", "heavy rain flooded mumbai", "2005-07-26"),
+    ("1950 earthquake", "1950", "a strong earthquake struck assam", "1950-08-15"),
+    ("Train accident", "", "no place mentioned here", "1999-01-02"),
+    ("2018 Kerala floods", "2018", "floods after a cloudburst", "not a date"),
+    ("Bombay cyclone", "1882", None, "1882-06-06"),
+]
+
+
+def write_csv(path):
+    df = pd.DataFrame(ROWS, columns=['Title', 'Year', 'Disaster_Info', 'Date'])
+    df.insert(2, 'Duration', '01-Jan')
+    df.to_csv(path) # with the exported index column, like india_disaster_data.csv
+
+
+def test_chunked_load_matches_a_single_chunk(tmp_path):
+    path = str(tmp_path / 'disasters.csv')
+    write_csv(path)
+    gazetteer = Gazetteer(COORDS, {"Mumbai": ["Bombay"]})
+
+    whole = load_disaster_data(path, gazetteer, chunksize=100)
+    chunked = load_disaster_data(path, gazetteer, chunksize=2)
+    pd.testing.assert_frame_equal(whole, chunked)
+    assert list(chunked.columns) == ['Location', 'Year', 'Date', 'DisasterTypeMask']
+    assert list(chunked['Location']) == ['Mumbai', 'Assam', 'Kerala', 'Mumbai']
+    assert chunked['Date'].isna().tolist() == [False, False, True, False]
+
+
+def test_text_is_spilled_by_row_position(tmp_path):
+    path = str(tmp_path / 'disasters.csv')
+    spill = str(tmp_path / 'text.csv')
+    write_csv(path)
+    timings = {}
+    df = load_disaster_data(path, Gazetteer(COORDS), chunksize=2, spill_path=spill, timings=timings)
+
+    text = pd.read_csv(spill)
+    assert list(text['row']) == list(range(len(df)))
+    assert text.loc[2, 'Title'] == "2018 Kerala floods"
+    assert set(timings) == {'csv_load', 'location_inference', 'type_classification'}
+
+
+def test_process_pool_merges_in_file_order(tmp_path):
+    path = str(tmp_path / 'disasters.csv')
+    write_csv(path)
+    gazetteer = Gazetteer(COORDS, {"Mumbai": ["Bombay"]})
+
+    serial = load_disaster_data(path, gazetteer, chunksize=1)
+    parallel = load_disaster_data(path, gazetteer, chunksize=1, workers=2, parallel_min_rows=1)
+    pd.testing.assert_frame_equal(serial, parallel)
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+import pytest
+from flask import Flask, jsonify
+from flask_jwt_extended import create_access_token, jwt_required
+
+from jwt_cache import CachingJWTManager, current_identity
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(JWT_SECRET_KEY='test-secret-key-that-is-long-enough', JWT_VERIFY_SUB=False)
+    app.jwt = CachingJWTManager(app)
+
+    @app.route('/me')
+    @jwt_required()
+    def me():
+        current_identity()
+        return jsonify(current_identity())
+    return app
+
+
+def test_token_is_verified_once(app):
+    with app.app_context():
+        token = create_access_token(identity={'id': 1, 'role': 'admin'})
+    client = app.test_client()
+    for _ in range(3):
+        response = client.get('/me', headers={'Authorization': f'Bearer {token}'})
+        assert response.get_json() == {'id': 1, 'role': 'admin'}
+    assert app.jwt.stats() == {'hits': 2, 'misses': 1, 'size': 1}
+
+
+def test_expired_token_is_not_served_from_cache(app):
+    with app.app_context():
+        token = create_access_token(identity={'id': 1}, expires_delta=timedelta(seconds=-1))
+    app.jwt._store((token, None), {'sub': {'id': 1}, 'exp': 0})
+    response = app.test_client().get('/me', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 401
+    assert app.jwt.stats()['size'] == 0
@@ -0,0 +1,96 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from services.upstream import UpstreamGateway
+from services.llm_client import LLMClient, LLMError, ResponseCache, normalize_question
+from ratelimit import TokenBucket
+
+
+def start_stub_llm(statuses):
+    """Local stand-in for the Gemini API; answers with the given status codes in order, then 200."""
+    calls = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            calls.append(body)
+            status = statuses.pop(0) if statuses else 200
+            reply = json.dumps({"candidates": [{"content": {"parts": [{"text": f"answer {len(calls)}"}]}}]}).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, calls
+
+
+def make_client(server, **kwargs):
+    gateway = UpstreamGateway(timeout_budget=10)
+    url = f"http://127.0.0.1:{server.server_address[1]}/generate"
+    return LLMClient(gateway, url, api_key='test', **kwargs)
+
+
+def test_normalize_question():
+    assert normalize_question("Where is the nearest shelter?") == normalize_question("where is nearest  shelter")
+    assert normalize_question("I need WATER!!") == "need water"
+
+
+def test_repeated_question_served_from_cache():
+    server, calls = start_stub_llm([])
+    client = make_client(server, cache=ResponseCache())
+
+    first = client.generate("prompt", cache_key="Where is the nearest shelter?")
+    second = client.generate("prompt", cache_key="where is nearest shelter")
+
+    assert first == second == "answer 1"
+    assert len(calls) == 1
+    assert client.cache.stats()['hits'] == 1
+    server.shutdown()
+
+
+def test_long_messages_are_not_cached():
+    server, calls = start_stub_llm([])
+    client = make_client(server, cache=ResponseCache(max_words=3))
+    message = "my family is stuck on the roof near the river bridge"
+
+    client.generate("prompt", cache_key=message)
+    client.generate("prompt", cache_key=message)
+
+    assert len(calls) == 2
+    server.shutdown()
+
+
+def test_rate_limited_then_success():
+    server, calls = start_stub_llm([429])
+    client = make_client(server)
+
+    assert client.generate("prompt") == "answer 2"
+    assert len(calls) == 2
+    server.shutdown()
+
+
+def test_forbidden_is_reported():
+    server, _ = start_stub_llm([403])
+    client = make_client(server)
+
+    try:
+        client.generate("prompt")
+    except LLMError as e:
+        assert "Forbidden" in e.message
+    else:
+        raise AssertionError("expected LLMError")
+    server.shutdown()
+
+
+def test_token_bucket_limits_burst():
+    bucket = TokenBucket(rate=1, capacity=2)
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
@@ -0,0 +1,76 @@
+import re
+
+import pytest
+from flask import Flask, jsonify
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import literal
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+from database import REPLICA_BIND, RoutingSession, apply_engine_profile
+from extensions import db
+from services.metrics import init_metrics
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    init_metrics(app, db)
+
+    @app.route('/places/<name>')
+    def place(name):
+        return jsonify(db.session.execute(db.text('SELECT :name'), {'name': name}).scalar())
+    return app
+
+
+def test_metrics_exposition(app):
+    client = app.test_client()
+    with app.metrics.phase('location_coords'):
+        pass
+    assert client.get('/places/Assam').status_code == 200
+    response = client.get('/metrics')
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/places/<name>",status="200"} 1' in body
+    assert 'db_statements_per_request_bucket{route="/places/<name>",le="1"} 1' in body
+    assert re.search(r'^db_statements_total [1-9]', body, re.M)
+    assert re.search(r'^startup_phase_seconds\{phase="location_coords"\} \d', body, re.M)
+    # Every sample line is "name{labels} value"
+    samples = [line for line in body.splitlines() if not line.startswith('#')]
+    assert all(re.fullmatch(r'[a-z_]+(\{[^}]*\})? \S+', line) for line in samples)
+
+
+def test_failed_statement_does_not_skew_later_timings(app):
+    with app.app_context(), db.engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql('SELECT * FROM no_such_table')
+        assert conn.info['query_start'] == []
+        conn.exec_driver_sql('SELECT 1')
+        assert conn.info['query_start'] == []
+
+
+def test_replica_reads_are_counted(tmp_path):
+    # Its own extension, so the replica bind doesn't outlive this test
+    routed = SQLAlchemy(session_options={'class_': RoutingSession})
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'primary.db'}"
+    app.config['DATABASE_REPLICA_URI'] = f"sqlite:///{tmp_path / 'replica.db'}"
+    apply_engine_profile(app)
+    routed.init_app(app)
+    init_metrics(app, routed)
+
+    @app.route('/one')
+    def one():
+        assert routed.session.get_bind(clause=routed.select(literal(1))) is routed.engines[REPLICA_BIND]
+        return jsonify(routed.session.execute(routed.select(literal(1))).scalar())
+
+    client = app.test_client()
+    assert client.get('/one').status_code == 200
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'db_statements_per_request_bucket{route="/one",le="0"} 0' in body
+    assert 'db_statements_per_request_bucket{route="/one",le="1"} 1' in body
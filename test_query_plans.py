@@ -0,0 +1,88 @@
+# EXPLAIN QUERY PLAN for every SELECT the hot endpoints issue: none may scan a whole table.
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, text
+
+from extensions import bcrypt, db
+from models import DisasterAlert, Resource, SensorData, User, Volunteer
+
+FULL_SCAN = re.compile(r'^SCAN (\w+)$') # "SCAN t USING INDEX ..." is fine, a bare "SCAN t" is not
+
+
+@pytest.fixture(scope='module')
+def app(app):
+    with app.app_context():
+        locations = list(app.severity_by_location)[:20]
+        now = datetime.utcnow()
+        for i in range(500):
+            loc = locations[i % len(locations)]
+            db.session.add(Volunteer(name=f"v{i}", contact=str(i), location=loc, available=i % 3 == 0))
+            db.session.add(Resource(resource_type='food', quantity=10, location=loc, assigned=i % 2 == 0))
+            db.session.add(SensorData(sensor_type=['rainfall', 'temperature'][i % 2], value=float(i),
+                                      latitude=20.0, longitude=80.0, timestamp=now - timedelta(minutes=i)))
+            db.session.add(DisasterAlert(alert_type='Flood', severity='high', description='x', location=loc))
+        db.session.add(User(username='planner', password_hash=bcrypt.generate_password_hash('pw').decode(),
+                            role='Admin'))
+        db.session.commit()
+        db.session.execute(text('ANALYZE'))
+        db.session.commit()
+    return app
+
+
+def capture_selects(app, call):
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = call(app.test_client())
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code < 500, response.get_data(as_text=True)
+    return statements
+
+
+def full_scans(app, statements):
+    tables = set(db.metadata.tables)
+    scans = set()
+    with app.app_context():
+        conn = db.session.connection()
+        for statement, parameters in statements:
+            for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters):
+                match = FULL_SCAN.match(row[-1])
+                if match and match.group(1) in tables:
+                    scans.add((match.group(1), statement))
+    return scans
+
+
+def bearer(app):
+    with app.app_context():
+        return {'Authorization': 'Bearer ' + create_access_token(identity='1')}
+
+
+@pytest.mark.parametrize('name, call', [
+    ('auto_assign', lambda c: c.post('/auto-assign')),
+    ('location_summary', lambda c: c.get('/location-summary')),
+    ('latest_sensor_data', lambda c: c.get('/sensor-data')),
+    ('alerts_page', lambda c: c.get('/api/alerts?page=3&per_page=20')),
+    ('login', lambda c: c.post('/auth/login', json={'username': 'planner', 'password': 'pw'})),
+])
+def test_hot_endpoints_use_indexes(app, name, call):
+    statements = capture_selects(app, call)
+    assert statements
+    assert full_scans(app, statements) == set()
+
+
+def test_filtered_sensor_query_uses_index(app):
+    headers = bearer(app)
+    start = (datetime.utcnow() - timedelta(hours=2)).isoformat()
+    statements = capture_selects(
+        app, lambda c: c.get(f'/api/sensor-data?sensor_type=rainfall&start_date={start}', headers=headers))
+    assert full_scans(app, statements) == set()
@@ -0,0 +1,56 @@
+from extensions import db
+from models import DisasterAlert, LocationRisk
+from services import risk
+from services.risk import dataset_location_risk, record_alert, refresh_location_risk
+
+
+def test_table_matches_the_dataset_and_refresh_is_idempotent(app):
+    with app.app_context():
+        stored = {row.location: row.severity for row in LocationRisk.query.all()}
+        assert stored == app.severity_by_location
+        dataset_risk = dataset_location_risk(app.disaster_df)
+        assert refresh_location_risk(dataset_risk, app.canonical_location) is False
+
+
+def test_alerts_update_severity_and_survive_a_rebuild(app):
+    client = app.test_client()
+    with app.app_context():
+        before = db.session.get(LocationRisk, 'Mumbai').severity
+
+    response = client.post('/api/alerts/report', json={
+        'alert_type': 'Flood', 'severity': 'high', 'description': 'river over the danger mark', 'location': 'Bombay'})
+    assert response.status_code == 201
+    with app.app_context():
+        row = db.session.get(LocationRisk, 'Mumbai')
+        assert row.severity == before + 1
+
+        # A changed dataset triggers a rebuild; stored alerts are counted again
+        db.session.execute(db.update(LocationRisk).values(dataset_version='stale'))
+        db.session.commit()
+        assert refresh_location_risk(dataset_location_risk(app.disaster_df), app.canonical_location) is True
+        assert db.session.get(LocationRisk, 'Mumbai').severity == before + 1
+
+
+def test_a_first_report_that_loses_the_insert_race_still_counts(app, monkeypatch):
+    bump_row = risk._bump_row
+    raced = []
+
+    def bump_after_a_rival_insert(location, specific, mask):
+        if not raced: # another report creates the row between this one's miss and its insert
+            raced.append(location)
+            db.session.execute(db.insert(LocationRisk).values(
+                location=location, severity=1, type_counts={'Flood': 1}, rank=10_000))
+            return False
+        return bump_row(location, specific, mask)
+
+    monkeypatch.setattr(risk, '_bump_row', bump_after_a_rival_insert)
+    with app.app_context():
+        db.session.add(DisasterAlert(alert_type='Flood', severity='high', description='river in spate',
+                                     location='Atlantis'))
+        record_alert('Atlantis', 'Flood', 'river in spate')
+        db.session.commit()
+
+        assert raced == ['Atlantis']
+        row = db.session.get(LocationRisk, 'Atlantis')
+        assert (row.severity, row.type_counts) == (2, {'Flood': 2})
+        assert db.session.query(DisasterAlert).filter_by(location='Atlantis').count() == 1
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from extensions import db
+from models import JobState, SensorData, SensorRollup, Volunteer
+from services.scheduler import Job, Scheduler
+
+
+def test_shared_job_runs_once_per_period_and_holds_a_lease(app):
+    calls = []
+    other = Scheduler(app)
+
+    def job(app, cursor):
+        calls.append(cursor)
+        assert other.run_job('claimed') is None # leased to the first scheduler while it runs
+        return str(len(calls))
+
+    first = Scheduler(app, [Job('claimed', job, 60)])
+    other.add(Job('claimed', job, 60))
+    assert first.run_job('claimed') == 'ok'
+    assert other.run_job('claimed') is None # not due for another minute
+    assert calls == [None]
+    with app.app_context():
+        state = db.session.get(JobState, 'claimed')
+        assert (state.cursor, state.runs, state.lease_owner) == ('1', 1, None)
+        assert state.next_run_at > datetime.utcnow()
+
+
+def test_failed_run_discards_its_writes(app):
+    def job(app, cursor):
+        db.session.add(Volunteer(name='x', contact='job-failure', location='Nowhere'))
+        raise RuntimeError('upstream down')
+
+    scheduler = Scheduler(app, [Job('failing', job, 60)])
+    assert scheduler.run_job('failing') == 'error'
+    with app.app_context():
+        assert Volunteer.query.filter_by(contact='job-failure').count() == 0
+        state = db.session.get(JobState, 'failing')
+        assert (state.failures, state.last_error) == (1, 'RuntimeError: upstream down')
+
+
+def test_sensor_rollup_catches_up_incrementally(app):
+    hour = datetime(2026, 7, 1, 10)
+    with app.app_context():
+        db.session.add_all([SensorData(sensor_type='rainfall', value=v, latitude=19.1, longitude=72.9,
+                                       timestamp=hour.replace(minute=m)) for v, m in ((10, 5), (30, 20))])
+        db.session.commit()
+    app.scheduler.run_job('sensor_rollup')
+    with app.app_context():
+        db.session.add(SensorData(sensor_type='rainfall', value=50, latitude=19.2, longitude=72.8,
+                                  timestamp=hour.replace(minute=50)))
+        db.session.commit()
+    assert app.scheduler.run_job('sensor_rollup') == 'ok' # due again at once: the last run made progress
+    with app.app_context():
+        rollup = db.session.get(SensorRollup, ('rainfall', hour, 38, 145))
+        assert (rollup.count, rollup.value_sum, rollup.value_min, rollup.value_max) == (3, 90, 10, 50)
+
+    client = app.test_client()
+    rows = client.get('/sensor-data/rollups?hours=1e9').get_json() # back past datetime.min: everything
+    assert [row['count'] for row in rows] == [3]
+    for hours in ('0', '-1', 'nan'):
+        assert client.get(f'/sensor-data/rollups?hours={hours}').status_code == 400
+
+
+def test_location_summary_is_served_from_the_warmed_cache(app):
+    client = app.test_client()
+    location = client.get('/location-summary').get_json()[0]['location']
+    app.scheduler.run_job('location_summary_warm')
+    with app.app_context():
+        db.session.add(Volunteer(name='late', contact='cache-test', location=location))
+        db.session.commit()
+    cached = client.get('/location-summary').get_json()[0]
+    app.location_summary_cache = None
+    fresh = client.get('/location-summary').get_json()[0]
+    assert fresh['volunteers_count'] == cached['volunteers_count'] + 1
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from app import create_app
+from config import Config
+from extensions import db
+from models import DisasterAlert
+from services.search import SearchIndex, build_match
+
+EVENTS = pd.DataFrame({
+    'Location': pd.Categorical(['Uttarakhand', 'Assam', 'Godavari East', 'Godavari']),
+    'Year': [2013.0, 2020.0, 1996.0, None],
+    'Date': pd.to_datetime(['2013-06-16', '2020-07-01', '1996-11-06', None]),
+    'Title': ['2013 North India floods', 'Assam floods', 'Konaseema cyclone', 'Godavari landslide'],
+    'Disaster_Info': ['a multiday cloudburst caused devastating flash floods and landslides',
+                      'the brahmaputra flood displaced millions', 'a severe cyclonic storm', None],
+})
+
+
+def test_match_expressions_quote_user_input():
+    assert build_match('"flash flood" landslid* NEAR(x') == '"flash flood" AND "landslid"* AND "NEAR x"'
+    with pytest.raises(ValueError):
+        build_match(' * "" ')
+
+
+def test_events_are_indexed_once_and_filtered(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    writer = index.event_writer('v1')
+    writer.write(EVENTS, first_row=0)
+    writer.finish()
+    assert index.event_writer('v1') is None # same dataset file: kept
+
+    assert [r['id'] for r in index.search('floods')] == [1, 0] # the title match ranks first
+    assert [r['id'] for r in index.search('"flash floods" landslide*')] == [0]
+    assert index.search('cloudburst')[0]['snippet'] == 'a multiday [cloudburst] caused devastating flash floods and landslides'
+    assert [r['id'] for r in index.search('flood*', start_date='2020-01-01')] == [1]
+    assert index.search('storm', locations=['Godavari']) == [] # 'Godavari East' is another place
+    assert [r['id'] for r in index.search('landslide', locations=['Godavari'])] == [3]
+    assert [r['location'] for r in index.search('storm', locations=['Godavari East'], start_year=1990)] == ['Godavari East']
+
+
+def test_search_endpoint_covers_the_dataset_and_new_alerts(app):
+    client = app.test_client()
+    response = client.get('/api/search?q=cyclone&limit=2')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['has_more'] and [r['kind'] for r in body['results']] == ['event', 'event']
+
+    with app.app_context():
+        db.session.add(DisasterAlert(alert_type='Flood', severity='High', location='Bombay',
+                                     description='Waterlogging after a zyxqurain downpour',
+                                     issued_at=datetime(2026, 7, 2, 9)))
+        db.session.commit()
+    results = client.get('/api/search?q=zyxqurain&location=Mumbai&start_date=2026-07-01').get_json()['results']
+    assert [(r['kind'], r['location'], r['date'], r['title']) for r in results] == [
+        ('alert', 'Mumbai', '2026-07-02', 'Flood (High)')]
+
+    assert client.get('/api/search?q=*').status_code == 400
+    assert client.get('/api/search?q=flood&kind=tweet').status_code == 400
+
+
+def test_unusable_index_only_disables_search(monkeypatch):
+    monkeypatch.setattr(Config, 'SEARCH_INDEX_PATH', '/proc/nope/search.db')
+    app = create_app()
+    client = app.test_client()
+    assert app.search_index is None and client.get('/readyz').status_code == 200
+    assert client.get('/api/search?q=cyclone').status_code == 503
+    assert client.get('/api/risk_zones').status_code == 200
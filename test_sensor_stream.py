@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from extensions import db
+from models import DisasterAlert, SensorData
+from services import sensor_stream
+from services.sensor_stream import ANOMALY_ALERT_TYPE, SensorStreamDetector, raise_alerts
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rolling_window_matches_numpy():
+    detector = SensorStreamDetector(window=50, min_samples=10)
+    values = np.random.default_rng(1).normal(30, 5, 137)
+    for value in values:
+        detector.observe('humidity', value, 19.1, 72.9)
+    row = detector._rows[('humidity', detector.cell(19.1, 72.9))]
+    assert detector._count[row] == 50
+    assert detector._sum[row] == pytest.approx(values[-50:].sum())
+    assert detector._sumsq[row] == pytest.approx((values[-50:] ** 2).sum())
+
+
+def test_threshold_needs_consecutive_readings_and_respects_cooldown():
+    clock = FakeClock()
+    detector = SensorStreamDetector(consecutive=3, cooldown=600, clock=clock)
+    fired = [detector.observe('rainfall', value, 19.1, 72.9) for value in (120, 130, 20, 120, 125, 140, 150)]
+    assert [len(d) for d in fired] == [0, 0, 0, 0, 0, 1, 0]
+    assert fired[5][0].alert_type == 'Flood' and fired[5][0].severity == 'high'
+
+    clock.now = 601
+    assert detector.observe('rainfall', 160, 19.1, 72.9)[0].alert_type == 'Flood'
+    assert detector.observe('rainfall', 160, 25.0, 85.0) == [] # another cell keeps its own streak
+
+
+def test_zscore_anomaly_against_the_rolling_window():
+    detector = SensorStreamDetector(window=60, min_samples=30, zscore_limit=4.0, consecutive=1)
+    for value in np.random.default_rng(2).normal(60, 2, 60):
+        assert detector.observe('humidity', value, 10.0, 76.0) == []
+    detection, = detector.observe('humidity', 95, 10.0, 76.0)
+    assert detection.alert_type == ANOMALY_ALERT_TYPE and detection.zscore > 4
+
+
+def test_bulk_ingestion_raises_one_alert_per_cell():
+    app = create_app()
+    app.config['SENSOR_ALERT_CONSECUTIVE'] = 2
+    client = app.test_client()
+    readings = [{'sensor_type': 'windspeed', 'value': 80 + i, 'latitude': 19.06, 'longitude': 72.88} for i in range(5)]
+    response = client.post('/sensor-data/bulk', json=readings)
+    assert response.status_code == 201
+    assert response.get_json()['inserted'] == 5 and len(response.get_json()['alerts_raised']) == 1
+
+    # A second worker's detector would fire again; the stored alert de-duplicates it
+    app.extensions.pop('sensor_stream')
+    response = client.post('/sensor-data/bulk', json={'readings': readings})
+    assert response.get_json()['alerts_raised'] == []
+    with app.app_context():
+        assert db.session.query(SensorData).count() == 10
+        alert, = DisasterAlert.query.filter_by(alert_type='Cyclone').all()
+        assert alert.location == 'Mumbai'
+
+    assert client.post('/sensor-data/bulk', json=[{'value': 1}]).status_code == 400
+
+
+def test_invalid_readings_are_rejected_before_detection():
+    app = create_app()
+    client = app.test_client()
+    for reading in ({'sensor_type': 'rainfall', 'value': 'heavy', 'latitude': 19.1, 'longitude': 72.9},
+                    {'sensor_type': 'rainfall', 'value': 120, 'latitude': 191, 'longitude': 72.9},
+                    {'sensor_type': 'rainfall', 'value': True, 'latitude': 19.1, 'longitude': 72.9},
+                    {'value': 120, 'latitude': 19.1, 'longitude': 72.9}):
+        assert client.post('/sensor-data', json=reading).status_code == 400
+    response = client.post('/sensor-data/bulk', json=[{'sensor_type': 'rainfall', 'value': 120, 'latitude': 19.1,
+                                                       'longitude': 72.9}, {'sensor_type': 'rainfall', 'value': 'nan',
+                                                                            'latitude': 19.1, 'longitude': 72.9}])
+    assert response.status_code == 400 and response.get_json()['invalid_indexes'] == [1]
+    assert 'sensor_stream' not in app.extensions # nothing reached the detector
+
+
+def test_failed_commit_starts_no_cooldown(monkeypatch):
+    app = create_app()
+    app.config['SENSOR_ALERT_CONSECUTIVE'] = 1
+    client = app.test_client()
+    reading = {'sensor_type': 'windspeed', 'value': 90, 'latitude': 21.3, 'longitude': 84.1}
+
+    def failing_raise_alerts(*args, **kwargs):
+        raise_alerts(*args, **kwargs)
+        raise RuntimeError('disk I/O error') # as if the commit that follows failed
+    monkeypatch.setattr(sensor_stream, 'raise_alerts', failing_raise_alerts)
+    assert client.post('/sensor-data', json=reading).status_code == 500
+    monkeypatch.setattr(sensor_stream, 'raise_alerts', raise_alerts)
+    assert app.extensions['sensor_stream'].stats()['fired'] == 0
+
+    response = client.post('/sensor-data', json=reading)
+    assert response.status_code == 201 and len(response.get_json()['alerts_raised']) == 1
+    with app.app_context():
+        assert db.session.query(SensorData).count() == 1
+
+
+def test_api_endpoint_answers_like_the_app_one(monkeypatch):
+    app = create_app()
+    app.config['SENSOR_ALERT_CONSECUTIVE'] = 1
+    client = app.test_client()
+    with app.app_context():
+        headers = {'Authorization': 'Bearer ' + create_access_token(identity='1')}
+    reading = {'sensor_type': 'windspeed', 'value': 90, 'latitude': 21.3, 'longitude': 84.1}
+
+    def failing_raise_alerts(*args, **kwargs):
+        raise RuntimeError('disk I/O error')
+    monkeypatch.setattr(sensor_stream, 'raise_alerts', failing_raise_alerts)
+    response = client.post('/api/sensor-data', json=reading, headers=headers)
+    assert response.status_code == 500 and response.get_json() == {'error': 'Failed to add sensor data'}
+    monkeypatch.setattr(sensor_stream, 'raise_alerts', raise_alerts)
+
+    response = client.post('/api/sensor-data', json=reading, headers=headers)
+    assert response.status_code == 201 and len(response.get_json()['alerts_raised']) == 1
@@ -0,0 +1,42 @@
+import datetime
+
+import numpy as np
+import pytest
+from flask import Flask, jsonify
+
+from serialization import OrjsonProvider, StdlibJSONProvider, table_response
+
+DOC = {'when': datetime.datetime(2024, 7, 26, 9, 30, 0, 125000), 'day': datetime.date(2024, 7, 26),
+       'count': np.int64(3), 'values': np.array([1.5, 2.0]), 'place': 'Bhubaneswar', 'nested': {'b': 1, 'a': None}}
+
+
+@pytest.fixture(params=[StdlibJSONProvider, OrjsonProvider])
+def app(request):
+    app = Flask(__name__)
+    app.json = request.param(app)
+
+    @app.route('/doc')
+    def doc():
+        return jsonify(DOC)
+
+    @app.route('/rows')
+    def rows():
+        return table_response(('id', 'name', 'created_at'), [(1, 'a', DOC['when']), (2, 'b', None)])
+    return app
+
+
+def test_providers_agree_on_datetimes_numpy_and_key_order(app):
+    body = app.test_client().get('/doc').get_data(as_text=True)
+    assert body.startswith('{"count":3,"day":"2024-07-26","nested":{"a":null,"b":1}')
+    assert app.json.loads(body)['when'] == '2024-07-26T09:30:00.125000'
+    assert app.json.loads(body)['values'] == [1.5, 2.0]
+
+
+def test_rows_and_columns_shapes(app):
+    client = app.test_client()
+    assert client.get('/rows').get_json() == [
+        {'id': 1, 'name': 'a', 'created_at': '2024-07-26T09:30:00.125000'},
+        {'id': 2, 'name': 'b', 'created_at': None}]
+    assert client.get('/rows?format=columns').get_json() == {
+        'count': 2, 'fields': ['id', 'name', 'created_at'],
+        'columns': {'id': [1, 2], 'name': ['a', 'b'], 'created_at': ['2024-07-26T09:30:00.125000', None]}}
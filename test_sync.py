@@ -0,0 +1,95 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from extensions import db
+from models import ChangeLog, Volunteer
+from services.sync import changes_since, compaction_floor
+
+
+def latest_version(app):
+    with app.app_context():
+        return db.session.scalar(db.select(db.func.max(ChangeLog.version))) or 0
+
+
+def test_sync_returns_only_what_changed_since_the_clients_version(app):
+    client = app.test_client()
+    since = latest_version(app)
+    kept = client.post('/volunteers', json={'name': 'Asha', 'contact': 'sync-1', 'location': 'Assam'}).get_json()['id']
+    client.post('/resources', json={'resource_type': 'water', 'quantity': 5, 'location': 'Assam'})
+    with app.app_context(): # added and removed between two syncs: the client never needs to hear of it
+        gone = Volunteer(name='Brief', contact='sync-2', location='Assam')
+        db.session.add(gone)
+        db.session.commit()
+        db.session.delete(gone)
+        db.session.commit()
+
+    first = client.get(f'/sync?since={since}').get_json()
+    volunteers = first['changes']['volunteers']
+    assert [row[:3] for row in volunteers['inserted']] == [[kept, 'Asha', 'sync-1']]
+    assert volunteers['deleted'] == [] and first['changes']['resources']['inserted'][0][1] == 'water'
+
+    with app.app_context():
+        db.session.get(Volunteer, kept).available = False
+        db.session.commit()
+    second = client.get(f"/sync?since={first['version']}&tables=volunteers").get_json()
+    assert second['changes']['volunteers']['updated'][0][4] is False and set(second['changes']) == {'volunteers'}
+    assert client.get(f"/sync?since={second['version']}").get_json()['changes'] == {}
+    for since in ('abc', '-1', '1.5'):
+        assert client.get(f'/sync?since={since}').status_code == 400
+
+
+def test_bulk_imports_are_logged_and_pages_are_gzipped(app):
+    client = app.test_client()
+    since = latest_version(app)
+    body = 'name,contact,location\n' + ''.join(f'Imported {i},bulk-{i},Kerala\n' for i in range(300))
+    client.post('/volunteers/import', data=body, content_type='text/csv')
+    client.post('/volunteers/import', data=body.replace('Kerala', 'Assam'), content_type='text/csv')
+
+    response = client.get(f'/sync?since={since}&limit=200', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    page = json.loads(gzip.decompress(response.data))
+    assert page['has_more'] and len(page['changes']['volunteers']['inserted']) == 200
+    rest = client.get(f"/sync?since={page['version']}").get_json()
+    # The second import's updates to the first page's rows are in the rest of the log
+    assert len(rest['changes']['volunteers']['inserted']) == 100
+    assert {row[3] for row in rest['changes']['volunteers']['updated']} == {'Assam'}
+
+
+def test_compaction_keeps_the_latest_entry_per_row_and_resets_stale_clients(app):
+    client = app.test_client()
+    created = client.post('/volunteers', json={'name': 'Old', 'contact': 'sync-3', 'location': 'Assam'}).get_json()['id']
+    stale = latest_version(app)
+    with app.app_context():
+        db.session.delete(db.session.get(Volunteer, created))
+        db.session.commit()
+        db.session.execute(db.update(ChangeLog).where(ChangeLog.version > stale)
+                           .values(changed_at=datetime.utcnow() - timedelta(days=365)))
+        db.session.commit()
+    assert app.scheduler.run_job('change_log_compaction') == 'ok'
+
+    with app.app_context():
+        entries = db.session.execute(db.select(ChangeLog.table_name, ChangeLog.row_id)).all()
+        assert len(entries) == len(set(entries)) and ('volunteers', created) not in entries
+        result = changes_since(stale - 1, limit=10_000)
+    assert result['reset'] and all(row[0] != created for row in result['changes']['volunteers']['inserted'])
+
+
+def test_commit_lag_holds_back_recent_entries(app):
+    client = app.test_client()
+    with app.app_context():
+        since = max(latest_version(app), compaction_floor())
+    client.post('/volunteers', json={'name': 'Old', 'contact': 'lag-1', 'location': 'Assam'})
+    with app.app_context():
+        settled = latest_version(app)
+        db.session.execute(db.update(ChangeLog).where(ChangeLog.version > since)
+                           .values(changed_at=datetime.utcnow() - timedelta(minutes=1)))
+        db.session.commit()
+    client.post('/volunteers', json={'name': 'New', 'contact': 'lag-2', 'location': 'Assam'})
+
+    with app.app_context():
+        held = changes_since(since, 100, ['volunteers'], lag=30)
+        assert held['version'] == settled
+        assert [row[1] for row in held['changes']['volunteers']['inserted']] == ['Old']
+        assert changes_since(held['version'], 100, lag=30)['changes'] == {}
+        assert [row[1] for row in changes_since(held['version'], 100)['changes']['volunteers']['inserted']] == ['New']
@@ -0,0 +1,95 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from geopy.exc import GeocoderTimedOut
+
+import update_location_coords as ulc
+
+
+class FakeProvider:
+    name = 'fake'
+    max_qps = None
+    max_parallelism = 1
+
+    def __init__(self):
+        self.calls = []
+
+    def geocode(self, location_name, limiter=None):
+        self.calls.append(location_name)
+        return 10.0 + len(self.calls), 80.0
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    csv_path, coords_path = tmp_path / 'events.csv', tmp_path / 'coords.json'
+    csv_path.write_text('Title,Disaster_Info\n'
+                        'Floods in Assam,heavy rain\n'
+                        'Cyclone hits Odisha,landfall near Puri\n'
+                        'Kerala landslide,\n')
+    coords_path.write_text(json.dumps({'Assam': [None, None], 'Mumbai': [19.05, 72.87]}))
+    monkeypatch.setattr(ulc, 'INDIA_DISASTER_DATA_PATH', str(csv_path))
+    monkeypatch.setattr(ulc, 'LOCATION_COORDS_PATH', str(coords_path))
+    monkeypatch.setattr(ulc, 'JOURNAL_PATH', str(coords_path) + '.journal')
+    return coords_path
+
+
+def test_resume_skips_journaled_lookups(paths):
+    # An interrupted run got through Assam and Odisha; it died while writing the next line
+    with open(ulc.JOURNAL_PATH, 'w') as f:
+        f.write(json.dumps({'location': 'Assam', 'coords': [26.2, 92.9]}) + '\n')
+        f.write(json.dumps({'location': 'Odisha', 'coords': [None, None]}) + '\n')
+        f.write('{"location": "Ker')
+
+    provider = FakeProvider()
+    ulc.update_location_coordinates(provider)
+    assert provider.calls == ['Kerala']
+    coords = json.loads(paths.read_text())
+    assert coords == {'Assam': [26.2, 92.9], 'Mumbai': [19.05, 72.87], 'Odisha': [None, None], 'Kerala': [11.0, 80.0]}
+    assert not (paths.parent / 'coords.json.journal').exists()
+
+
+def test_interrupted_save_keeps_the_previous_file(paths, monkeypatch):
+    before = paths.read_text()
+    replace = ulc.os.replace
+
+    def crash(*args, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(ulc.os, 'replace', crash)
+    with pytest.raises(KeyboardInterrupt):
+        ulc.update_location_coordinates(FakeProvider())
+    assert paths.read_text() == before
+    assert len(ulc.load_journal(ulc.JOURNAL_PATH)) == 3 # every lookup survives for the next run
+
+    monkeypatch.setattr(ulc.os, 'replace', replace)
+    provider = FakeProvider()
+    ulc.update_location_coordinates(provider)
+    assert provider.calls == [] and len(json.loads(paths.read_text())) == 4
+
+
+def test_retries_take_tokens_and_qps_is_capped(tmp_path, monkeypatch):
+    attempts = []
+
+    def geocode(query, timeout):
+        attempts.append(query)
+        if len(attempts) < 3:
+            raise GeocoderTimedOut()
+        return SimpleNamespace(latitude=26.2, longitude=92.9)
+    monkeypatch.setattr(ulc, 'geolocator', SimpleNamespace(geocode=geocode))
+    monkeypatch.setattr(ulc.time, 'sleep', lambda seconds: None)
+    limiter = CountingLimiter()
+    assert ulc.get_coordinates('Assam', limiter) == (26.2, 92.9)
+    assert limiter.acquired == len(attempts) == 3
+
+    rates = []
+    monkeypatch.setattr(ulc, 'TokenBucket', lambda rate, capacity: rates.append(rate) or CountingLimiter())
+    ulc.geocode_batch(['Assam'], ulc.NominatimProvider(), str(tmp_path / 'journal'), qps=50)
+    assert rates == [ulc.NominatimProvider.max_qps]
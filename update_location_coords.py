@@ -1,16 +1,25 @@
 # backend/update_location_coords.py
 
 import pandas as pd
+import argparse
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 import time
 import re # Import regex for more robust city extraction
+from ratelimit import TokenBucket
+from gazetteer import Gazetteer, load_aliases
+from ingest import TEXT_COLUMNS, read_disaster_chunks
 
 # --- Configuration ---
 INDIA_DISASTER_DATA_PATH = 'india_disaster_data.csv'
 LOCATION_COORDS_PATH = 'location_coords.json'
+LOCATION_ALIASES_PATH = 'location_aliases.json'
+# Append-only log of finished lookups; replayed on restart so a crash loses nothing
+JOURNAL_PATH = LOCATION_COORDS_PATH + '.journal'
 
 # Initialize Nominatim geolocator
 geolocator = Nominatim(user_agent="disaster_app_geocoder")
@@ -35,11 +44,14 @@ MAJOR_INDIAN_CITIES = [
 ]
 # Combine and make unique for comprehensive checking
 ALL_INDIAN_LOCATIONS = sorted(list(set(INDIAN_STATES_AND_UTS + MAJOR_INDIAN_CITIES)), key=len, reverse=True)
+# Text matcher that also maps old names ("Bombay", "Orissa") onto these locations
+LOCATION_MATCHER = Gazetteer({loc: (None, None) for loc in ALL_INDIAN_LOCATIONS}, aliases=load_aliases(LOCATION_ALIASES_PATH))
 
 
-def get_coordinates(location_name):
+def get_coordinates(location_name, limiter=None):
     """
     Fetches coordinates for a given location name with retry logic and rate limiting.
+    Every attempt, retries included, first takes a token from `limiter` when given.
     """
     if not location_name or pd.isna(location_name):
         return None, None
@@ -49,6 +61,8 @@ def get_coordinates(location_name):
     
     retries = 3
     for i in range(retries):
+        if limiter is not None:
+            limiter.acquire()
         try:
             loc = geolocator.geocode(query, timeout=10) # Increased timeout
             if loc:
@@ -75,20 +89,110 @@ def infer_locations_from_text(text):
     Infers locations from a given text by matching against known Indian locations.
     Returns a set of unique inferred locations.
     """
-    inferred_locs = set()
     if pd.isna(text):
-        return inferred_locs
+        return set()
+    # Word boundaries avoid partial matches (e.g., "go" in "mango"); aliases map to canonical names
+    return LOCATION_MATCHER.find_all_in_text(text)
 
-    text_lower = str(text).lower()
-    for loc_name in ALL_INDIAN_LOCATIONS:
-        # Use word boundaries to avoid partial matches (e.g., "go" in "mango")
-        if re.search(r'\b' + re.escape(loc_name.lower()) + r'\b', text_lower):
-            inferred_locs.add(loc_name)
-    return inferred_locs
 
+# --- Geocoding providers ---
 
-def update_location_coordinates():
-    print("Starting update of location_coords.json...")
+class NominatimProvider:
+    """
+    Remote geocoding through Nominatim. Its usage policy allows one request
+    per second and no parallel bulk requests.
+    """
+    name = 'nominatim'
+    max_qps = 1.0
+    max_parallelism = 1
+
+    def geocode(self, location_name, limiter=None):
+        return get_coordinates(location_name, limiter)
+
+
+class GazetteerFileProvider:
+    """
+    Offline provider backed by a gazetteer file (see gazetteer.Gazetteer.from_file),
+    with alias and fuzzy matching. No rate limit, any parallelism.
+    """
+    name = 'gazetteer'
+    max_qps = None
+    max_parallelism = 32
+
+    def __init__(self, path):
+        self.gazetteer = Gazetteer.from_file(path, aliases=load_aliases(LOCATION_ALIASES_PATH))
+
+    def geocode(self, location_name, limiter=None):
+        if limiter is not None:
+            limiter.acquire()
+        return self.gazetteer.coordinates(location_name)
+
+
+# --- Checkpointing ---
+
+def load_journal(path):
+    """Replays the journal into {location: [lat, lon]}; a torn last line from a crash is ignored."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            done[entry['location']] = entry['coords']
+    return done
+
+
+def save_coords_atomically(coords, path):
+    """Writes to a temp file in the same directory, fsyncs, then renames over `path`."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(coords, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def geocode_batch(locations, provider, journal_path, qps=None, workers=1):
+    """
+    Geocodes `locations`, appending each result to the journal as it lands.
+    A shared token bucket (capacity 1) starts requests, retries included,
+    exactly 1/qps apart; qps can't exceed the provider's max_qps. workers > 1
+    keeps that rate saturated when a single call takes longer than the
+    interval, if the provider permits parallel requests.
+    """
+    if provider.max_qps is not None and (qps is None or qps > provider.max_qps):
+        if qps is not None:
+            print(f"  --qps {qps} exceeds the {provider.name} limit; using {provider.max_qps}")
+        qps = provider.max_qps
+    limiter = TokenBucket(qps, capacity=1) if qps else None
+    workers = max(1, min(workers, provider.max_parallelism))
+    journal_lock = threading.Lock()
+    results = {}
+
+    def lookup(loc_name):
+        lat, lon = provider.geocode(loc_name, limiter)
+        coords = [lat, lon] if lat is not None and lon is not None else [None, None]
+        with journal_lock:
+            journal.write(json.dumps({'location': loc_name, 'coords': coords}) + '\n')
+            journal.flush()
+        return loc_name, coords
+
+    with open(journal_path, 'a') as journal, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(lookup, loc_name) for loc_name in locations]
+        for i, future in enumerate(as_completed(futures), 1):
+            loc_name, coords = future.result()
+            results[loc_name] = coords
+            if i % 100 == 0:
+                print(f"  {i}/{len(locations)} locations geocoded")
+    return results
+
+
+def update_location_coordinates(provider=None, qps=None, workers=1, resume=True):
+    provider = provider or NominatimProvider()
+    print(f"Starting update of location_coords.json using the {provider.name} provider...")
 
     # Load existing location_coords.json
     existing_coords = {}
@@ -102,24 +206,22 @@ def update_location_coordinates():
     else:
         print(f"No existing {LOCATION_COORDS_PATH} found. A new one will be created.")
 
-    # Load disaster data
+    # Collect all unique potential locations from the CSV, streamed in chunks of Title/Disaster_Info only
+    all_potential_csv_locations = set()
+    rows = 0
     try:
-        df = pd.read_csv(INDIA_DISASTER_DATA_PATH)
-        if df.columns[0] == 'Unnamed: 0':
-            df = df.drop(columns=df.columns[0])
-        print(f"Loaded {len(df)} entries from {INDIA_DISASTER_DATA_PATH}.")
+        for chunk in read_disaster_chunks(INDIA_DISASTER_DATA_PATH, columns=TEXT_COLUMNS):
+            rows += len(chunk)
+            for column in TEXT_COLUMNS:
+                for text in chunk[column]:
+                    all_potential_csv_locations.update(infer_locations_from_text(text))
+        print(f"Scanned {rows} entries from {INDIA_DISASTER_DATA_PATH}.")
     except FileNotFoundError:
         print(f"Error: {INDIA_DISASTER_DATA_PATH} not found. Cannot infer new locations.")
         return
     except Exception as e:
         print(f"Error loading {INDIA_DISASTER_DATA_PATH}: {e}")
         return
-
-    # Collect all unique potential locations from the CSV
-    all_potential_csv_locations = set()
-    for _, row in df.iterrows():
-        all_potential_csv_locations.update(infer_locations_from_text(row.get('Title')))
-        all_potential_csv_locations.update(infer_locations_from_text(row.get('Disaster_Info')))
     
     print(f"Found {len(all_potential_csv_locations)} unique potential locations in CSV data.")
 
@@ -140,24 +242,43 @@ def update_location_coordinates():
         if coords[0] is None or coords[1] is None:
             locations_to_geocode.add(loc)
 
+    # Resume: lookups journaled by an interrupted run are not repeated
+    if resume:
+        journaled = load_journal(JOURNAL_PATH)
+        if journaled:
+            print(f"Resuming: {len(journaled)} lookups recovered from {JOURNAL_PATH}")
+        updated_coords.update(journaled)
+        locations_to_geocode -= set(journaled)
+    elif os.path.exists(JOURNAL_PATH):
+        os.remove(JOURNAL_PATH)
+
     print(f"Total locations to geocode/re-geocode: {len(locations_to_geocode)}")
 
-    for loc_name in sorted(list(locations_to_geocode)): # Sort for consistent output
-        print(f"Geocoding '{loc_name}'...")
-        lat, lon = get_coordinates(loc_name)
-        if lat is not None and lon is not None:
-            updated_coords[loc_name] = [lat, lon]
-        else:
-            updated_coords[loc_name] = [None, None] # Ensure it's explicitly null if failed
-        time.sleep(1) # Adhere to Nominatim rate limit
-
-    # Save updated location_coords.json
-    with open(LOCATION_COORDS_PATH, 'w') as f:
-        json.dump(updated_coords, f, indent=4)
+    results = geocode_batch(sorted(locations_to_geocode), provider, JOURNAL_PATH, qps=qps, workers=workers)
+    updated_coords.update(results)
+
+    # Save updated location_coords.json, then drop the journal it now contains
+    save_coords_atomically(updated_coords, LOCATION_COORDS_PATH)
+    if os.path.exists(JOURNAL_PATH):
+        os.remove(JOURNAL_PATH)
     
     print(f"\nUpdated {LOCATION_COORDS_PATH} with {len(updated_coords)} entries.")
     print("Please restart your backend (app.py) to load the new location data.")
 
 
 if __name__ == "__main__":
-    update_location_coordinates()
+    parser = argparse.ArgumentParser(description="Geocode locations found in the disaster data into location_coords.json.")
+    parser.add_argument('--provider', choices=['nominatim', 'gazetteer'], default='nominatim')
+    parser.add_argument('--gazetteer', help="gazetteer file (JSON or CSV) for the gazetteer provider")
+    parser.add_argument('--qps', type=float, help="request rate, at most the provider's limit (1/s for Nominatim)")
+    parser.add_argument('--workers', type=int, default=1, help="parallel lookups, capped by the provider")
+    parser.add_argument('--no-resume', action='store_true', help="discard the journal of an interrupted run")
+    args = parser.parse_args()
+
+    if args.provider == 'gazetteer':
+        if not args.gazetteer:
+            parser.error("--gazetteer is required with --provider gazetteer")
+        selected_provider = GazetteerFileProvider(args.gazetteer)
+    else:
+        selected_provider = NominatimProvider()
+    update_location_coordinates(selected_provider, qps=args.qps, workers=args.workers, resume=not args.no_resume)
@@ -0,0 +1,144 @@
+# backend/upstream.py
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+
+import httpx
+from flask import g, has_request_context
+
+
+class UpstreamTimeout(Exception):
+    """Raised when an upstream call does not finish inside the request's budget."""
+
+
+class UpstreamGateway:
+    """
+    Shared gateway for outbound HTTP calls (LLM, geocoder).
+
+    All calls run on one background event loop over a single pooled
+    keep-alive client, so a request thread only waits on a future while the
+    loop multiplexes hundreds of in-flight upstream calls. A semaphore caps
+    concurrent upstream calls and every inbound request gets one timeout
+    budget that is shared by all of its upstream calls and retries.
+    """
+
+    def __init__(self, max_concurrency=200, max_connections=100, timeout_budget=20.0,
+                 geocoder_url=None, geocoder_min_interval=1.0, user_agent="disaster-app"):
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.timeout_budget = timeout_budget
+        self.geocoder_url = geocoder_url
+        self.geocoder_min_interval = geocoder_min_interval
+        self.user_agent = user_agent
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self._geocode_lock = None
+        self._next_geocode_at = 0.0
+
+    # --- Lifecycle ---
+
+    def _ensure_started(self):
+        # Threads do not survive fork(), so (re)start the loop in every worker process.
+        if self._loop is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                self._client = httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=self.max_connections,
+                                        max_keepalive_connections=self.max_connections),
+                    headers={'User-Agent': self.user_agent},
+                )
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._geocode_lock = asyncio.Lock()
+                ready.set()
+                loop.run_forever()
+
+            thread = threading.Thread(target=run, name="upstream-gateway", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop = loop
+            self._pid = os.getpid()
+
+    def close(self):
+        if self._loop is None or self._pid != os.getpid():
+            return
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+    # --- Per-request timeout budget ---
+
+    def remaining_budget(self):
+        """Seconds left in the current request's upstream budget."""
+        if not has_request_context():
+            return self.timeout_budget
+        if 'upstream_deadline' not in g:
+            g.upstream_deadline = time.monotonic() + self.timeout_budget
+        return max(0.0, g.upstream_deadline - time.monotonic())
+
+    def run(self, coro_fn, *args, **kwargs):
+        """Run `coro_fn(*args, **kwargs)` on the gateway loop within the remaining budget."""
+        budget = self.remaining_budget()
+        if budget <= 0:
+            raise UpstreamTimeout("Upstream timeout budget exhausted")
+        self._ensure_started()
+
+        async def bounded():
+            async with self._semaphore:
+                return await coro_fn(*args, **kwargs)
+
+        future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(bounded(), budget), self._loop)
+        try:
+            return future.result(budget + 0.5)
+        except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+            future.cancel()
+            raise UpstreamTimeout(f"Upstream call exceeded {budget:.1f}s budget")
+
+    # --- Calls ---
+
+    async def _request(self, method, url, retry_statuses=(), retries=0, **kwargs):
+        response = await self._client.request(method, url, **kwargs)
+        for attempt in range(retries):
+            if response.status_code not in retry_statuses:
+                break
+            # Back off on the loop instead of blocking a worker thread.
+            await asyncio.sleep(2 ** attempt)
+            response = await self._client.request(method, url, **kwargs)
+        return response
+
+    def request(self, method, url, retry_statuses=(), retries=0, **kwargs):
+        return self.run(self._request, method, url, retry_statuses=retry_statuses, retries=retries, **kwargs)
+
+    def post_json(self, url, payload, retry_statuses=(429,), retries=3, **kwargs):
+        return self.request('POST', url, json=payload, retry_statuses=retry_statuses, retries=retries, **kwargs)
+
+    async def _geocode(self, query):
+        # Nominatim allows one request per second; space calls out on the loop.
+        async with self._geocode_lock:
+            wait = self._next_geocode_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_geocode_at = time.monotonic() + self.geocoder_min_interval
+        response = await self._client.get(self.geocoder_url, params={'q': query, 'format': 'json', 'limit': 1})
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            return None, None
+        return float(results[0]['lat']), float(results[0]['lon'])
+
+    def geocode(self, query):
+        """Returns (latitude, longitude) or (None, None) if the geocoder has no match."""
+        return self.run(self._geocode, query)
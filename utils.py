@@ -1,14 +1,21 @@
 from functools import wraps
-from flask_jwt_extended import get_jwt_identity
 from flask import jsonify
+from jwt_cache import current_identity
 
 def role_required(allowed_roles):
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            user = get_jwt_identity()
-            if user['role'] not in allowed_roles:
+            user = current_identity()
+            if not user or user.get('role') not in allowed_roles:
                 return jsonify({"msg": "Access forbidden: insufficient role"}), 403
             return fn(*args, **kwargs)
         return wrapper
     return decorator
+
+def bcrypt_cost(password_hash):
+    """The cost factor (log2 rounds) a bcrypt hash was made with, e.g. 12 for '$2b$12$...'."""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
@@ -0,0 +1,143 @@
+# backend/warmup.py
+#
+# Fast-start support. The expensive part of startup (pandas, the disaster
+# dataset, the LocationRisk refresh) runs as a warm-up, either inline in
+# create_app() or, with FAST_START, on a background thread while the app
+# already answers /healthz. /readyz and views marked @requires_warmup answer
+# 503 with Retry-After until the warm-up has finished.
+
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, jsonify
+
+
+class WarmUp:
+    """
+    Runs `target(warmup)` once and tracks its progress. The target reports
+    named steps through `warmup.phase(name)`; each one is also timed into
+    the `startup_phase_seconds` gauge when a metrics registry is given. A
+    target that raises is run again up to `retries` times, `retry_delay`
+    seconds apart (doubling each time).
+    """
+
+    def __init__(self, target, metrics=None, retry_after=1, retries=0, retry_delay=5.0):
+        self._target = target
+        self.metrics = metrics
+        self.retry_after = retry_after
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.ready = threading.Event()
+        self.done = threading.Event() # finished, ready or out of retries
+        self.error = None
+        self.attempts = 0
+        self.current_phase = None
+        self.completed = {} # phase -> seconds, in completion order
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+        self._thread_pid = None
+        self._lock = threading.Lock()
+
+    def run(self):
+        """Runs the warm-up in the calling thread, retrying failures."""
+        self.started_at, self.finished_at, self.error = time.time(), None, None
+        self.attempts = 0
+        self.done.clear()
+        try:
+            while not self._attempt() and self.attempts <= self.retries:
+                time.sleep(self.retry_delay * 2 ** (self.attempts - 1))
+        finally:
+            self.current_phase = None
+            self.finished_at = time.time()
+            self.done.set()
+
+    def _attempt(self):
+        self.attempts += 1
+        self.completed = {}
+        try:
+            self._target(self)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+            return False
+        self.error = None
+        self.ready.set()
+        return True
+
+    def start(self):
+        """
+        Runs the warm-up on a daemon thread unless it already finished or is
+        running in this process. Threads don't survive fork(), so a worker
+        forked mid warm-up calls this again to run its own.
+        """
+        with self._lock:
+            if self.ready.is_set() or self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+            self._thread = threading.Thread(target=self.run, name='warmup', daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout=None):
+        """Blocks until the warm-up has finished (or `timeout`); True if it succeeded."""
+        self.done.wait(timeout)
+        return self.ready.is_set()
+
+    @contextmanager
+    def phase(self, name):
+        self.current_phase = name
+        start = time.perf_counter()
+        if self.metrics is not None:
+            with self.metrics.phase(name):
+                yield
+        else:
+            yield
+        self.completed[name] = round(time.perf_counter() - start, 6)
+
+    def status(self):
+        end = self.finished_at or time.time()
+        return {
+            'ready': self.ready.is_set(),
+            'phase': self.current_phase,
+            'completed_phases': dict(self.completed),
+            'elapsed_s': round(end - self.started_at, 3) if self.started_at else 0.0,
+            'attempts': self.attempts,
+            'error': self.error,
+        }
+
+
+def not_ready_response(warmup):
+    response = jsonify({'error': 'Service is warming up', **warmup.status()})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(warmup.retry_after)
+    return response
+
+
+def requires_warmup(view):
+    """503 + Retry-After from `view` until current_app.warmup has finished."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        warmup = current_app.warmup
+        if not warmup.ready.is_set():
+            return not_ready_response(warmup)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def register_health_routes(app):
+    """/healthz (liveness: the process serves requests) and /readyz (readiness: warm-up finished)."""
+    started = time.time()
+
+    @app.route('/healthz')
+    def healthz():
+        return jsonify({'status': 'ok', 'uptime_s': round(time.time() - started, 3)})
+
+    @app.route('/readyz')
+    def readyz():
+        if not app.warmup.ready.is_set():
+            return not_ready_response(app.warmup)
+        return jsonify({'status': 'ready', **app.warmup.status()})
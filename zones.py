@@ -0,0 +1,123 @@
+# backend/zones.py
+#
+# Great-circle distances between every pair of known zones, precomputed into
+# one float32 matrix so dispatch ranks candidates by reading a row instead of
+# running a haversine per pair. Places geocoded later are added in place:
+# only their own rows and columns are computed.
+
+import threading
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+BLOCK_ROWS = 512 # matrix rows per haversine block; bounds the float64 temporaries
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between points in degrees; broadcasts over arrays."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _trig(lat, lon):
+    # sin/cos of half the latitude and longitude, and cos of the latitude, per zone. The half-angle
+    # differences in the haversine then come out of the angle-difference identity with multiplies
+    # only: sin((b - a) / 2) = sin(b/2) cos(a/2) - cos(b/2) sin(a/2)
+    half_lat, half_lon = np.radians(lat) / 2, np.radians(lon) / 2
+    return np.stack([np.sin(half_lat), np.cos(half_lat), np.sin(half_lon), np.cos(half_lon),
+                     np.cos(2 * half_lat)], axis=1)
+
+
+def _block_km(rows, cols):
+    """Distances (float32 km) from each zone in `rows` to each zone in `cols`, both _trig arrays."""
+    r = rows[:, None, :]
+    sin_dlat = r[..., 0] * cols[:, 1] - r[..., 1] * cols[:, 0]
+    sin_dlon = r[..., 2] * cols[:, 3] - r[..., 3] * cols[:, 2]
+    a = sin_dlat * sin_dlat + r[..., 4] * cols[:, 4] * sin_dlon * sin_dlon
+    np.clip(a, 0.0, 1.0, out=a)
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a, out=a), out=a)).astype(np.float32)
+
+
+class ZoneMatrix:
+    """
+    Distance matrix over named zones, grown in place as zones are added.
+
+    Adding k zones to n costs k x (n + k) distances; the arrays keep spare
+    capacity so a single geocoded place doesn't copy the matrix. Readers
+    take no lock: a zone's row and column are written before its name
+    becomes visible, and growth swaps in a filled copy.
+    """
+
+    def __init__(self, coords=None):
+        self.names = []  # zone id -> name
+        self.index = {}  # name -> zone id
+        self._size = 0
+        self._trig = np.empty((0, 5))
+        self._km = np.empty((0, 0), dtype=np.float32)
+        self._lock = threading.Lock()
+        self._located = {} # location string -> (zone id or None, zone count when looked up)
+        if coords:
+            self.add_many(coords)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def add(self, name, lat, lon):
+        return self.add_many({name: (lat, lon)})
+
+    def add_many(self, coords):
+        """Adds {name: (lat, lon)} zones not known yet; returns how many were added."""
+        with self._lock:
+            new = [(name, lat, lon) for name, (lat, lon) in coords.items()
+                   if name not in self.index and lat is not None and lon is not None]
+            if not new:
+                return 0
+            size, total = self._size, self._size + len(new)
+            trig, km = self._trig, self._km
+            if total > len(trig):
+                capacity = max(total + 64, len(trig) + len(trig) // 8)
+                trig = np.empty((capacity, 5))
+                trig[:size] = self._trig[:size]
+                km = np.empty((capacity, capacity), dtype=np.float32)
+                km[:size, :size] = self._km[:size, :size]
+            trig[size:total] = _trig(np.array([lat for _, lat, _ in new], dtype=np.float64),
+                                     np.array([lon for _, _, lon in new], dtype=np.float64))
+            for start in range(size, total, BLOCK_ROWS):
+                stop = min(start + BLOCK_ROWS, total)
+                block = _block_km(trig[start:stop], trig[:total])
+                km[start:stop, :total] = block
+                km[:total, start:stop] = block.T
+            self._trig, self._km = trig, km
+            for offset, (name, _, _) in enumerate(new):
+                self.names.append(name)
+                self.index[name] = size + offset
+            self._size = total
+        return len(new)
+
+    def row(self, zone_id):
+        """Distances (km) from zone `zone_id` to every zone, by zone id."""
+        size = self._size
+        return self._km[zone_id, :size]
+
+    def distances(self, zone_ids, others):
+        """len(zone_ids) x len(others) block of distances, both as zone id arrays."""
+        return self._km[np.asarray(zone_ids)[:, None], np.asarray(others)[None, :]]
+
+    def locate(self, location, resolve_location=None):
+        """
+        Zone id for a location string: its own name, else the name
+        `resolve_location` maps it to ("Bombay" -> "Mumbai"), else None.
+        """
+        size = self._size
+        zone_id, known = self._located.get(location, (None, -1))
+        if zone_id is not None or known == size: # a miss holds until zones are added
+            return zone_id
+        zone_id = self.index.get(location)
+        if zone_id is None and resolve_location is not None and location:
+            zone_id = self.index.get(resolve_location(location))
+        self._located[location] = (zone_id, size)
+        return zone_id